@@ -0,0 +1,150 @@
+# analyzers/cadence.py
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Serie de tiempo de publicaciones para analyze_temporal: un arreglo ordenado por
+# día (ordinal) con posts y sumas/conteos de likes y comments. Encima de eso, con
+# numpy y sin loops por post:
+#   - cubetas por semana (lunes) y por mes, con promedio de engagement por cubeta
+#   - cadencia: posts/semana en el rango activo y promedio móvil de 4 semanas
+#   - huecos entre posts (mediana, promedio, p90) y la inactividad más larga
+# Es incremental: add() junta días pendientes y se integran al arreglo ordenado
+# (np.unique + bincount) cuando se pide el resumen o el buffer se llena; merge()
+# mezcla la serie de otro chunk (ver parallel / streaming).
+
+ROLLING_WEEKS = 4
+_FLUSH_EVERY = 4096  # días pendientes antes de integrarlos (memoria acotada en streaming)
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+def _empty(dtype=np.int64) -> np.ndarray:
+    return np.zeros(0, dtype=dtype)
+
+def _mean(total: np.ndarray, n: np.ndarray) -> List[Optional[float]]:
+    return [round(t / k, 2) if k else None for t, k in zip(total.tolist(), n.tolist())]
+
+class Cadence:
+    """
+    c = Cadence()
+    c.add(dt, likes_est, comments_est)   # por post fechado
+    c.summary()                          # → dict (ver finalize_temporal["cadence"])
+    """
+
+    def __init__(self):
+        self.days = _empty()          # ordinal del día, ordenado y sin repetir
+        self.posts = _empty()
+        self.likes_sum = _empty()
+        self.likes_n = _empty()
+        self.comments_sum = _empty()
+        self.comments_n = _empty()
+        self._pending: List[tuple] = []
+
+    def add(self, dt: datetime, likes_est: Any = None, comments_est: Any = None):
+        likes = likes_est if isinstance(likes_est, int) else None
+        comments = comments_est if isinstance(comments_est, int) else None
+        self._pending.append((dt.toordinal(), likes, comments))
+        if len(self._pending) >= _FLUSH_EVERY:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        days, likes, comments = zip(*self._pending)
+        self._pending = []
+        likes_n = np.fromiter((v is not None for v in likes), dtype=np.int64, count=len(likes))
+        comments_n = np.fromiter((v is not None for v in comments), dtype=np.int64, count=len(comments))
+        self._combine(
+            np.fromiter(days, dtype=np.int64, count=len(days)),
+            np.ones(len(days), dtype=np.int64),
+            np.fromiter((v or 0 for v in likes), dtype=np.int64, count=len(likes)),
+            likes_n,
+            np.fromiter((v or 0 for v in comments), dtype=np.int64, count=len(comments)),
+            comments_n,
+        )
+
+    def _combine(self, days, posts, likes_sum, likes_n, comments_sum, comments_n):
+        all_days = np.concatenate([self.days, days])
+        uniq, inv = np.unique(all_days, return_inverse=True)
+
+        def total(old, new):
+            return np.bincount(inv, weights=np.concatenate([old, new]), minlength=len(uniq)).astype(np.int64)
+
+        self.posts = total(self.posts, posts)
+        self.likes_sum = total(self.likes_sum, likes_sum)
+        self.likes_n = total(self.likes_n, likes_n)
+        self.comments_sum = total(self.comments_sum, comments_sum)
+        self.comments_n = total(self.comments_n, comments_n)
+        self.days = uniq
+
+    def merge(self, other: "Cadence") -> "Cadence":
+        self.flush()
+        other.flush()
+        self._combine(other.days, other.posts, other.likes_sum, other.likes_n, other.comments_sum, other.comments_n)
+        return self
+
+    def _buckets(self, keys: np.ndarray, label) -> List[Dict[str, Any]]:
+        # keys: cubeta de cada día (ordenadas, porque days lo está)
+        uniq, inv = np.unique(keys, return_inverse=True)
+
+        def total(values):
+            return np.bincount(inv, weights=values, minlength=len(uniq)).astype(np.int64)
+
+        posts = total(self.posts)
+        likes = _mean(total(self.likes_sum), total(self.likes_n))
+        comments = _mean(total(self.comments_sum), total(self.comments_n))
+        return [
+            {"bucket": label(k), "posts": n, "avg_likes_est": l, "avg_comments_est": c}
+            for k, n, l, c in zip(uniq.tolist(), posts.tolist(), likes, comments)
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        self.flush()
+        n = int(self.posts.sum())
+        if not n:
+            return {"posts": 0, "posts_per_week": None, "weekly": [], "monthly": []}
+
+        # semanas de lunes a domingo: el ordinal 1 (0001-01-01) es lunes
+        weeks = (self.days - 1) // 7
+        first_week, last_week = int(weeks[0]), int(weeks[-1])
+        n_weeks = last_week - first_week + 1
+        per_week = np.bincount(weeks - first_week, weights=self.posts, minlength=n_weeks)
+        cum = np.concatenate([[0.0], np.cumsum(per_week)])
+        idx = np.arange(n_weeks)
+        window = np.minimum(idx + 1, ROLLING_WEEKS)
+        rolling = (cum[idx + 1] - cum[idx + 1 - window]) / ROLLING_WEEKS
+
+        months = (self.days - _EPOCH_ORDINAL).astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        n_months = int(months[-1] - months[0]) + 1
+
+        # huecos entre posts consecutivos (mismo día = 0) y entre días con posts
+        gaps = np.diff(np.repeat(self.days, self.posts))
+        day_gaps = np.diff(self.days)
+        if len(day_gaps):
+            i = int(np.argmax(day_gaps))
+            longest = {
+                "days": int(day_gaps[i]),
+                "from": date.fromordinal(int(self.days[i])).isoformat(),
+                "to": date.fromordinal(int(self.days[i + 1])).isoformat(),
+            }
+        else:
+            longest = {"days": 0, "from": None, "to": None}
+
+        return {
+            "posts": n,
+            "active_days": int(len(self.days)),
+            "weeks": n_weeks,
+            "posts_per_week": round(n / n_weeks, 3),
+            "posts_per_month": round(n / n_months, 3),
+            "recent_posts_per_week": round(float(rolling[-1]), 3),
+            "peak_posts_per_week": round(float(rolling.max()), 3),
+            "active_week_ratio": round(float((per_week > 0).mean()), 4),
+            "gap_days": {
+                "median": float(np.median(gaps)) if len(gaps) else None,
+                "mean": round(float(gaps.mean()), 2) if len(gaps) else None,
+                "p90": float(np.percentile(gaps, 90)) if len(gaps) else None,
+            },
+            "longest_gap": longest,
+            "weekly": self._buckets(weeks, lambda w: date.fromordinal(w * 7 + 1).isoformat()),
+            "monthly": self._buckets(months, lambda m: f"{1970 + m // 12:04d}-{m % 12 + 1:02d}"),
+        }
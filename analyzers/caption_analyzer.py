@@ -1,8 +1,13 @@
 # analyzers/caption_analyzer.py
 import re
 from collections import Counter
+from sys import intern
 from typing import Dict, List, Any
 
+from analyzers.language import DEFAULT_DETECTOR, WORD_RE, LanguageDetector
+from analyzers.matcher import Matcher, merge_dictionaries
+from models.post import Post
+
 # --- Heuristics dictionaries ---
 CTA_PATTERNS = {
     "order": [r"\border\b", r"\borden(a|e|en)?\b", r"order\s+now", r"ordena\s+ya"],
@@ -23,11 +28,29 @@ TOPIC_KEYWORDS = {
     "promos": ["promo", "promotion", "deal", "special", "oferta", "descuento", "2x1", "two for one"],
 }
 
-SPANISH_HINTS = {"el","la","los","las","de","del","para","con","que","por","una","un","y","en","hoy","mañana","gracias","sabor","carne","tacos"}
-ENGLISH_HINTS = {"the","and","with","for","you","your","today","tomorrow","thanks","best","meat","tacos","order","visit"}
+# kinds del Matcher: "cta" son regex; el resto palabras/frases literales
+# (el idioma va aparte: language.LanguageDetector, pistas en LANGUAGE_HINTS)
+DEFAULT_DICTIONARIES = {
+    "cta": CTA_PATTERNS,
+    "topic": TOPIC_KEYWORDS,
+}
+REGEX_KINDS = {"cta"}
+
+def build_matcher(vertical: Dict[str, Dict[str, List[str]]] = None, language_mode: str = "hints") -> Matcher:
+    """
+    Matcher con los diccionarios default + los de una vertical
+    (ver matcher.load_dictionaries). Compilar una vez y pasarlo a analyze_posts.
+    `language_mode`: "hints" (pistas por palabra) o "ngram" (+ trigramas, más preciso).
+    """
+    language = DEFAULT_DETECTOR if language_mode == "hints" else LanguageDetector(mode=language_mode)
+    return Matcher(merge_dictionaries(DEFAULT_DICTIONARIES, vertical), regex_kinds=REGEX_KINDS, language=language)
+
+DEFAULT_MATCHER = build_matcher()
 
 HASHTAG_RE = re.compile(r"(?:^|\s)(#\w+)", re.UNICODE)
 NUMBER_RE = re.compile(r"(\d[\d,\.]*)")
+OG_LIKES_RE = re.compile(r"([\d,\.]+)\s+likes")
+OG_COMMENTS_RE = re.compile(r"([\d,\.]+)\s+comments")
 
 def _norm_text(s: str) -> str:
     return (s or "").strip()
@@ -36,44 +59,33 @@ def _lower(s: str) -> str:
     return _norm_text(s).lower()
 
 def _extract_hashtags(text: str) -> List[str]:
-    return [h.lower() for h in HASHTAG_RE.findall(text or "")]
+    # intern: los mismos hashtags se repiten en miles de posts, un solo string c/u
+    return [intern(h.lower()) for h in HASHTAG_RE.findall(text or "")]
 
-def _detect_language(text: str) -> str:
+def _scan(text: str, matcher: Matcher = None) -> Dict[str, Any]:
+    """
+    Una sola pasada del Matcher (CTAs y temas) + el idioma (m.language).
+    """
     t = _lower(text)
+    m = matcher or DEFAULT_MATCHER
     if not t:
-        return "unknown"
-
-    # simple scoring
-    es = sum(1 for w in SPANISH_HINTS if re.search(rf"\b{re.escape(w)}\b", t))
-    en = sum(1 for w in ENGLISH_HINTS if re.search(rf"\b{re.escape(w)}\b", t))
+        return {"language": "unknown", "ctas": [], "topics": []}
+    tokens = WORD_RE.findall(t)
+    hits = m.scan(t, tokens)
+    return {
+        "language": m.language.detect(t, tokens),
+        "ctas": m.ordered("cta", hits["cta"]),
+        "topics": m.ordered("topic", hits["topic"]),
+    }
 
-    if es == 0 and en == 0:
-        return "unknown"
-    if es > 0 and en > 0:
-        # mixed if both are present
-        if abs(es - en) <= 1:
-            return "mixed"
-    return "es" if es > en else "en"
+def _detect_language(text: str) -> str:
+    return DEFAULT_MATCHER.language.detect(_lower(text))
 
 def _detect_ctas(text: str) -> List[str]:
-    t = _lower(text)
-    found = []
-    for cta, patterns in CTA_PATTERNS.items():
-        for p in patterns:
-            if re.search(p, t):
-                found.append(cta)
-                break
-    return found
+    return _scan(text)["ctas"]
 
 def _detect_topics(text: str) -> List[str]:
-    t = _lower(text)
-    found = []
-    for topic, kws in TOPIC_KEYWORDS.items():
-        for kw in kws:
-            if re.search(rf"\b{re.escape(kw.lower())}\b", t):
-                found.append(topic)
-                break
-    return found
+    return _scan(text)["topics"]
 
 def _parse_likes_comments_from_og(og_desc: str) -> Dict[str, int | None]:
     """
@@ -86,12 +98,12 @@ def _parse_likes_comments_from_og(og_desc: str) -> Dict[str, int | None]:
     comments = None
 
     # likes
-    m = re.search(r"([\d,\.]+)\s+likes", t)
+    m = OG_LIKES_RE.search(t)
     if m:
         likes = _to_int(m.group(1))
 
     # comments (a veces)
-    m2 = re.search(r"([\d,\.]+)\s+comments", t)
+    m2 = OG_COMMENTS_RE.search(t)
     if m2:
         comments = _to_int(m2.group(1))
 
@@ -108,80 +120,124 @@ def _to_int(num_str: str) -> int | None:
     except:
         return None
 
-def analyze_posts(posts: List[Dict[str, Any]]) -> Dict[str, Any]:
+def new_accumulator(keep_posts: bool = True, hashtags: Counter = None) -> Dict[str, Any]:
     """
-    Input posts: [{caption, og_description(optional), post_url, image_url, ...}]
-    Output analytics:
-      - avg likes/comments est
-      - hashtag freq
-      - language ratio
-      - cta freq
-      - topic freq
-      - per-post annotations
+    Estado parcial de analyze_posts: se llena por chunks (accumulate_posts) y se
+    combina (merge_accumulators) sin perder nada antes de finalize_posts.
+    keep_posts=False no junta posts_annotated; `hashtags` puede ser cualquier
+    contador con update/most_common (ej. streaming.SpaceSaving).
     """
-    hashtag_counter = Counter()
-    cta_counter = Counter()
-    topic_counter = Counter()
-    lang_counter = Counter()
+    return {
+        "hashtags": hashtags if hashtags is not None else Counter(),
+        "cta": Counter(),
+        "topic": Counter(),
+        "lang": Counter(),
+        "likes_sum": 0,
+        "likes_n": 0,
+        "comments_sum": 0,
+        "comments_n": 0,
+        "posts_annotated": [] if keep_posts else None,
+    }
+
+def annotate_post(p: Dict[str, Any] | Post, matcher: Matcher = None) -> Post:
+    """
+    Un post → el mismo record (o uno nuevo si viene como dict) con hashtags,
+    idioma, CTAs, temas y likes/comments estimados.
+    """
+    post = Post.coerce(p)
+    caption = _norm_text(post.caption)
+    og = _norm_text(post.og_description)
+
+    blob = (caption + "\n" + og).strip()
 
-    likes_vals = []
-    comments_vals = []
+    # language + CTA + topics (una pasada)
+    scan = _scan(blob, matcher)
 
-    annotated_posts = []
+    # engagement (from og desc)
+    eng = _parse_likes_comments_from_og(og)
 
+    post.hashtags = _extract_hashtags(blob)
+    post.language_est = scan["language"]
+    post.ctas = scan["ctas"]
+    post.topics = scan["topics"]
+    post.likes_est = eng["likes_est"]
+    post.comments_est = eng["comments_est"]
+    return post
+
+def accumulate_post(acc: Dict[str, Any], post: Post):
+    """
+    Suma un post ya anotado (annotate_post) a los conteos de `acc`.
+    """
+    acc["hashtags"].update(post.hashtags)
+    acc["lang"][post.language_est] += 1
+    acc["cta"].update(post.ctas)
+    acc["topic"].update(post.topics)
+
+    likes_est = post.likes_est
+    comments_est = post.comments_est
+    if isinstance(likes_est, int):
+        acc["likes_sum"] += likes_est
+        acc["likes_n"] += 1
+    if isinstance(comments_est, int):
+        acc["comments_sum"] += comments_est
+        acc["comments_n"] += 1
+
+def accumulate_posts(posts: List[Dict[str, Any]], matcher: Matcher = None, acc: Dict[str, Any] = None) -> Dict[str, Any]:
+    acc = acc if acc is not None else new_accumulator()
+    annotated_posts = acc["posts_annotated"]
     for p in posts or []:
-        caption = _norm_text(p.get("caption", ""))
-        og = _norm_text(p.get("og_description", ""))
-
-        blob = (caption + "\n" + og).strip()
-
-        # hashtags
-        tags = _extract_hashtags(blob)
-        hashtag_counter.update(tags)
-
-        # language
-        lang = _detect_language(blob)
-        lang_counter.update([lang])
-
-        # CTA
-        ctas = _detect_ctas(blob)
-        cta_counter.update(ctas)
-
-        # topics
-        topics = _detect_topics(blob)
-        topic_counter.update(topics)
-
-        # engagement (from og desc)
-        eng = _parse_likes_comments_from_og(og)
-        likes_est = eng["likes_est"]
-        comments_est = eng["comments_est"]
-        if isinstance(likes_est, int):
-            likes_vals.append(likes_est)
-        if isinstance(comments_est, int):
-            comments_vals.append(comments_est)
-
-        annotated_posts.append({
-            **p,
-            "hashtags": tags,
-            "language_est": lang,
-            "ctas": ctas,
-            "topics": topics,
-            "likes_est": likes_est,
-            "comments_est": comments_est
-        })
+        annotated = annotate_post(p, matcher)
+        accumulate_post(acc, annotated)
+        if annotated_posts is not None:
+            annotated_posts.append(annotated)
+    return acc
 
+def merge_accumulators(acc: Dict[str, Any], other: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Suma `other` en `acc`. Mezclando los chunks en su orden original, los
+    Counters conservan el orden de primera aparición (desempate de most_common)
+    y el resultado es idéntico a una sola pasada.
+    """
+    for key in ("hashtags", "cta", "topic", "lang"):
+        acc[key].update(other[key])
+    for key in ("likes_sum", "likes_n", "comments_sum", "comments_n"):
+        acc[key] += other[key]
+    if acc["posts_annotated"] is not None:
+        acc["posts_annotated"].extend(other["posts_annotated"] or [])
+    return acc
+
+def finalize_posts(acc: Dict[str, Any]) -> Dict[str, Any]:
+    lang_counter = acc["lang"]
     total = sum(lang_counter.values()) or 1
     language_ratio = {k: round(v / total, 4) for k, v in lang_counter.items()}
 
-    avg_likes_est = round(sum(likes_vals) / len(likes_vals), 2) if likes_vals else None
-    avg_comments_est = round(sum(comments_vals) / len(comments_vals), 2) if comments_vals else None
+    avg_likes_est = round(acc["likes_sum"] / acc["likes_n"], 2) if acc["likes_n"] else None
+    avg_comments_est = round(acc["comments_sum"] / acc["comments_n"], 2) if acc["comments_n"] else None
 
-    return {
+    out = {
         "avg_likes_est": avg_likes_est,
         "avg_comments_est": avg_comments_est,
-        "hashtag_frequency": dict(hashtag_counter.most_common(20)),
+        "hashtag_frequency": dict(acc["hashtags"].most_common(20)),
         "language_ratio": language_ratio,
-        "cta_frequency": dict(cta_counter.most_common(20)),
-        "dominant_topics": dict(topic_counter.most_common(20)),
-        "posts_annotated": annotated_posts
+        "cta_frequency": dict(acc["cta"].most_common(20)),
+        "dominant_topics": dict(acc["topic"].most_common(20)),
+        "posts_annotated": acc["posts_annotated"]
     }
+    if out["posts_annotated"] is None:  # keep_posts=False
+        del out["posts_annotated"]
+    return out
+
+def analyze_posts(posts: List[Dict[str, Any]], matcher: Matcher = None) -> Dict[str, Any]:
+    """
+    Input posts: [{caption, og_description(optional), post_url, image_url, ...}] o Post
+    `matcher`: build_matcher(vertical) para diccionarios custom (default: DEFAULT_MATCHER)
+    Output analytics:
+      - avg likes/comments est
+      - hashtag freq
+      - language ratio
+      - cta freq
+      - topic freq
+      - per-post annotations (posts_annotated: los mismos Post, anotados;
+        a JSON con models.post.to_dicts(..., dates=False))
+    """
+    return finalize_posts(accumulate_posts(posts, matcher))
@@ -0,0 +1,308 @@
+# analyzers/cohort.py
+"""
+Índice de cohortes para compute_health_score: en vez de umbrales absolutos
+(200 likes = 1 punto) cada perfil se compara contra perfiles parecidos.
+
+  cohorte:     (vertical, banda de seguidores), p.ej. "taquerias|1k-10k"
+  métricas:    los valores crudos de cada componente del health score
+               (health["metrics"]: días desde el último post, posts/semana,
+               CTAs, temas, hashtags, likes y comments promedio)
+  percentil:   por métrica, con rango medio (empates = mitad) sobre el arreglo
+               ordenado de la cohorte (np.searchsorted izquierda/derecha)
+  score:       promedio de percentiles ponderado con los puntos de cada
+               componente (recency 30, activity 20, ...); las métricas que el
+               perfil no trae no cuentan
+
+Cohortes con menos de `min_size` perfiles caen a la vertical completa
+("taquerias|*") y luego a todos ("*|*").
+
+Uso:
+  python -m analyzers.cohort outputs/batch --vertical taquerias --followers followers.json
+  → actualiza cache/cohort_index.json y escribe el ranking (outputs/batch/cohort_ranking.json)
+"""
+import argparse
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from analyzers.health_analyzer import compute_health_score
+
+COHORT_VERSION = 1
+DEFAULT_INDEX_PATH = "cache/cohort_index.json"
+DEFAULT_MIN_SIZE = 20
+ANY = "*"
+
+# métrica de health["metrics"] → (componente del breakdown, peso, menor es mejor)
+METRICS = (
+    ("min_age_days", "recency_0_30", 30.0, True),
+    ("posts_per_week", "activity_0_20", 20.0, False),
+    ("cta_total", "cta_0_15", 15.0, False),
+    ("topic_count", "topic_diversity_0_15", 15.0, False),
+    ("hashtag_count", "hashtags_0_10", 10.0, False),
+    ("avg_likes_est", "engagement_0_10", 7.0, False),
+    ("avg_comments_est", "engagement_0_10", 3.0, False),
+)
+METRIC_NAMES = tuple(m[0] for m in METRICS)
+_WEIGHTS = np.array([m[2] for m in METRICS])
+_LOWER_IS_BETTER = [m[3] for m in METRICS]
+
+FOLLOWER_BANDS = ((1_000, "<1k"), (10_000, "1k-10k"), (100_000, "10k-100k"))
+
+def follower_band(followers: Any) -> str:
+    if not isinstance(followers, (int, float)) or followers < 0:
+        return "unknown"
+    for limit, label in FOLLOWER_BANDS:
+        if followers < limit:
+            return label
+    return "100k+"
+
+def _keys(vertical: Optional[str], band: str) -> tuple:
+    # de la más específica a la más general
+    vertical = vertical or "unknown"
+    return f"{vertical}|{band}", f"{vertical}|{ANY}", f"{ANY}|{ANY}"
+
+def _vector(metrics: Dict[str, Any]) -> List[float]:
+    out = []
+    for name in METRIC_NAMES:
+        v = (metrics or {}).get(name)
+        out.append(float(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else float("nan"))
+    return out
+
+def _matrix(rows: Iterable[Dict[str, Any]]) -> np.ndarray:
+    return np.array([_vector(m) for m in rows], dtype=float).reshape(-1, len(METRICS))
+
+class CohortIndex:
+    """
+    idx = CohortIndex(path=DEFAULT_INDEX_PATH)
+    idx.add("@perfil", health["metrics"], vertical="taquerias", followers=4200)
+    idx.score(health["metrics"], "taquerias", 4200)        # un perfil → dict
+    idx.score_batch(lista_de_metrics, verticals, followers)  # miles, vectorizado
+    idx.rank()                                             # perfiles guardados, mejor primero
+    idx.save()
+    """
+
+    def __init__(self, path: str = None, min_size: int = DEFAULT_MIN_SIZE):
+        self.path = Path(path) if path else None
+        self.min_size = max(1, min_size)
+        # perfil → {"vertical", "band", "metrics"}; volver a agregarlo lo reemplaza
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+        self._sorted: Optional[Dict[str, tuple]] = None  # cohorte → (n, [arreglo ordenado por métrica])
+        self.load()
+
+    def __len__(self):
+        return len(self._profiles)
+
+    def load(self):
+        if not self.path:
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") == COHORT_VERSION:
+            self._profiles = data.get("profiles") or {}
+            self._sorted = None
+
+    def save(self):
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": COHORT_VERSION, "profiles": self._profiles}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def add(self, profile_id: str, metrics: Dict[str, Any], vertical: Optional[str] = None,
+            followers: Optional[int] = None):
+        self._profiles[profile_id] = {
+            "vertical": vertical or "unknown",
+            "band": follower_band(followers),
+            "metrics": {name: (metrics or {}).get(name) for name in METRIC_NAMES},
+        }
+        self._sorted = None
+
+    def _build(self) -> Dict[str, tuple]:
+        if self._sorted is not None:
+            return self._sorted
+        groups: Dict[str, List[int]] = {}
+        entries = list(self._profiles.values())
+        for i, e in enumerate(entries):
+            for key in _keys(e["vertical"], e["band"]):
+                groups.setdefault(key, []).append(i)
+        X = _matrix(e["metrics"] for e in entries)
+        self._sorted = {}
+        for key, rows in groups.items():
+            sub = X[rows]
+            self._sorted[key] = (len(rows), [np.sort(col[~np.isnan(col)]) for col in sub.T])
+        return self._sorted
+
+    def cohort_for(self, vertical: Optional[str], followers: Any = None, band: str = None) -> Optional[str]:
+        """
+        Cohorte que se usa para comparar: la primera con min_size perfiles
+        (si ninguna llega, la general con lo que haya).
+        """
+        built = self._build()
+        keys = _keys(vertical, band or follower_band(followers))
+        for key in keys:
+            if key in built and built[key][0] >= self.min_size:
+                return key
+        return keys[-1] if keys[-1] in built else None
+
+    def score_batch(self, metrics: Sequence[Dict[str, Any]], verticals: Sequence[Optional[str]] = None,
+                    followers: Sequence[Any] = None, bands: Sequence[str] = None) -> Dict[str, Any]:
+        """
+        N perfiles → {"cohort": [llave], "size": (N,), "percentiles": (N, métricas), "score": (N,)}.
+        Percentiles 0-100 (NaN si el perfil no trae la métrica o el índice está vacío).
+        """
+        n = len(metrics)
+        X = _matrix(metrics)
+        verticals = verticals if verticals is not None else [None] * n
+        if bands is None:
+            followers = followers if followers is not None else [None] * n
+            bands = [follower_band(f) for f in followers]
+        built = self._build()
+
+        # perfiles agrupados por cohorte: un searchsorted por (cohorte, métrica)
+        memo: Dict[tuple, Optional[str]] = {}
+        groups: Dict[Optional[str], List[int]] = {}
+        cohorts = []
+        for i, (v, b) in enumerate(zip(verticals, bands)):
+            if (v, b) not in memo:
+                memo[(v, b)] = self.cohort_for(v, band=b)
+            key = memo[(v, b)]
+            cohorts.append(key)
+            groups.setdefault(key, []).append(i)
+
+        pct = np.full(X.shape, np.nan)
+        size = np.zeros(n, dtype=np.int64)
+        for key, rows in groups.items():
+            if key is None:
+                continue
+            rows = np.asarray(rows)
+            size[rows] = built[key][0]
+            for j, col in enumerate(built[key][1]):
+                if not len(col):
+                    continue
+                x = X[rows, j]
+                mid = (np.searchsorted(col, x, "left") + np.searchsorted(col, x, "right")) / 2.0
+                p = mid * (100.0 / len(col))
+                if _LOWER_IS_BETTER[j]:
+                    p = 100.0 - p
+                p[np.isnan(x)] = np.nan
+                pct[rows, j] = p
+
+        known = ~np.isnan(pct)
+        w = np.where(known, _WEIGHTS, 0.0)
+        total_w = w.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            score = np.where(total_w > 0, (np.where(known, pct, 0.0) * w).sum(axis=1) / total_w, np.nan)
+        return {"cohort": cohorts, "size": size, "percentiles": pct, "score": score}
+
+    def score(self, metrics: Dict[str, Any], vertical: Optional[str] = None, followers: Any = None) -> Dict[str, Any]:
+        """
+        Un perfil → dict para el JSON (va en health["cohort"]).
+        """
+        batch = self.score_batch([metrics], [vertical], [followers])
+        return _row(batch, 0)
+
+    def rank(self, profile_ids: Iterable[str] = None) -> List[Dict[str, Any]]:
+        """
+        Perfiles del índice (todos o `profile_ids`) de mejor a peor score de
+        cohorte, en un solo score_batch.
+        """
+        ids = [pid for pid in (profile_ids if profile_ids is not None else self._profiles) if pid in self._profiles]
+        entries = [self._profiles[pid] for pid in ids]
+        batch = self.score_batch(
+            [e["metrics"] for e in entries],
+            [e["vertical"] for e in entries],
+            bands=[e["band"] for e in entries],
+        )
+        order = np.argsort(-np.nan_to_num(batch["score"], nan=-1.0), kind="stable")
+        out = []
+        for pos, i in enumerate(order.tolist(), start=1):
+            row = _row(batch, i)
+            out.append({"rank": pos, "profile": ids[i], "vertical": entries[i]["vertical"],
+                        "band": entries[i]["band"], **row})
+        return out
+
+def _round(x: float) -> Optional[float]:
+    return None if np.isnan(x) else round(float(x), 1)
+
+def _row(batch: Dict[str, Any], i: int) -> Dict[str, Any]:
+    pct = batch["percentiles"][i]
+    components: Dict[str, List[float]] = {}
+    for j, (_, component, weight, _) in enumerate(METRICS):
+        if not np.isnan(pct[j]):
+            components.setdefault(component, [0.0, 0.0])
+            components[component][0] += pct[j] * weight
+            components[component][1] += weight
+    return {
+        "cohort": batch["cohort"][i],
+        "cohort_size": int(batch["size"][i]),
+        "score": _round(batch["score"][i]),
+        "percentiles": {name: _round(pct[j]) for j, name in enumerate(METRIC_NAMES)},
+        "components": {c: round(float(s / w), 1) for c, (s, w) in components.items()},
+    }
+
+def _read_reports(dirs: Iterable[str]) -> List[tuple]:
+    """
+    (handle, analytics) de cada report.json bajo `dirs` (salida de batch_runner
+    o de runner).
+    """
+    out = []
+    for d in dirs:
+        base = Path(d)
+        paths = [base] if base.is_file() else sorted(base.glob("**/report.json"))
+        for path in paths:
+            try:
+                report = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            analytics = (report.get("content") or {}).get("analytics")
+            if not analytics:
+                continue
+            profiles = report.get("profiles") or [{}]
+            handle = profiles[0].get("handle") or str(path.parent)
+            out.append((handle, analytics))
+    return out
+
+def main():
+    ap = argparse.ArgumentParser(description="Índice de cohortes y ranking por percentiles del health score")
+    ap.add_argument("paths", nargs="+", help="report.json o carpetas con report.json (outputs/batch)")
+    ap.add_argument("--vertical", help="vertical de estos perfiles (p.ej. taquerias)")
+    ap.add_argument("--followers", help='JSON {"@handle": seguidores}')
+    ap.add_argument("--index", default=DEFAULT_INDEX_PATH)
+    ap.add_argument("--min-size", type=int, default=DEFAULT_MIN_SIZE, help="perfiles mínimos por cohorte")
+    ap.add_argument("--out", help="ranking JSON (default: <primera carpeta>/cohort_ranking.json)")
+    args = ap.parse_args()
+
+    followers = {}
+    if args.followers:
+        with open(args.followers, "r", encoding="utf-8") as f:
+            followers = json.load(f)
+
+    index = CohortIndex(path=args.index, min_size=args.min_size)
+    handles = []
+    for handle, analytics in _read_reports(args.paths):
+        health = compute_health_score(analytics)
+        index.add(handle, health["metrics"], args.vertical, followers.get(handle))
+        handles.append(handle)
+    if not handles:
+        ap.error("no se encontró ningún report.json con content.analytics")
+    index.save()
+
+    ranking = index.rank(handles)
+    first = Path(args.paths[0])
+    out = args.out or str((first.parent if first.is_file() else first) / "cohort_ranking.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump({"index_profiles": len(index), "ranking": ranking}, f, ensure_ascii=False, indent=2)
+    for r in ranking:
+        print(f"{r['rank']:>3}. {r['profile']}  score={r['score']}  ({r['cohort']}, n={r['cohort_size']})")
+    print("✅ Listo:", out)
+
+if __name__ == "__main__":
+    main()
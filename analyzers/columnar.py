@@ -0,0 +1,184 @@
+# analyzers/columnar.py
+import re
+from collections import Counter
+from sys import intern
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from analyzers.caption_analyzer import DEFAULT_MATCHER, OG_COMMENTS_RE, OG_LIKES_RE, _norm_text, _to_int
+from analyzers.matcher import Matcher
+from models.post import Post
+
+# analyze_posts para corpus grandes: entra una tabla por columnas y sale el mismo
+# dict que analyze_posts. En vez de un loop de regex por post:
+#   - los textos se concatenan y los hashtags salen de UNA pasada sobre el
+#     buffer; los offsets se mapean a filas con np.searchsorted
+#   - CTA / temas: Matcher.scan_rows (vocabulario + un regex por buffer)
+#   - idioma: LanguageDetector.detect_many sobre todas las filas
+#   - conteos y promedios se calculan con numpy sobre arrays por fila
+# El orden de los dicts de frecuencias replica Counter.most_common (empates por
+# orden de primera aparición), así el resultado es idéntico al de analyze_posts.
+
+# mismo resultado que caption_analyzer.HASHTAG_RE ((?:^|\s)(#\w+)) sobre un buffer
+# que empieza con "\n", pero con "#" literal al frente: `re` salta directo a
+# cada "#" en vez de intentar el patrón en todas las posiciones
+TAG_RE = re.compile(r"#(?<=\s#)\w+")
+
+def _as_list(col) -> List:
+    if col is None:
+        return []
+    if hasattr(col, "to_pylist"):  # pyarrow.Array / ChunkedArray
+        return col.to_pylist()
+    if isinstance(col, np.ndarray):
+        return col.tolist()
+    return list(col)
+
+def posts_to_columns(posts: List[Dict[str, Any] | Post]) -> Dict[str, List]:
+    """
+    [{...} o Post, ...] → {columna: [valores]} (columnas en orden de primera aparición).
+    """
+    keys = list(dict.fromkeys(k for p in posts or [] for k in p))
+    return {k: [p.get(k) for p in posts] for k in keys}
+
+def _concat(texts: List[str], sep: str):
+    starts = np.zeros(len(texts), dtype=np.int64)
+    if texts:
+        lengths = np.fromiter((len(t) + len(sep) for t in texts), dtype=np.int64, count=len(texts))
+        starts[1:] = np.cumsum(lengths)[:-1]
+    ends = starts + np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+    return sep.join(texts), starts, ends
+
+def _first_number_per_row(rx: re.Pattern, texts: List[str], n: int):
+    """
+    Primer match de `rx` por fila → (valores int64, máscara de filas con valor).
+    Aquí conviene search por fila: se detiene en el primer match en vez de
+    recorrer todo el texto (og_description trae el caption completo).
+    """
+    values = np.zeros(n, dtype=np.int64)
+    mask = np.zeros(n, dtype=bool)
+    memo: Dict[str, Any] = {}
+    search = rx.search
+    for row, found in enumerate(search(t) for t in texts):
+        if found is None:
+            continue
+        s = found.group(1)
+        if s not in memo:
+            memo[s] = _to_int(s)
+        if memo[s] is not None:
+            values[row] = memo[s]
+            mask[row] = True
+    return values, mask
+
+def _numeric_column(col, n: int):
+    """
+    Columna numérica ya calculada (NaN / None = sin dato) → (int64, máscara).
+    """
+    arr = np.array([np.nan if v is None else v for v in _as_list(col)], dtype=float)
+    mask = ~np.isnan(arr)
+    values = np.zeros(n, dtype=np.int64)
+    values[mask] = arr[mask].astype(np.int64)
+    return values, mask
+
+def _most_common(labels: List[str], counts: np.ndarray, first_row: np.ndarray, k: int = 20) -> Dict[str, int]:
+    """
+    Igual que dict(Counter.most_common(k)) cuando el Counter se llenó en orden de
+    filas: por conteo desc, empates por primera fila y luego orden de `labels`.
+    """
+    present = np.flatnonzero(counts)
+    if not len(present):
+        return {}
+    order = np.lexsort((present, first_row[present], -counts[present]))[:k]
+    return {labels[i]: int(counts[i]) for i in present[order]}
+
+def analyze_columns(columns: Dict[str, Sequence], matcher: Matcher = None, annotate: bool = True) -> Dict[str, Any]:
+    """
+    columns: {"caption": [...], "og_description": [...], ...} (listas, arrays de
+    numpy o columnas de Arrow, todas del mismo largo). Si trae "likes_est" /
+    "comments_est" numéricas (NaN = sin dato) no se parsea og_description.
+    Devuelve el mismo dict que analyze_posts; con annotate=False posts_annotated
+    queda vacío (en millones de posts es lo más caro de armar).
+    """
+    m = matcher or DEFAULT_MATCHER
+    cols = {k: _as_list(v) for k, v in columns.items()}
+    n = max((len(v) for v in cols.values()), default=0)
+    captions = [_norm_text(c) for c in cols.get("caption") or [""] * n]
+    ogs = [_norm_text(o) for o in cols.get("og_description") or [""] * n]
+
+    blobs = [(c + "\n" + o).strip() for c, o in zip(captions, ogs)]
+
+    # hashtags: una pasada sobre el buffer original
+    raw_buf, raw_starts, _ = _concat(blobs, "\n")
+    tag_matches = [(mt.start() - 1, intern(mt.group().lower())) for mt in TAG_RE.finditer("\n" + raw_buf)]
+    hashtag_counter = Counter(t for _, t in tag_matches)
+
+    # CTA / temas: una pasada del Matcher sobre el buffer en minúsculas
+    lowered = [b.lower() for b in blobs]
+    hits = m.scan_rows(lowered)
+
+    n_labels = len(m.labels)
+    labels_flat = [label for _, label in m.labels]
+    kinds_flat = np.array([kind for kind, _ in m.labels], dtype=object)
+    keys = np.fromiter(hits, dtype=np.int64, count=len(hits))
+    hit_rows, hit_ids = np.divmod(keys, n_labels) if n_labels else (keys, keys)
+
+    # idioma por fila (detect_many: en mode="ngram" puntúa todas las filas juntas)
+    langs = m.language.detect_many(lowered)
+    total = n or 1
+    language_ratio = {code: round(k / total, 4) for code, k in Counter(langs).items()}
+
+    # frecuencias de CTA / temas: filas distintas por etiqueta + primera fila
+    counts = np.bincount(hit_ids, minlength=n_labels)
+    first_row = np.full(n_labels, np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(first_row, hit_ids, hit_rows)
+    cta_ids = np.flatnonzero(kinds_flat == "cta")
+    topic_ids = np.flatnonzero(kinds_flat == "topic")
+    cta_frequency = _most_common([labels_flat[i] for i in cta_ids], counts[cta_ids], first_row[cta_ids])
+    dominant_topics = _most_common([labels_flat[i] for i in topic_ids], counts[topic_ids], first_row[topic_ids])
+
+    # engagement
+    if "likes_est" in cols or "comments_est" in cols:
+        likes, likes_mask = _numeric_column(cols.get("likes_est") or [None] * n, n)
+        comments, comments_mask = _numeric_column(cols.get("comments_est") or [None] * n, n)
+    else:
+        ogs_lower = [o.lower() for o in ogs]
+        likes, likes_mask = _first_number_per_row(OG_LIKES_RE, ogs_lower, n)
+        comments, comments_mask = _first_number_per_row(OG_COMMENTS_RE, ogs_lower, n)
+
+    avg_likes_est = round(int(likes[likes_mask].sum()) / int(likes_mask.sum()), 2) if likes_mask.any() else None
+    avg_comments_est = round(int(comments[comments_mask].sum()) / int(comments_mask.sum()), 2) if comments_mask.any() else None
+
+    annotated_posts = []
+    if annotate:
+        tags_by_row: List[List[str]] = [[] for _ in range(n)]
+        if tag_matches:
+            tag_pos = np.fromiter((p for p, _ in tag_matches), dtype=np.int64, count=len(tag_matches))
+            for row, (_, tag) in zip((np.searchsorted(raw_starts, tag_pos, side="right") - 1).tolist(), tag_matches):
+                tags_by_row[row].append(tag)
+        row_hits: List[Dict[str, set]] = [{"cta": set(), "topic": set()} for _ in range(n)]
+        for row, lid in zip(hit_rows.tolist(), hit_ids.tolist()):
+            kind, label = m.labels[lid]
+            if kind in ("cta", "topic"):
+                row_hits[row][kind].add(label)
+
+        keys = list(cols)
+        likes_l, comments_l = likes.tolist(), comments.tolist()
+        for i in range(n):
+            post = Post.from_dict({k: cols[k][i] for k in keys})
+            post.hashtags = tags_by_row[i]
+            post.language_est = langs[i]
+            post.ctas = m.ordered("cta", row_hits[i]["cta"])
+            post.topics = m.ordered("topic", row_hits[i]["topic"])
+            post.likes_est = likes_l[i] if likes_mask[i] else None
+            post.comments_est = comments_l[i] if comments_mask[i] else None
+            annotated_posts.append(post)
+
+    return {
+        "avg_likes_est": avg_likes_est,
+        "avg_comments_est": avg_comments_est,
+        "hashtag_frequency": dict(hashtag_counter.most_common(20)),
+        "language_ratio": language_ratio,
+        "cta_frequency": cta_frequency,
+        "dominant_topics": dominant_topics,
+        "posts_annotated": annotated_posts,
+    }
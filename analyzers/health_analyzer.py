@@ -19,7 +19,8 @@ def _grade(score: int) -> str:
     if score >= 63: return "D"
     return "F"
 
-def compute_health_score(analytics: Dict[str, Any]) -> Dict[str, Any]:
+def compute_health_score(analytics: Dict[str, Any], cohort: Any = None, vertical: Optional[str] = None,
+                         followers: Optional[int] = None) -> Dict[str, Any]:
     """
     Usa analytics ya calculado (caption_analyzer + temporal).
     Devuelve:
@@ -27,6 +28,8 @@ def compute_health_score(analytics: Dict[str, Any]) -> Dict[str, Any]:
       - health_grade
       - signals (flags)
       - breakdown (por componente)
+      - metrics (valores crudos de cada componente, para cohort.CohortIndex)
+      - cohort (sólo con `cohort`: percentiles contra su cohorte (vertical, followers))
     """
     temporal = (analytics or {}).get("temporal") or {}
     language_ratio = (analytics or {}).get("language_ratio") or {}
@@ -50,13 +53,15 @@ def compute_health_score(analytics: Dict[str, Any]) -> Dict[str, Any]:
         recency = _clamp(recency, 0.0, 30.0)
 
     # ---- Component 2: Activity density (0-20) ----
-    # span_days vs número de posts fechados
-    dated_count = len([p for p in posts_with_dates if p.get("published_at")])
-    span_days = temporal.get("span_days")
-    if isinstance(span_days, int) and span_days >= 0 and dated_count > 0:
-        # posts por semana aproximado
-        weeks = max(1.0, span_days / 7.0)
-        p_per_week = dated_count / weeks
+    # posts por semana de la cadencia (temporal.cadence, semanas de calendario)
+    p_per_week = (temporal.get("cadence") or {}).get("posts_per_week")
+    if not isinstance(p_per_week, (int, float)):
+        # reportes sin cadence: span_days vs número de posts fechados
+        dated_count = len([p for p in posts_with_dates if p.get("published_at")])
+        span_days = temporal.get("span_days")
+        if isinstance(span_days, int) and span_days >= 0 and dated_count > 0:
+            p_per_week = dated_count / max(1.0, span_days / 7.0)
+    if isinstance(p_per_week, (int, float)):
         # 3+/week => 20 pts, 1/week => 12 pts, 0.3/week => 5 pts
         activity = 6.0 + (p_per_week * 5.0)
         activity = _clamp(activity, 0.0, 20.0)
@@ -127,9 +132,23 @@ def compute_health_score(analytics: Dict[str, Any]) -> Dict[str, Any]:
         "engagement_0_10": round(eng_score, 2),
     }
 
-    return {
+    metrics = {
+        "min_age_days": min_age,
+        "posts_per_week": round(p_per_week, 3) if isinstance(p_per_week, (int, float)) else None,
+        "cta_total": cta_total,
+        "topic_count": diversity_n,
+        "hashtag_count": len(hashtag_frequency) if isinstance(hashtag_frequency, dict) else 0,
+        "avg_likes_est": avg_likes_est if isinstance(avg_likes_est, (int, float)) else None,
+        "avg_comments_est": avg_comments_est if isinstance(avg_comments_est, (int, float)) else None,
+    }
+
+    result = {
         "health_score": score,
         "health_grade": _grade(score),
         "signals": signals,
-        "breakdown": breakdown
+        "breakdown": breakdown,
+        "metrics": metrics,
     }
+    if cohort is not None:
+        result["cohort"] = cohort.score(metrics, vertical, followers)
+    return result
@@ -0,0 +1,249 @@
+# analyzers/language.py
+import hashlib
+import json
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Idioma de un caption: se tokeniza UNA vez (la misma lista de tokens que usa el
+# Matcher para CTAs y temas; hashtags y @menciones quedan con su prefijo y no
+# cuentan) y se cuenta, por idioma, cuántas palabras distintas del texto están
+# en su set de pistas (una intersección de sets contra el vocabulario de todas
+# las pistas).
+#
+#   - una palabra que es pista de dos idiomas no cuenta para ninguno
+#   - sin "com" en pt: sale de cada dominio (tacos.com) en los captions
+#   - sin pistas → "unknown" (p.ej. sólo emojis y hashtags)
+#   - los dos idiomas con más pistas a ≤ 1 de diferencia → "mixed"
+#
+# mode="ngram": además un modelo de trigramas de caracteres (perfiles armados
+# de textos de muestra, log-probabilidad con suavizado add-one) decide el
+# idioma cuando el texto trae suficientes trigramas (sólo palabras, sin el
+# encabezado del og:description); cubre captions sin ninguna palabra de las
+# pistas. "mixed" sigue saliendo de las pistas.
+
+LANGUAGE_HINTS: Dict[str, frozenset] = {
+    "es": frozenset({"el", "la", "los", "las", "de", "del", "para", "con", "que", "por", "una", "un", "y", "en",
+                     "hoy", "mañana", "gracias", "sabor", "carne", "tacos"}),
+    "en": frozenset({"the", "and", "with", "for", "you", "your", "today", "tomorrow", "thanks", "best", "meat",
+                     "tacos", "order", "visit"}),
+    "pt": frozenset({"não", "uma", "você", "vocês", "obrigado", "obrigada", "hoje", "amanhã", "muito",
+                     "também", "nosso", "nossa", "isso", "melhor", "pra"}),
+    "fr": frozenset({"et", "avec", "vous", "nous", "merci", "une", "des", "du", "dans", "aujourd", "demain",
+                     "notre", "très", "meilleur", "commande", "venez", "chez"}),
+}
+LANGUAGE_MODES = ("hints", "ngram")
+MIN_NGRAMS = 12  # trigramas mínimos para que decida el modelo n-gram
+
+# tokens de las pistas (y del Matcher): \w+ con el "#" o "@" pegado, así
+# "#tacos" y "@tacos" nunca son la palabra "tacos"; el Matcher comparte la lista
+WORD_RE = re.compile(r"[#@]?\w+")
+
+# tokens del modelo n-gram: sólo letras (\w sin dígitos ni _), sin hashtags,
+# @menciones, URLs ni el encabezado del og:description ("155 likes, 0 comments -
+# handle on january 9, 2026:", que es de la UI de IG y no del caption)
+NGRAM_TOKEN_RE = re.compile(
+    r"\d[\d.,]*\s*(?:likes?|me gusta),\s*\d[\d.,]*\s*(?:comments?|comentarios?)\s*-\s*[\w.]+\s+(?:on|el)\s[^:\"]{0,40}:"
+    r"|https?://\S+|www\.\S+|[#@]\w+|([^\W\d_]+)"
+)
+
+# textos de muestra para los perfiles de trigramas (mode="ngram")
+NGRAM_SAMPLES = {
+    "es": (
+        "hoy tenemos tacos de arrachera y de pastor recién hechos ven a probarlos con tu familia "
+        "gracias por su preferencia los esperamos todos los días en nuestra sucursal del centro "
+        "pide para llevar o a domicilio y disfruta el mejor sabor de la ciudad "
+        "nuevo año nuevos sabores nuevas experiencias que tan hambrientos andan "
+        "este fin de semana tenemos promoción dos por uno en todas las bebidas "
+        "la carne asada se prepara al carbón como en casa y la salsa es de la abuela "
+        "abrimos desde las nueve de la mañana hasta la medianoche no te quedes sin probarlos "
+        "síguenos y comparte con tus amigos quién se apunta para el domingo"
+    ),
+    "en": (
+        "today we have fresh tacos and burritos made with the best ingredients in town "
+        "thanks for all the love come visit us this weekend and bring your friends "
+        "order online for pickup or delivery and enjoy our new menu "
+        "happy new year new flavors new experiences who is hungry right now "
+        "this weekend only get two drinks for the price of one at every location "
+        "our meat is grilled over charcoal just like home and the salsa is grandma's recipe "
+        "we are open from nine in the morning until midnight don't miss out "
+        "follow us and share with your friends who is coming on sunday"
+    ),
+    "pt": (
+        "hoje temos tacos frescos feitos com os melhores ingredientes da cidade "
+        "obrigado pelo carinho venham nos visitar neste fim de semana e tragam seus amigos "
+        "peça online para retirar ou receber em casa e aproveite o nosso novo cardápio "
+        "feliz ano novo novos sabores novas experiências quem está com fome agora "
+        "só neste fim de semana duas bebidas pelo preço de uma em todas as lojas "
+        "a nossa carne é assada na brasa como em casa e o molho é receita da vovó "
+        "abrimos das nove da manhã até a meia noite não fique sem provar "
+        "siga a gente e compartilhe com seus amigos quem vem no domingo"
+    ),
+    "fr": (
+        "aujourd'hui nous avons des tacos frais faits avec les meilleurs ingrédients de la ville "
+        "merci pour votre soutien venez nous voir ce week-end avec vos amis "
+        "commandez en ligne à emporter ou en livraison et profitez de notre nouveau menu "
+        "bonne année nouvelles saveurs nouvelles expériences qui a faim maintenant "
+        "ce week-end seulement deux boissons pour le prix d'une dans tous nos restaurants "
+        "notre viande est grillée au charbon comme à la maison et la sauce est la recette de mamie "
+        "nous sommes ouverts de neuf heures du matin jusqu'à minuit ne manquez pas ça "
+        "suivez-nous et partagez avec vos amis qui vient dimanche"
+    ),
+}
+
+def tokenize(text: str) -> List[str]:
+    """
+    Tokens del texto (ya en minúsculas) para las pistas: WORD_RE.findall.
+    """
+    return WORD_RE.findall(text or "")
+
+def ngram_tokenize(text: str) -> List[str]:
+    """
+    Palabras del texto (ya en minúsculas) para los trigramas: sólo letras, sin
+    hashtags/@/URLs/números ni el encabezado de likes/comments del og:description.
+    """
+    return [t for t in NGRAM_TOKEN_RE.findall(text or "") if t]
+
+def _trigrams(tokens: Iterable[str]) -> List[str]:
+    grams = []
+    for t in tokens:
+        padded = f" {t} "
+        grams.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+class LanguageDetector:
+    """
+    d = LanguageDetector()                 # o LanguageDetector(mode="ngram")
+    d.detect("hoy hay tacos 🌮")            # → "es"  (texto ya en minúsculas)
+    d.detect_many(textos)                  # lista de códigos, mismo orden
+    Códigos: los de `hints` (es, en, pt, fr), "mixed" o "unknown".
+    """
+
+    def __init__(self, hints: Dict[str, Iterable[str]] = None, mode: str = "hints",
+                 samples: Dict[str, str] = None):
+        if mode not in LANGUAGE_MODES:
+            raise ValueError(f"mode de idioma desconocido: {mode!r} (usa {', '.join(LANGUAGE_MODES)})")
+        self.mode = mode
+        self.codes = list(hints or LANGUAGE_HINTS)
+        hint_sets = {code: frozenset(w.lower() for w in words) for code, words in (hints or LANGUAGE_HINTS).items()}
+        owners: Dict[str, List[int]] = {}
+        for i, code in enumerate(self.codes):
+            for w in hint_sets[code]:
+                owners.setdefault(w, []).append(i)
+        # sólo las pistas de un idioma: palabra → índice en self.codes
+        self._lang_of = {w: ids[0] for w, ids in owners.items() if len(ids) == 1}
+        self._vocab = frozenset(self._lang_of)
+        self._samples = samples or NGRAM_SAMPLES
+        self._gram_ids: Dict[str, int] = {}
+        self._logp = None
+        if mode == "ngram":
+            self._build_ngrams()
+        # cambia si cambian las pistas, el modo o las muestras (versiona el memo)
+        self.fingerprint = hashlib.sha256(json.dumps(
+            [mode, [(c, sorted(hint_sets[c])) for c in self.codes],
+             sorted(self._samples.items()) if mode == "ngram" else None],
+            ensure_ascii=False,
+        ).encode("utf-8")).hexdigest()[:16]
+
+    def _build_ngrams(self):
+        codes = [c for c in self.codes if c in self._samples]
+        counts = {c: Counter(_trigrams(ngram_tokenize(self._samples[c].lower()))) for c in codes}
+        vocab = sorted(set().union(*counts.values()))
+        self._gram_ids = {g: i for i, g in enumerate(vocab)}
+        # fila extra al final: trigramas que no están en ninguna muestra
+        logp = np.full((len(vocab) + 1, len(self.codes)), -np.inf)
+        for j, code in enumerate(self.codes):
+            if code not in counts:
+                continue
+            c = counts[code]
+            denom = sum(c.values()) + len(vocab) + 1
+            logp[:-1, j] = np.log((np.array([c.get(g, 0) for g in vocab], dtype=float) + 1.0) / denom)
+            logp[-1, j] = math.log(1.0 / denom)
+        self._logp = logp
+
+    def _from_counts(self, counts: List[int]) -> str:
+        best = second = 0
+        best_i = -1
+        for i, k in enumerate(counts):
+            if k > best:
+                best, second, best_i = k, best, i
+            elif k > second:
+                second = k
+        if best == 0:
+            return "unknown"
+        if second > 0 and best - second <= 1:
+            return "mixed"
+        return self.codes[best_i]
+
+    def detect_tokens(self, tokens: Iterable[str]) -> str:
+        """
+        Idioma por pistas de una lista de tokens (tokenize).
+        """
+        hits = self._vocab.intersection(tokens)
+        if not hits:
+            return "unknown"
+        lang_of = self._lang_of
+        if len(hits) == 1:
+            return self.codes[lang_of[next(iter(hits))]]
+        counts = [0] * len(self.codes)
+        for w in hits:
+            counts[lang_of[w]] += 1
+        return self._from_counts(counts)
+
+    def _ngram_scores(self, grams: List[str]) -> np.ndarray:
+        unknown = len(self._gram_ids)
+        get = self._gram_ids.get
+        ids = np.fromiter((get(g, unknown) for g in grams), dtype=np.int64, count=len(grams))
+        return self._logp[ids].sum(axis=0)
+
+    def detect(self, text: str, tokens: Sequence[str] = None) -> str:
+        """
+        `text` ya debe venir en minúsculas (como Matcher.scan_ids); `tokens`:
+        tokenize(text) si ya se calculó (la misma lista que Matcher.scan_ids).
+        """
+        by_hints = self.detect_tokens(tokens if tokens is not None else tokenize(text))
+        if self.mode != "ngram" or by_hints == "mixed":
+            return by_hints
+        grams = _trigrams(ngram_tokenize(text))
+        if len(grams) < MIN_NGRAMS:
+            return by_hints
+        return self.codes[int(np.argmax(self._ngram_scores(grams)))]
+
+    def detect_many(self, texts: Sequence[str]) -> List[str]:
+        """
+        detect() de cada texto; en mode="ngram" los trigramas de todos los
+        textos se puntúan en una sola operación (np.add.reduceat).
+        """
+        findall = WORD_RE.findall
+        out = [self.detect_tokens(findall(t)) for t in texts]
+        if self.mode != "ngram":
+            return out
+
+        rows, all_grams, starts = [], [], []
+        for i, text in enumerate(texts):
+            if out[i] == "mixed":
+                continue
+            grams = _trigrams(ngram_tokenize(text))
+            if len(grams) >= MIN_NGRAMS:
+                rows.append(i)
+                starts.append(len(all_grams))
+                all_grams.extend(grams)
+        if rows:
+            unknown = len(self._gram_ids)
+            get = self._gram_ids.get
+            ids = np.fromiter((get(g, unknown) for g in all_grams), dtype=np.int64, count=len(all_grams))
+            scores = np.add.reduceat(self._logp[ids], np.asarray(starts), axis=0)
+            for i, j in zip(rows, np.argmax(scores, axis=1).tolist()):
+                out[i] = self.codes[j]
+        return out
+
+DEFAULT_DETECTOR = LanguageDetector()
+
+def detect_language(text: str, detector: Optional[LanguageDetector] = None) -> str:
+    """
+    Atajo: idioma de un texto cualquiera (se pasa a minúsculas aquí).
+    """
+    return (detector or DEFAULT_DETECTOR).detect((text or "").lower())
@@ -0,0 +1,208 @@
+# analyzers/matcher.py
+import hashlib
+import json
+import re
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+try:
+    import re._parser as sre_parse  # 3.11+
+except ImportError:
+    import sre_parse
+
+from analyzers.language import DEFAULT_DETECTOR, WORD_RE, LanguageDetector
+
+# Todos los diccionarios (CTAs, temas) se preparan UNA vez:
+#
+# - Entradas que son una sola palabra (\bpalabra\b: casi todos los temas) no
+#   pasan por regex: se intersectan los tokens del texto (language.WORD_RE: \w+
+#   con el "#"/"@" pegado, la misma lista que usa el detector de idioma) con ese
+#   vocabulario + sus variantes "#palabra"/"@palabra", que es exactamente lo
+#   que significa \bpalabra\b.
+# - El resto (CTAs, frases) se indexa por el tramo literal más largo que todo
+#   match tiene que contener ("orden" en \borden(a|e|en)?\b). Cada regex sólo
+#   corre (re.search) si su literal aparece en el texto; `in` es una búsqueda en
+#   C y descarta casi todas.
+#
+# Como lo que finalmente decide es el mismo re.search de cada patrón, el
+# resultado es idéntico a correr todos por separado.
+#
+# Diccionario: {kind: {label: [patrones]}}
+#   - kinds en `regex_kinds`: los patrones son regex tal cual (CTA_PATTERNS)
+#   - el resto: palabras/frases literales → \bpalabra\b
+
+_BOUNDED_WORD = re.compile(r"\\b(\w+)\\b")
+
+def _word_pattern(word: str) -> str:
+    return rf"\b{re.escape(word.lower())}\b"
+
+def _single_word(src: str) -> str | None:
+    r"""
+    \bpalabra\b → "palabra"; cualquier otro patrón → None.
+    """
+    m = _BOUNDED_WORD.fullmatch(src)
+    return m.group(1) if m else None
+
+def _required_literal(pattern: str) -> str:
+    r"""
+    El tramo literal más largo que todo match tiene que contener:
+      \borden(a|e|en)?\b → "orden", uber\s*eats → "uber", a|b → "" (ninguno)
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return ""
+    if parsed.state.flags & (re.IGNORECASE | re.LOCALE):
+        return ""
+    best = run = ""
+    for op, av in parsed.data:
+        if op is sre_parse.LITERAL:
+            run += chr(av)
+            if len(run) > len(best):
+                best = run
+        else:
+            run = ""
+    return best
+
+class Matcher:
+    """
+    m = Matcher({"cta": {...}, "topic": {...}}, regex_kinds={"cta"}, language=LanguageDetector())
+    m.scan(texto) → {"cta": {"order", ...}, "topic": {...}}
+    m.language.detect(texto) → "es" | "en" | ... (el detector viaja con los diccionarios)
+    """
+
+    def __init__(self, dictionaries: Dict[str, Dict[str, List[str]]], regex_kinds: Set[str] = frozenset(),
+                 language: LanguageDetector = None):
+        self.language = language or DEFAULT_DETECTOR
+        self.order: Dict[str, List[str]] = {}
+        # (kind, label) en orden de diccionario; scan_rows reporta su índice
+        self.labels: List[Tuple[str, str]] = []
+        self.entries: List[Tuple[str, str, re.Pattern, int]] = []
+        self.words: Dict[str, List[int]] = {}     # palabra → índices de self.labels
+        self.literals: Dict[str, List[int]] = {}  # literal requerido → entradas de regex
+        for kind, labels in dictionaries.items():
+            self.order[kind] = list(labels)
+            for label, patterns in labels.items():
+                lid = len(self.labels)
+                self.labels.append((kind, label))
+                for pat in patterns:
+                    src = pat if kind in regex_kinds else _word_pattern(pat)
+                    i = len(self.entries)
+                    self.entries.append((kind, label, re.compile(src), lid))
+                    word = _single_word(src)
+                    if word is not None:
+                        if lid not in self.words.setdefault(word, []):
+                            self.words[word].append(lid)
+                    else:
+                        self.literals.setdefault(_required_literal(src), []).append(i)
+        # WORD_RE deja el "#"/"@" pegado: "#bbq" también es \bbbq\b
+        for word in list(self.words):
+            self.words["#" + word] = self.words["@" + word] = self.words[word]
+        self._vocab = frozenset(self.words)
+        # cambia si cambia cualquier patrón/etiqueta (versiona caches, ver memo)
+        self.fingerprint = hashlib.sha256(json.dumps(
+            [[(kind, label, rx.pattern) for kind, label, rx, _ in self.entries], self.language.fingerprint],
+            ensure_ascii=False,
+        ).encode("utf-8")).hexdigest()[:16]
+
+    def scan_ids(self, text: str, tokens: List[str] = None) -> List[int]:
+        """
+        Índices de self.labels encontrados, ordenados: como self.labels sigue el
+        orden del diccionario, por kind salen igual que con `ordered`.
+        `text` ya debe venir en minúsculas; `tokens`: WORD_RE.findall(text) si
+        ya se calculó (se comparte con language.LanguageDetector.detect).
+        """
+        if not text:
+            return []
+        words = self.words
+        found: Set[int] = set()
+        for word in self._vocab.intersection(tokens if tokens is not None else WORD_RE.findall(text)):
+            found.update(words[word])
+        entries = self.entries
+        for literal, ids in self.literals.items():
+            if literal in text:
+                for i in ids:
+                    _, _, rx, lid = entries[i]
+                    if lid not in found and rx.search(text):
+                        found.add(lid)
+        return sorted(found)
+
+    def scan(self, text: str, tokens: List[str] = None) -> Dict[str, Set[str]]:
+        """
+        Etiquetas encontradas por kind. `text` ya debe venir en minúsculas.
+        """
+        found: Dict[str, Set[str]] = {kind: set() for kind in self.order}
+        labels = self.labels
+        for lid in self.scan_ids(text, tokens):
+            kind, label = labels[lid]
+            found[kind].add(label)
+        return found
+
+    def scan_rows(self, rows: List[str]) -> Set[int]:
+        """
+        Varias filas (ya en minúsculas) de una vez: {fila * len(self.labels) +
+        índice de self.labels}. Cada literal requerido se busca UNA vez sobre las
+        filas concatenadas (str.find, saltando a la fila siguiente en cuanto
+        aparece) y su regex sólo corre en las filas donde está.
+        """
+        hits: Set[int] = set()
+        n_labels = len(self.labels)
+        vocab, words, findall = self._vocab, self.words, WORD_RE.findall
+        for row, text in enumerate(rows):
+            found = vocab.intersection(findall(text))
+            if found:
+                base = row * n_labels
+                for word in found:
+                    for lid in words[word]:
+                        hits.add(base + lid)
+        if not self.literals or not rows:
+            return hits
+
+        starts = []
+        offset = 0
+        for text in rows:
+            starts.append(offset)
+            offset += len(text) + 1
+        buffer = "\n".join(rows)
+        n = len(rows)
+        find = buffer.find
+        for literal, ids in self.literals.items():
+            if literal:
+                candidates = []
+                pos = find(literal)
+                while pos != -1:
+                    row = bisect_right(starts, pos) - 1
+                    candidates.append(row)
+                    pos = find(literal, starts[row + 1]) if row + 1 < n else -1
+            else:
+                candidates = range(n)
+            for i in ids:
+                _, _, rx, lid = self.entries[i]
+                search = rx.search
+                for row in candidates:
+                    key = row * n_labels + lid
+                    if key not in hits and search(rows[row]):
+                        hits.add(key)
+        return hits
+
+    def ordered(self, kind: str, labels: Set[str]) -> List[str]:
+        """
+        Etiquetas en el orden del diccionario (como las regresaba el loop original).
+        """
+        return [l for l in self.order.get(kind, []) if l in labels]
+
+def merge_dictionaries(base: Dict[str, Dict[str, List[str]]], extra: Dict[str, Dict[str, List[str]]]) -> Dict:
+    """
+    Diccionario de una vertical encima del default: por kind, las etiquetas que
+    trae se agregan (o reemplazan si ya existían).
+    """
+    merged = {kind: dict(labels) for kind, labels in base.items()}
+    for kind, labels in (extra or {}).items():
+        merged.setdefault(kind, {}).update(labels)
+    return merged
+
+def load_dictionaries(path: str) -> Dict[str, Dict[str, List[str]]]:
+    """
+    JSON {kind: {label: [patrones]}} de una vertical (ej. verticals/gym.json).
+    """
+    return json.loads(Path(path).read_text(encoding="utf-8"))
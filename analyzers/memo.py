@@ -0,0 +1,153 @@
+# analyzers/memo.py
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from analyzers.caption_analyzer import DEFAULT_MATCHER
+from analyzers.matcher import Matcher
+
+# Memo del análisis por texto: reposts, collabs (el mismo post en el grid de
+# varios perfiles) y los mismos posts re-analizados cada día dan exactamente el
+# mismo caption + og_description, y todo lo que sale de annotate_fused menos
+# age_days depende sólo de ese texto.
+#
+#   llave:   hash de caption y og_description normalizados (por separado:
+#            likes/comments salen sólo de og_description)
+#   entrada: (hashtags, idioma, ctas, temas, likes_est, comments_est, fecha del
+#            texto; las relativas como timedelta, se resuelven en cada corrida)
+#
+# Dos niveles: LRU en memoria (`capacity` entradas) y, con `path`, un JSON en
+# disco (cache/analysis.json) versionado con ANALYZER_VERSION + la huella del
+# Matcher: si cambian los diccionarios o el analizador, el archivo se ignora.
+
+ANALYZER_VERSION = 4  # subir cuando cambie lo que calcula pipeline.analyze_text
+DEFAULT_MEMO_PATH = "cache/analysis.json"
+DEFAULT_CAPACITY = 50_000
+
+Entry = Tuple[Tuple[str, ...], str, Tuple[str, ...], Tuple[str, ...], Optional[int], Optional[int],
+              Optional[datetime | timedelta]]
+
+def text_key(caption: str, og: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{len(caption)}:{caption}\n{og}".encode("utf-8"))
+    return h.hexdigest()
+
+def _dump_entry(e: Entry) -> list:
+    tags, language, ctas, topics, likes, comments, found = e
+    # fecha: ISO si es absoluta, segundos (int) si es relativa
+    if isinstance(found, timedelta):
+        found = int(found.total_seconds())
+    elif found is not None:
+        found = found.isoformat()
+    return [list(tags), language, list(ctas), list(topics), likes, comments, found]
+
+def _load_entry(raw: list) -> Entry:
+    tags, language, ctas, topics, likes, comments, found = raw
+    if isinstance(found, int):
+        found = timedelta(seconds=found)
+    elif found is not None:
+        found = datetime.fromisoformat(found)
+    return tuple(tags), language, tuple(ctas), tuple(topics), likes, comments, found
+
+class AnalysisMemo:
+    """
+    memo = AnalysisMemo(matcher, path=DEFAULT_MEMO_PATH)
+    analyze_fused(posts, matcher, memo=memo)
+    memo.save()
+    """
+
+    def __init__(self, matcher: Matcher = None, capacity: int = DEFAULT_CAPACITY, path: str = None):
+        self.matcher = matcher or DEFAULT_MATCHER
+        self.version = f"{ANALYZER_VERSION}:{self.matcher.fingerprint}"
+        self.capacity = max(1, capacity)
+        self.path = Path(path) if path else None
+        self._lru: "OrderedDict[str, Entry]" = OrderedDict()
+        self._disk: Dict[str, list] = {}   # entradas del archivo, sin deserializar
+        self._new: Dict[str, Entry] = {}   # calculadas en esta corrida (para save)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self):
+        if not self.path:
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") == self.version:
+            self._disk = data.get("entries") or {}
+
+    def save(self):
+        if not self.path or not self._new:
+            return
+        entries = dict(self._disk)
+        entries.update((k, _dump_entry(e)) for k, e in self._new.items())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": self.version, "entries": entries}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self._disk = entries
+        self._new = {}
+
+    def check(self, matcher: Matcher = None):
+        """
+        ValueError si el memo se armó con otros diccionarios que `matcher`.
+        """
+        if (matcher or DEFAULT_MATCHER).fingerprint != self.matcher.fingerprint:
+            raise ValueError("AnalysisMemo armado con otro Matcher (diccionarios distintos)")
+
+    def get(self, key: str) -> Optional[Entry]:
+        entry = self._lru.get(key)
+        if entry is not None:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return entry
+        raw = self._disk.get(key)
+        if raw is not None:
+            try:
+                entry = _load_entry(raw)
+            except (TypeError, ValueError):
+                entry = None
+            if entry is not None:
+                self.hits += 1
+                self.disk_hits += 1
+                self._remember(key, entry)
+                return entry
+        self.misses += 1
+        return None
+
+    def put(self, key: str, entry: Entry):
+        self._remember(key, entry)
+        if self.path:
+            self._new[key] = entry
+
+    def _remember(self, key: str, entry: Entry):
+        self._lru[key] = entry
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.capacity:
+            self._lru.popitem(last=False)
+
+    def stats(self, since: Dict = None) -> Dict:
+        """
+        Conteos acumulados; con `since` (un stats() anterior) sólo lo de después.
+        """
+        hits = self.hits - (since or {}).get("hits", 0)
+        disk_hits = self.disk_hits - (since or {}).get("disk_hits", 0)
+        misses = self.misses - (since or {}).get("misses", 0)
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "disk_hits": disk_hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else None,
+            "size": len(self._lru),
+            "disk_size": len(self._disk) + len(self._new),
+            "version": self.version,
+        }
@@ -0,0 +1,66 @@
+# analyzers/parallel.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+from analyzers.caption_analyzer import finalize_posts, merge_accumulators, new_accumulator
+from analyzers.matcher import Matcher
+from analyzers.pipeline import accumulate_fused
+from analyzers.temporal_analyzer import finalize_temporal, merge_temporal, new_temporal_accumulator
+
+# analyze_posts + analyze_temporal sobre corpus grandes, en varios procesos:
+#   map:    cada chunk de posts → acumuladores parciales (caption y temporal,
+#           en una pasada: pipeline.accumulate_fused)
+#   reduce: los parciales se mezclan EN ORDEN de chunk y se finalizan una vez
+# Como los acumuladores guardan conteos, sumas y las fechas (no promedios ni
+# top-k ya recortados), el resultado es idéntico al de un solo proceso.
+
+DEFAULT_CHUNK_SIZE = 2000
+
+_worker_matcher: Matcher = None
+
+def _init_worker(matcher: Matcher):
+    # el Matcher viaja una vez por proceso, no una vez por chunk
+    global _worker_matcher
+    _worker_matcher = matcher
+
+def _analyze_chunk(args: Tuple[List[Dict[str, Any]], datetime]) -> Tuple[Dict, Dict]:
+    posts, now = args
+    return accumulate_fused(posts, _worker_matcher, now)
+
+def _chunks(posts: List[Dict[str, Any]], size: int):
+    for i in range(0, len(posts), size):
+        yield posts[i:i + size]
+
+def analyze_corpus(
+    posts: List[Dict[str, Any]],
+    matcher: Matcher = None,
+    workers: int = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    now: datetime = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    → (analytics, temporal), lo mismo que:
+        analytics = analyze_posts(posts, matcher)
+        temporal = analyze_temporal(analytics["posts_annotated"], now)
+    `workers`: procesos (default: os.cpu_count()); con 1 o un solo chunk no se
+    abre pool.
+    """
+    posts = list(posts or [])
+    now = now or datetime.now(timezone.utc)
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, chunk_size)
+
+    if workers <= 1 or len(posts) <= chunk_size:
+        acc, tacc = accumulate_fused(posts, matcher, now)
+        return finalize_posts(acc), finalize_temporal(tacc)
+
+    acc, tacc = new_accumulator(), new_temporal_accumulator()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(matcher,)) as pool:
+        # map respeta el orden de los chunks: el merge también
+        for part, tpart in pool.map(_analyze_chunk, ((chunk, now) for chunk in _chunks(posts, chunk_size))):
+            merge_accumulators(acc, part)
+            merge_temporal(tacc, tpart)
+
+    return finalize_posts(acc), finalize_temporal(tacc)
@@ -0,0 +1,204 @@
+# analyzers/streaming.py
+"""
+Análisis en streaming con memoria acotada: los posts entran de cualquier
+iterador (ej. un JSONL), se anotan uno por uno y se mandan a un sink en vez de
+juntarse en posts_annotated / posts_with_dates.
+
+Uso:
+  python -m analyzers.streaming posts.jsonl --out anotados.jsonl --summary resumen.json
+
+Memoria constante respecto al número de posts:
+  - CTAs, temas, idioma: Counters acotados por el diccionario
+  - engagement: sumas y conteos (promedios al final)
+  - fechas: histograma por día (ver temporal_analyzer.new_temporal_accumulator)
+  - hashtags: top-k aproximado con Space-Saving (exacto mientras los hashtags
+    distintos no pasen de la capacidad)
+"""
+import argparse
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from analyzers.caption_analyzer import accumulate_post, finalize_posts, new_accumulator
+from analyzers.matcher import Matcher
+from analyzers.memo import AnalysisMemo
+from analyzers.pipeline import annotate_fused
+from analyzers.temporal_analyzer import accumulate_date, finalize_temporal, new_temporal_accumulator
+from models.post import Post
+
+DEFAULT_TOP_K = 1000  # contadores de hashtags en memoria (se reportan 20)
+
+class SpaceSaving:
+    """
+    Heavy hitters con `capacity` contadores (Metwally et al., Space-Saving):
+    cuando se llena, el hashtag nuevo reemplaza al de menor conteo y hereda ese
+    conteo como error. Los conteos reportados son cotas superiores; el error de
+    cada uno está en `errors`. Misma interfaz que Counter para update/most_common
+    (empates por orden de primera aparición, igual que Counter).
+    """
+
+    def __init__(self, capacity: int = DEFAULT_TOP_K):
+        self.capacity = max(1, capacity)
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self._first: Dict[str, int] = {}
+        self._buckets: Dict[int, Dict[str, None]] = {}  # conteo → llaves (set ordenado)
+        self._min = 0
+        self._seq = 0
+        self.exact = True
+
+    def _move(self, key: str, old: int, new: int):
+        if old:
+            bucket = self._buckets[old]
+            del bucket[key]
+            if not bucket:
+                del self._buckets[old]
+                if self._min == old:
+                    self._min = new
+        self._buckets.setdefault(new, {})[key] = None
+        self.counts[key] = new
+
+    def add(self, key: str):
+        count = self.counts.get(key)
+        if count is not None:
+            self._move(key, count, count + 1)
+        elif len(self.counts) < self.capacity:
+            self.errors[key] = 0
+            self._first[key] = self._seq
+            self._move(key, 0, 1)
+            self._min = 1
+        else:
+            # lleno: el más viejo de los de menor conteo deja su lugar
+            floor = self._min
+            bucket = self._buckets[floor]
+            victim = next(iter(bucket))
+            del bucket[victim]
+            if not bucket:
+                del self._buckets[floor]
+            del self.counts[victim], self.errors[victim], self._first[victim]
+            self.errors[key] = floor
+            self._first[key] = self._seq
+            self._move(key, 0, floor + 1)
+            if floor not in self._buckets:
+                self._min = floor + 1
+            self.exact = False
+        self._seq += 1
+
+    def update(self, keys: Iterable[str]):
+        for key in keys:
+            self.add(key)
+
+    def most_common(self, n: int = None) -> List[Tuple[str, int]]:
+        first = self._first
+        items = sorted(self.counts.items(), key=lambda kv: (-kv[1], first[kv[0]]))
+        return items if n is None else items[:n]
+
+class StreamingAnalyzer:
+    """
+    sa = StreamingAnalyzer(sink=JsonlSink("anotados.jsonl"))
+    for post in iter_jsonl("posts.jsonl"):
+        sa.add(post)
+    sa.result()  → analytics de analyze_posts (+ "temporal") sin las listas de posts
+    """
+
+    def __init__(self, matcher: Matcher = None, top_k: int = DEFAULT_TOP_K, now: datetime = None,
+                 sink: Callable[[Post], None] = None, memo: AnalysisMemo = None):
+        if memo is not None:
+            memo.check(matcher)
+        self.matcher = matcher
+        self.memo = memo
+        self.now = now or datetime.now(timezone.utc)
+        self.sink = sink
+        self.hashtags = SpaceSaving(top_k)
+        self.acc = new_accumulator(keep_posts=False, hashtags=self.hashtags)
+        self.tacc = new_temporal_accumulator(keep_posts=False)
+        self.posts = 0
+
+    def add(self, post: Dict[str, Any] | Post) -> Post:
+        """
+        Anota un post (caption + fecha), actualiza los agregados y pasa el Post
+        anotado al sink.
+        """
+        record, dt = annotate_fused(post, self.matcher, self.now, self.memo)
+        accumulate_post(self.acc, record)
+        accumulate_date(self.tacc, dt, record)
+        self.posts += 1
+        if self.sink is not None:
+            self.sink(record)
+        return record
+
+    def result(self) -> Dict[str, Any]:
+        analytics = finalize_posts(self.acc)
+        analytics["temporal"] = finalize_temporal(self.tacc)
+        analytics["stream"] = {
+            "posts": self.posts,
+            "hashtag_capacity": self.hashtags.capacity,
+            "hashtags_exact": self.hashtags.exact,
+        }
+        return analytics
+
+def analyze_stream(posts: Iterable[Dict[str, Any]], matcher: Matcher = None,
+                   sink: Callable[[Post], None] = None, top_k: int = DEFAULT_TOP_K,
+                   now: datetime = None, memo: AnalysisMemo = None) -> Dict[str, Any]:
+    sa = StreamingAnalyzer(matcher=matcher, top_k=top_k, now=now, sink=sink, memo=memo)
+    for post in posts:
+        sa.add(post)
+    return sa.result()
+
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Un post por línea; las líneas vacías se saltan.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+class JsonlSink:
+    """
+    Sink que escribe cada post anotado como una línea de JSONL (aquí se pasa
+    el Post a dict, no antes).
+    """
+
+    def __init__(self, path: str):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._f = open(path, "w", encoding="utf-8")
+
+    def __call__(self, post: Post):
+        self._f.write(json.dumps(post.to_dict(), ensure_ascii=False) + "\n")
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def main():
+    ap = argparse.ArgumentParser(description="Análisis en streaming de un JSONL de posts")
+    ap.add_argument("posts", help="JSONL: un post por línea ({caption, og_description, ...})")
+    ap.add_argument("--out", help="JSONL de posts anotados (default: no se guardan)")
+    ap.add_argument("--summary", default="outputs/stream/summary.json")
+    ap.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="contadores de hashtags en memoria")
+    args = ap.parse_args()
+
+    sink = JsonlSink(args.out) if args.out else None
+    try:
+        summary = analyze_stream(iter_jsonl(args.posts), sink=sink, top_k=args.top_k)
+    finally:
+        if sink is not None:
+            sink.close()
+
+    os.makedirs(os.path.dirname(args.summary) or ".", exist_ok=True)
+    with open(args.summary, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    print(f"✅ {summary['stream']['posts']} posts → {args.summary}")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,12 @@
 # analyzers/temporal_analyzer.py
 import re
-from datetime import datetime, timezone
-from collections import Counter, defaultdict
-from typing import Dict, List, Any, Optional
+from datetime import datetime, timedelta, timezone
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+
+from analyzers.cadence import Cadence
+from models.post import Post
 
 # Month maps (English + Spanish short/basic)
 MONTHS = {
@@ -45,21 +49,55 @@ RE_DAY_DE_MONTH_DE_YEAR = re.compile(
     re.IGNORECASE
 )
 
+# Relativas (las absolutas de arriba tienen prioridad): "3 days ago",
+# "an hour ago", "hace 2 semanas", "hace un mes". "hace un día" sólo si es toda
+# la frase o le sigue puntuación / fin del texto: "hace un día precioso" es el clima
+RE_RELATIVE_DATE = re.compile(
+    r"\b(?P<ago_n>\d{1,4}|an?|one)\s+(?P<ago_unit>minute|hour|day|week|month|year)s?\s+ago\b"
+    r"|\bhace\s+(?!un\s+d[ií]a\b(?!\s*(?:[.,;:!?)…]|$)))"
+    r"(?P<hace_n>\d{1,4}|una?)\s+(?P<hace_unit>minuto|hora|d[ií]a|semana|mes|año)(?:s|es)?\b",
+    re.IGNORECASE
+)
+
+_UNIT_DAYS = {
+    "minute": 0, "hour": 0, "day": 1, "week": 7, "month": 30, "year": 365,
+    "minuto": 0, "hora": 0, "día": 1, "dia": 1, "semana": 7, "mes": 30, "año": 365,
+}
+_UNIT_SECONDS = {"minute": 60, "hour": 3600, "minuto": 60, "hora": 3600}
+
 def _norm(s: str) -> str:
     return (s or "").strip()
 
 def _lower(s: str) -> str:
     return _norm(s).lower()
 
+@lru_cache(maxsize=1024)
 def _month_to_num(m: str) -> Optional[int]:
     if not m:
         return None
     return MONTHS.get(_lower(m))
 
-def parse_post_date(text: str) -> Optional[datetime]:
+def _absolute(year: str, month_name: str, day: str) -> Optional[datetime]:
+    month = _month_to_num(month_name)
+    if not month:
+        return None
+    try:
+        return datetime(int(year), month, int(day), tzinfo=timezone.utc)
+    except ValueError:  # "February 30": no es fecha
+        return None
+
+def _relative(n: str, unit: str) -> timedelta:
+    n = int(n) if n.isdigit() else 1
+    unit = unit.lower()
+    if unit in _UNIT_SECONDS:
+        return timedelta(seconds=n * _UNIT_SECONDS[unit])
+    return timedelta(days=n * _UNIT_DAYS[unit])
+
+def find_post_date(text: str) -> Optional[datetime | timedelta]:
     """
-    Intenta sacar fecha de un blob de texto (caption + og_description).
-    Regresa datetime UTC (00:00) si encuentra.
+    Fecha en el texto, sin reloj: datetime (absoluta, UTC 00:00) o timedelta
+    ("hace 2 semanas" → 14 días antes del reloj de referencia; ver resolve_date).
+    Se puede cachear por texto (memo): no depende de cuándo se corre.
     """
     t = _norm(text)
     if not t:
@@ -67,79 +105,221 @@ def parse_post_date(text: str) -> Optional[datetime]:
 
     m = RE_ON_MONTH_DAY_YEAR.search(t)
     if m:
-        month_name, day, year = m.group(1), m.group(2), m.group(3)
-        month = _month_to_num(month_name)
-        if month:
-            return datetime(int(year), month, int(day), tzinfo=timezone.utc)
+        dt = _absolute(m.group(3), m.group(1), m.group(2))
+        if dt:
+            return dt
 
     m2 = RE_DAY_DE_MONTH_DE_YEAR.search(t)
     if m2:
-        day, month_name, year = m2.group(1), m2.group(2), m2.group(3)
-        month = _month_to_num(month_name)
-        if month:
-            return datetime(int(year), month, int(day), tzinfo=timezone.utc)
+        dt = _absolute(m2.group(3), m2.group(2), m2.group(1))
+        if dt:
+            return dt
 
+    # toda relativa trae "ago" o "hace": sin eso no vale la pena la regex
+    low = t.lower()
+    m3 = RE_RELATIVE_DATE.search(t) if "ago" in low or "hace" in low else None
+    if m3:
+        if m3.group("ago_n"):
+            return _relative(m3.group("ago_n"), m3.group("ago_unit"))
+        return _relative(m3.group("hace_n"), m3.group("hace_unit"))
     return None
 
-def analyze_temporal(posts: List[Dict[str, Any]]) -> Dict[str, Any]:
+def resolve_date(found: Optional[datetime | timedelta], now: datetime) -> Optional[datetime]:
     """
-    Input: posts_annotated (ideal) o top_posts.
-    Espera campos:
-      - caption
-      - og_description
-      - likes_est (opcional)
-      - comments_est (opcional)
-    Output:
-      - min_date / max_date
-      - span_days
-      - posts_per_year
-      - avg_likes_est_per_year (si hay)
-      - avg_comments_est_per_year (si hay)
-      - era_guess (3 buckets por terciles)
-      - posts_with_dates (misma lista con published_at + year/month)
+    Resultado de find_post_date → datetime UTC (00:00). Las relativas se restan
+    de `now`, el mismo reloj para todo el batch.
     """
-    now = datetime.now(timezone.utc)
+    if found is None or isinstance(found, datetime):
+        return found
+    dt = now - found
+    return datetime(dt.year, dt.month, dt.day, tzinfo=timezone.utc)
 
-    posts_with_dates = []
-    dates = []
+def machine_date(p: Dict[str, Any] | Post) -> Optional[datetime]:
+    """
+    Timestamp exacto del extractor: taken_at (epoch del JSON de IG o del
+    <time datetime> de la página; ISO también vale). None si no trae.
+    """
+    taken_at = p.get("taken_at")
+    if not taken_at:
+        return None
+    try:
+        if isinstance(taken_at, (int, float)):
+            return datetime.fromtimestamp(taken_at, tz=timezone.utc)
+        dt = datetime.fromisoformat(str(taken_at).replace("Z", "+00:00"))
+    except (ValueError, OverflowError, OSError):
+        return None
+    return dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
 
-    per_year = Counter()
-    likes_by_year = defaultdict(list)
-    comments_by_year = defaultdict(list)
+def parse_post_date(text: str, now: datetime = None) -> Optional[datetime]:
+    """
+    Intenta sacar fecha de un blob de texto (caption + og_description).
+    Regresa datetime UTC (00:00) si encuentra; las relativas ("3 days ago",
+    "hace 2 semanas") contra `now` (default: ahora).
+    """
+    found = find_post_date(text)
+    if isinstance(found, timedelta):
+        return resolve_date(found, now or datetime.now(timezone.utc))
+    return found
 
-    for p in posts or []:
-        caption = _norm(p.get("caption", ""))
-        og = _norm(p.get("og_description", ""))
-        blob = (caption + "\n" + og).strip()
+def _post_blob(p: Dict[str, Any] | Post) -> str:
+    return (_norm(p.get("caption", "")) + "\n" + _norm(p.get("og_description", ""))).strip()
 
-        dt = parse_post_date(blob)
-        year = dt.year if dt else None
-        month = dt.month if dt else None
+def extract_dates(posts: List[Dict[str, Any] | Post], now: datetime = None) -> List[Optional[datetime]]:
+    """
+    Fecha de cada post de la lista, en una pasada y con UN reloj (`now`) para
+    todas las relativas. Primero el timestamp exacto (machine_date), si no el
+    texto (find_post_date).
+    """
+    now = now or datetime.now(timezone.utc)
+    return [machine_date(p) or resolve_date(find_post_date(_post_blob(p)), now) for p in posts or []]
 
-        if dt:
-            dates.append(dt)
-            per_year[year] += 1
-
-            likes_est = p.get("likes_est")
-            comments_est = p.get("comments_est")
-            if isinstance(likes_est, int):
-                likes_by_year[year].append(likes_est)
-            if isinstance(comments_est, int):
-                comments_by_year[year].append(comments_est)
-
-        item = dict(p)
-        item["published_at"] = dt.isoformat() if dt else None
-        item["year"] = year
-        item["month"] = month
-        if dt:
-            item["age_days"] = (now - dt).days
+def new_temporal_accumulator(keep_posts: bool = True) -> Dict[str, Any]:
+    """
+    Estado parcial de analyze_temporal (ver caption_analyzer.new_accumulator).
+    Las fechas van como histograma {fecha: [n, índice de su primera aparición]}:
+    las fechas son días, así que su tamaño depende del rango del calendario y no
+    del número de posts, y alcanza para sacar min/max y los terciles exactos de
+    era_guess. keep_posts=False no junta posts_with_dates (ver streaming).
+    "cadence" es la serie por día (cadence.Cadence) para cadencia y huecos.
+    """
+    return {
+        "date_counts": {},
+        "n_dates": 0,
+        "per_year": Counter(),
+        "likes_by_year": {},     # año → [suma, n]
+        "comments_by_year": {},
+        "cadence": Cadence(),
+        "posts_with_dates": [] if keep_posts else None,
+    }
+
+def _add_by_year(by_year: Dict[int, List[int]], year: int, total: int, n: int = 1):
+    slot = by_year.get(year)
+    if slot is None:
+        by_year[year] = [total, n]
+    else:
+        slot[0] += total
+        slot[1] += n
+
+def _set_date(post: Post, dt: Optional[datetime], now: datetime):
+    post.published_at = dt
+    post.year = dt.year if dt else None
+    post.month = dt.month if dt else None
+    post.age_days = (now - dt).days if dt else None
+
+def annotate_date(p: Dict[str, Any] | Post, now: datetime) -> Tuple[Optional[datetime], Post]:
+    """
+    Un post → (fecha detectada o None, el mismo record con published_at/year/month/age_days).
+    """
+    post = Post.coerce(p)
+    dt = extract_dates([post], now)[0]
+    _set_date(post, dt, now)
+    return dt, post
+
+def accumulate_date(acc: Dict[str, Any], dt: Optional[datetime], post: Post):
+    """
+    Suma la fecha de un post (annotate_date) y su engagement por año a `acc`.
+    """
+    if not dt:
+        return
+    # histograma por día aunque el timestamp sea exacto (taken_at)
+    day = datetime(dt.year, dt.month, dt.day, tzinfo=timezone.utc)
+    slot = acc["date_counts"].get(day)
+    if slot is None:
+        acc["date_counts"][day] = [1, acc["n_dates"]]
+    else:
+        slot[0] += 1
+    acc["n_dates"] += 1
+    acc["per_year"][dt.year] += 1
+
+    likes_est = post.likes_est
+    comments_est = post.comments_est
+    if isinstance(likes_est, int):
+        _add_by_year(acc["likes_by_year"], dt.year, likes_est)
+    if isinstance(comments_est, int):
+        _add_by_year(acc["comments_by_year"], dt.year, comments_est)
+    acc["cadence"].add(dt, likes_est, comments_est)
+
+def accumulate_temporal(posts: List[Dict[str, Any]], now: datetime = None, acc: Dict[str, Any] = None) -> Dict[str, Any]:
+    acc = acc if acc is not None else new_temporal_accumulator()
+    now = now or datetime.now(timezone.utc)
+    posts_with_dates = acc["posts_with_dates"]
+
+    posts = [Post.coerce(p) for p in posts or []]
+    for post, dt in zip(posts, extract_dates(posts, now)):
+        _set_date(post, dt, now)
+        accumulate_date(acc, dt, post)
+        if posts_with_dates is not None:
+            posts_with_dates.append(post)
+
+    return acc
+
+def merge_temporal(acc: Dict[str, Any], other: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Suma `other` en `acc` (chunks en su orden original → mismo resultado que
+    una sola pasada, incluido el orden de los dicts por año).
+    """
+    offset = acc["n_dates"]
+    for dt, (n, first) in other["date_counts"].items():
+        slot = acc["date_counts"].get(dt)
+        if slot is None:
+            acc["date_counts"][dt] = [n, first + offset]
         else:
-            item["age_days"] = None
+            slot[0] += n
+    acc["n_dates"] += other["n_dates"]
+    acc["per_year"].update(other["per_year"])
+    for key in ("likes_by_year", "comments_by_year"):
+        for year, (total, n) in other[key].items():
+            _add_by_year(acc[key], year, total, n)
+    acc["cadence"].merge(other["cadence"])
+    if acc["posts_with_dates"] is not None:
+        acc["posts_with_dates"].extend(other["posts_with_dates"] or [])
+    return acc
+
+def _era_guess(date_counts: Dict[datetime, List[int]], n: int) -> Dict[str, int]:
+    """
+    Divide por fecha en 3 “eras” (viejo/medio/reciente) con cortes en los
+    terciles; las eras salen en el orden en que aparece su primera fecha.
+    """
+    ordered = sorted(date_counts.items())
+    i1 = int(n * 0.33) if n > 2 else 0
+    i2 = int(n * 0.66) if n > 2 else n - 1
+    cut1 = cut2 = None
+    seen = 0
+    for dt, (count, _) in ordered:
+        seen += count
+        if cut1 is None and seen > i1:
+            cut1 = dt
+        if seen > i2:
+            cut2 = dt
+            break
+
+    def era_for(dt: datetime) -> str:
+        if dt <= cut1:
+            return "era_1_old"
+        if dt <= cut2:
+            return "era_2_middle"
+        return "era_3_recent"
 
-        posts_with_dates.append(item)
+    eras: Dict[str, List[int]] = {}
+    for dt, (count, first) in ordered:
+        slot = eras.setdefault(era_for(dt), [0, first])
+        slot[0] += count
+        slot[1] = min(slot[1], first)
+    return {era: count for era, (count, _) in sorted(eras.items(), key=lambda kv: kv[1][1])}
 
-    if not dates:
-        return {
+def _without_missing_posts(out: Dict[str, Any]) -> Dict[str, Any]:
+    # keep_posts=False: la lista no se juntó, no se reporta
+    if out["posts_with_dates"] is None:
+        del out["posts_with_dates"]
+    return out
+
+def finalize_temporal(acc: Dict[str, Any]) -> Dict[str, Any]:
+    date_counts = acc["date_counts"]
+    per_year = acc["per_year"]
+    posts_with_dates = acc["posts_with_dates"]
+
+    if not date_counts:
+        out = {
             "min_date": None,
             "max_date": None,
             "span_days": None,
@@ -147,48 +327,58 @@ def analyze_temporal(posts: List[Dict[str, Any]]) -> Dict[str, Any]:
             "avg_likes_est_per_year": {},
             "avg_comments_est_per_year": {},
             "era_guess": [],
+            "cadence": acc["cadence"].summary(),
             "posts_with_dates": posts_with_dates,
             "note": "No pude detectar fechas en los textos."
         }
+        return _without_missing_posts(out)
 
-    min_dt = min(dates)
-    max_dt = max(dates)
+    min_dt = min(date_counts)
+    max_dt = max(date_counts)
     span_days = (max_dt - min_dt).days
 
     avg_likes_per_year = {}
-    for y, vals in likes_by_year.items():
-        if vals:
-            avg_likes_per_year[str(y)] = round(sum(vals) / len(vals), 2)
+    for y, (total, n) in acc["likes_by_year"].items():
+        if n:
+            avg_likes_per_year[str(y)] = round(total / n, 2)
 
     avg_comments_per_year = {}
-    for y, vals in comments_by_year.items():
-        if vals:
-            avg_comments_per_year[str(y)] = round(sum(vals) / len(vals), 2)
-
-    # Era guess: divide por fecha en 3 “eras” (viejo/medio/reciente)
-    sorted_dates = sorted(dates)
-    n = len(sorted_dates)
-    cut1 = sorted_dates[int(n * 0.33)] if n > 2 else sorted_dates[0]
-    cut2 = sorted_dates[int(n * 0.66)] if n > 2 else sorted_dates[-1]
+    for y, (total, n) in acc["comments_by_year"].items():
+        if n:
+            avg_comments_per_year[str(y)] = round(total / n, 2)
 
-    def era_for(dt: datetime) -> str:
-        if dt <= cut1:
-            return "era_1_old"
-        if dt <= cut2:
-            return "era_2_middle"
-        return "era_3_recent"
-
-    era_counts = Counter()
-    for dt in dates:
-        era_counts[era_for(dt)] += 1
-
-    return {
+    return _without_missing_posts({
         "min_date": min_dt.isoformat(),
         "max_date": max_dt.isoformat(),
         "span_days": span_days,
         "posts_per_year": {str(k): v for k, v in sorted(per_year.items())},
         "avg_likes_est_per_year": avg_likes_per_year,
         "avg_comments_est_per_year": avg_comments_per_year,
-        "era_guess": dict(era_counts),
+        "era_guess": _era_guess(date_counts, acc["n_dates"]),
+        "cadence": acc["cadence"].summary(),
         "posts_with_dates": posts_with_dates
-    }
+    })
+
+def analyze_temporal(posts: List[Dict[str, Any]], now: datetime = None) -> Dict[str, Any]:
+    """
+    Input: posts_annotated (ideal) o top_posts.
+    Espera campos:
+      - caption
+      - og_description
+      - taken_at (opcional: timestamp exacto del extractor, tiene prioridad)
+      - likes_est (opcional)
+      - comments_est (opcional)
+    `now`: reloj para age_days (default: ahora, UTC)
+    Output:
+      - min_date / max_date
+      - span_days
+      - posts_per_year
+      - avg_likes_est_per_year (si hay)
+      - avg_comments_est_per_year (si hay)
+      - era_guess (3 buckets por terciles)
+      - cadence (posts/semana, promedio móvil, huecos, inactividad más larga,
+        cubetas por semana/mes con engagement; ver cadence.Cadence)
+      - posts_with_dates (los mismos Post con published_at + year/month;
+        a JSON con models.post.to_dicts)
+    """
+    return finalize_temporal(accumulate_temporal(posts, now))
@@ -0,0 +1,220 @@
+# batch_runner.py
+"""
+Corre varios perfiles (cliente + competidores) sobre un pool de workers que
+comparten un contexto de Chromium, con un rate limit global por dominio.
+
+Uso:
+  python batch_runner.py --client lacarniceria --competitors tacosatarantados lostacos1
+  python batch_runner.py --client lacarniceria --competitors-file competidores.txt --workers 3
+
+Salida:
+  outputs/batch/<handle>/{raw.json, report.json, report.md}
+  outputs/batch/index.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+from playwright.async_api import async_playwright
+
+from analyzers.memo import DEFAULT_MEMO_PATH, AnalysisMemo
+from extractors.asset_store import AssetStore, localize_report
+from extractors.block_detector import STATUS_OK, CircuitBreaker
+from extractors.browser_daemon import DEFAULT_HOST, DEFAULT_PORT
+from extractors.instagram_async import (
+    DEFAULT_CONCURRENCY,
+    EXTRACTION_MODES,
+    browser_context,
+    extract_profile,
+    normalize_profile_url,
+)
+from extractors.post_cache import PostCache
+from extractors.rate_limit import DEFAULT_BURST, DEFAULT_RATE_PER_S, DomainRateLimiter
+from extractors.readiness import WaitLog
+from extractors.resource_policy import ResourcePolicy
+from extractors.retry_queue import RetryQueue
+from report_builder import build_report_json, report_to_markdown, save_outputs
+
+DEFAULT_WORKERS = 3
+
+def profile_slug(handle_or_url: str) -> str:
+    url = normalize_profile_url(handle_or_url)
+    return url.rstrip("/").rsplit("/", 1)[-1] or "profile"
+
+async def run_batch(
+    profiles: List[Dict],
+    max_posts: int = 12,
+    workers: int = DEFAULT_WORKERS,
+    concurrency: int = 2,
+    mode: str = "browser",
+    rate_per_s: float = DEFAULT_RATE_PER_S,
+    burst: int = DEFAULT_BURST,
+    profile_dir: str = ".pw_ig_profile",
+    out_dir: str = "outputs/batch",
+    daemon=None,
+    block_resources: bool = True,
+    headless: bool = False,
+    download_assets: bool = True,
+) -> Dict:
+    """
+    profiles: [{"handle": ..., "role": "client" | "competitor"}]
+    Cada worker toma el siguiente perfil de la cola; todas las navegaciones pasan
+    por el mismo DomainRateLimiter y el mismo CircuitBreaker (si IG bloquea, se
+    pausa todo el batch). Escribe un reporte por perfil + index.json.
+    Con download_assets=True las imágenes van a un AssetStore compartido (dedupe
+    entre perfiles) y los reportes apuntan a las rutas locales.
+    """
+    limiter = DomainRateLimiter(rate_per_s, burst)
+    breaker = CircuitBreaker()
+    policy = ResourcePolicy() if block_resources else None
+    cache = PostCache()
+    memo = AnalysisMemo(path=DEFAULT_MEMO_PATH)
+    retry_queue = RetryQueue()
+    assets = AssetStore() if download_assets else None
+
+    queue = asyncio.Queue()
+    for i, prof in enumerate(profiles):
+        queue.put_nowait((i, prof))
+    entries = [None] * len(profiles)
+
+    async def worker(context):
+        while True:
+            try:
+                i, prof = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            handle = prof["handle"]
+            slug = profile_slug(handle)
+            prof_dir = os.path.join(out_dir, slug)
+            t0 = time.time()
+            entry = {"handle": handle, "role": prof.get("role", "competitor"), "slug": slug, "out_dir": prof_dir}
+            try:
+                waits = WaitLog()
+                ig = await extract_profile(
+                    context,
+                    handle,
+                    max_posts,
+                    concurrency=concurrency,
+                    mode=mode,
+                    policy=policy,
+                    waits=waits,
+                    cache=cache,
+                    limiter=limiter,
+                    breaker=breaker,
+                    retry_queue=retry_queue,
+                )
+                ig["readiness"] = waits.to_dict()
+                elapsed = round(time.time() - t0, 2)
+                raw, report = build_report_json("instagram", handle, max_posts, elapsed, ig, memo=memo)
+                if assets:
+                    await asyncio.to_thread(localize_report, report, prof_dir, assets)
+                save_outputs(raw, report, report_to_markdown(report), out_dir=prof_dir)
+                status = ig.get("status", {}).get("profile", STATUS_OK)
+                entry.update({
+                    "status": status,
+                    "profile_url": ig.get("profile_url", ""),
+                    "posts": len(ig.get("posts", [])),
+                    "warnings": len(ig.get("warnings", [])),
+                    "page_loads": ig.get("page_loads", 0),
+                    "run_time_seconds": elapsed,
+                })
+            except Exception as e:
+                entry.update({
+                    "status": "error",
+                    "error": f"{type(e).__name__}: {e}",
+                    "run_time_seconds": round(time.time() - t0, 2),
+                })
+            entries[i] = entry
+            print(f"[{entry['status']}] {handle} ({entry['run_time_seconds']}s)")
+
+    started = time.time()
+    async with async_playwright() as p:
+        async with browser_context(p, profile_dir, headless=headless, block_service_workers=bool(policy), daemon=daemon) as (context, lease):
+            if policy:
+                await policy.attach(context)
+            try:
+                n = max(1, min(int(workers or 1), len(profiles)))
+                await asyncio.gather(*(worker(context) for _ in range(n)))
+            finally:
+                if policy:
+                    await policy.detach(context)
+                cache.save()
+                memo.save()
+                retry_queue.save()
+            if lease:
+                lease["pages"] += sum(e.get("page_loads", 0) for e in entries if e)
+
+    index = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "run_time_seconds": round(time.time() - started, 2),
+        "workers": workers,
+        "profiles": entries,
+        "rate_limit": limiter.stats(),
+        "breaker": breaker.stats(),
+        "network": policy.stats() if policy else {},
+        "cache": cache.stats(),
+        "analysis_cache": memo.stats(),
+        "retry_queue": retry_queue.stats(),
+        "assets": assets.stats() if assets else {},
+    }
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    return index
+
+def _read_list(path: str) -> List[str]:
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [l.strip() for l in lines if l.strip() and not l.strip().startswith("#")]
+
+def main():
+    ap = argparse.ArgumentParser(description="Batch de perfiles (cliente + competidores)")
+    ap.add_argument("--client", help="@handle o URL del cliente")
+    ap.add_argument("--competitors", nargs="*", default=[])
+    ap.add_argument("--competitors-file", help="un @handle/URL por línea")
+    ap.add_argument("--max-posts", type=int, default=12)
+    ap.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="perfiles en paralelo")
+    ap.add_argument("--concurrency", type=int, default=min(2, DEFAULT_CONCURRENCY), help="páginas por perfil")
+    ap.add_argument("--mode", choices=EXTRACTION_MODES, default="browser")
+    ap.add_argument("--rate", type=float, default=DEFAULT_RATE_PER_S, help="navegaciones/seg por dominio")
+    ap.add_argument("--burst", type=int, default=DEFAULT_BURST)
+    ap.add_argument("--profile-dir", default=str(Path.cwd() / ".pw_ig_profile"))
+    ap.add_argument("--out-dir", default="outputs/batch")
+    ap.add_argument("--no-daemon", action="store_true", help="no usar browser_daemon aunque esté corriendo")
+    ap.add_argument("--no-assets", action="store_true", help="no descargar imágenes a assets/")
+    args = ap.parse_args()
+
+    profiles = []
+    if args.client:
+        profiles.append({"handle": args.client, "role": "client"})
+    competitors = list(args.competitors)
+    if args.competitors_file:
+        competitors += _read_list(args.competitors_file)
+    profiles += [{"handle": h, "role": "competitor"} for h in competitors]
+    if not profiles:
+        ap.error("pasa --client y/o --competitors")
+
+    index = asyncio.run(run_batch(
+        profiles,
+        max_posts=args.max_posts,
+        workers=args.workers,
+        concurrency=args.concurrency,
+        mode=args.mode,
+        rate_per_s=args.rate,
+        burst=args.burst,
+        profile_dir=args.profile_dir,
+        out_dir=args.out_dir,
+        daemon=None if args.no_daemon else (DEFAULT_HOST, DEFAULT_PORT),
+        download_assets=not args.no_assets,
+    ))
+
+    print("✅ Listo. Index:", os.path.join(args.out_dir, "index.json"))
+    ok = sum(1 for e in index["profiles"] if e and e.get("status") == "ok")
+    print(f"- {ok}/{len(index['profiles'])} perfiles OK en {index['run_time_seconds']}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# benchmarks/bench_analyzers.py
+"""
+Benchmark de análisis: camino de dos etapas (analyze_posts → analyze_temporal)
+contra la pasada fusionada (pipeline.analyze_fused), sobre los posts de un
+raw.json replicados hasta --n posts. Antes de medir verifica que las dos
+salidas sean idénticas.
+
+Los dos caminos usan el mismo Matcher, así que lo que mide aquí es sólo la
+fusión: da ~x1.0 (x1.00–x1.06 con 20k posts, ruido entre corridas). La
+mejora grande de analizadores está en el Matcher y en el memo, no en fusionar.
+
+Uso:
+  python -m benchmarks.bench_analyzers --raw outputs/raw.json --n 20000 --repeat 5
+
+Salida: tabla en consola + outputs/bench/analyzers.json
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from analyzers.caption_analyzer import analyze_posts
+from analyzers.pipeline import analyze_fused
+from analyzers.temporal_analyzer import analyze_temporal
+
+def two_stage(posts: List[Dict[str, Any]], now: datetime):
+    analytics = analyze_posts(posts)
+    return analytics, analyze_temporal(analytics["posts_annotated"], now)
+
+def fused(posts: List[Dict[str, Any]], now: datetime):
+    return analyze_fused(posts, now=now)
+
+STRATEGIES: Dict[str, Callable] = {
+    "two_stage": two_stage,
+    "fused": fused,
+}
+
+def load_corpus(raw_path: str, n: int) -> List[Dict[str, Any]]:
+    """
+    Posts de un raw.json (como los arma report_builder) repetidos hasta n.
+    """
+    with open(raw_path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    base = [
+        {
+            "post_url": p.get("post_url", ""),
+            "image_url": p.get("image_url", ""),
+            "caption": p.get("caption", ""),
+            "og_description": p.get("og_description", ""),
+        }
+        for p in raw.get("instagram_public", {}).get("posts", [])
+    ]
+    if not base:
+        raise SystemExit(f"{raw_path} no trae posts")
+    return [{**base[i % len(base)], "post_url": f"{base[i % len(base)]['post_url']}#{i}"} for i in range(n)]
+
+def run(posts: List[Dict[str, Any]], strategies: List[str], repeat: int) -> Dict:
+    now = datetime.now(timezone.utc)
+    expected = two_stage(posts, now)
+    results = {}
+    for name in strategies:
+        fn = STRATEGIES[name]
+        if fn(posts, now) != expected:
+            raise SystemExit(f"{name}: la salida no coincide con two_stage")
+        secs = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn(posts, now)
+            secs.append(time.perf_counter() - t0)
+        med = statistics.median(secs)
+        results[name] = {
+            "runs": repeat,
+            "seconds_median": round(med, 4),
+            "seconds_min": round(min(secs), 4),
+            "posts_per_s": round(len(posts) / med, 1) if med else 0.0,
+        }
+    base = results.get("two_stage", {}).get("seconds_median")
+    for name, r in results.items():
+        r["speedup_vs_two_stage"] = round(base / r["seconds_median"], 2) if base and r["seconds_median"] else None
+        print(f"{name:10s} {r['seconds_median']:8.3f}s  {r['posts_per_s']:10.1f} posts/s  x{r['speedup_vs_two_stage']}")
+    return results
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de analizadores (dos etapas vs fusionado)")
+    ap.add_argument("--raw", default="outputs/raw.json")
+    ap.add_argument("--n", type=int, default=20000, help="posts (se replican los del raw)")
+    ap.add_argument("--strategies", nargs="*", choices=list(STRATEGIES), default=list(STRATEGIES))
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--out", default="outputs/bench/analyzers.json")
+    args = ap.parse_args()
+
+    posts = load_corpus(args.raw, args.n)
+    results = run(posts, args.strategies, args.repeat)
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "raw": args.raw,
+            "posts": len(posts),
+            "strategies": results,
+        }, f, ensure_ascii=False, indent=2)
+    print("✅ Listo:", args.out)
+
+if __name__ == "__main__":
+    main()
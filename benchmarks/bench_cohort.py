@@ -0,0 +1,105 @@
+# benchmarks/bench_cohort.py
+"""
+Benchmark del índice de cohortes: perfil por perfil (CohortIndex.score) contra
+una sola llamada vectorizada (CohortIndex.score_batch), con perfiles sintéticos
+repartidos en verticales y bandas de seguidores. Antes de medir verifica que
+los dos caminos den los mismos percentiles.
+
+Uso:
+  python -m benchmarks.bench_cohort --profiles 20000 --repeat 3
+
+Salida: tabla en consola + outputs/bench/cohort.json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from analyzers.cohort import METRIC_NAMES, CohortIndex
+
+VERTICALS = ("taquerias", "cafes", "gimnasios", "barberias", "panaderias")
+
+def synthetic_profiles(n: int, seed: int = 7) -> List[Dict[str, Any]]:
+    rnd = random.Random(seed)
+    out = []
+    for i in range(n):
+        metrics = {
+            "min_age_days": rnd.choice([None, rnd.randint(0, 365)]),
+            "posts_per_week": round(rnd.expovariate(0.8), 3),
+            "cta_total": rnd.randint(0, 12),
+            "topic_count": rnd.randint(0, 6),
+            "hashtag_count": rnd.randint(0, 30),
+            "avg_likes_est": rnd.choice([None, round(rnd.lognormvariate(5, 1.2), 1)]),
+            "avg_comments_est": rnd.choice([None, round(rnd.lognormvariate(2, 1), 1)]),
+        }
+        out.append({
+            "id": f"@perfil{i}",
+            "vertical": rnd.choice(VERTICALS),
+            "followers": int(rnd.lognormvariate(8.5, 1.5)),
+            "metrics": metrics,
+        })
+    return out
+
+def run(profiles: List[Dict[str, Any]], repeat: int) -> Dict:
+    index = CohortIndex()
+    for p in profiles:
+        index.add(p["id"], p["metrics"], p["vertical"], p["followers"])
+    metrics = [p["metrics"] for p in profiles]
+    verticals = [p["vertical"] for p in profiles]
+    followers = [p["followers"] for p in profiles]
+
+    batch = index.score_batch(metrics, verticals, followers)
+    sample = range(0, len(profiles), max(1, len(profiles) // 500))
+    for i in sample:
+        one = index.score(metrics[i], verticals[i], followers[i])
+        expected = [None if v != v else round(float(v), 1) for v in batch["percentiles"][i]]
+        if [one["percentiles"][name] for name in METRIC_NAMES] != expected:
+            raise SystemExit(f"score y score_batch difieren en {profiles[i]['id']}")
+
+    def per_profile():
+        for m, v, f in zip(metrics, verticals, followers):
+            index.score(m, v, f)
+
+    results = {}
+    for name, fn in (("per_profile", per_profile),
+                     ("score_batch", lambda: index.score_batch(metrics, verticals, followers)),
+                     ("rank", index.rank)):
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t0)
+        results[name] = {
+            "median_s": round(statistics.median(times), 4),
+            "profiles_per_s": round(len(profiles) / statistics.median(times)),
+        }
+    base = results["per_profile"]["median_s"]
+    for name, r in results.items():
+        r["speedup"] = round(base / r["median_s"], 2) if r["median_s"] else None
+        print(f"{name:>12}: {r['median_s']:.4f}s  {r['profiles_per_s']:>10} perfiles/s  x{r['speedup']}")
+    return results
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark del índice de cohortes (perfil por perfil vs vectorizado)")
+    ap.add_argument("--profiles", type=int, default=20000)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", default="outputs/bench/cohort.json")
+    args = ap.parse_args()
+
+    profiles = synthetic_profiles(args.profiles)
+    results = run(profiles, args.repeat)
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "profiles": len(profiles),
+            "strategies": results,
+        }, f, ensure_ascii=False, indent=2)
+    print("✅ Listo:", args.out)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# benchmarks/bench_extraction.py
+"""
+Benchmark reproducible de extracción: se graba un run real a un HAR una vez
+y después se comparan estrategias offline contra ese mismo tráfico.
+
+Uso:
+  # 1) grabar (usa el perfil logueado; abre Chromium)
+  python -m benchmarks.bench_extraction record --profile lostacos1 --har benchmarks/har/lostacos1.har
+
+  # 2) comparar estrategias sin red
+  python -m benchmarks.bench_extraction replay --profile lostacos1 --har benchmarks/har/lostacos1.har \
+      --strategies serial pooled http network --repeat 3
+
+Salida: tabla en consola + outputs/bench/extraction.json
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.har_replay import ReplayServer
+from extractors.instagram_async import run_extraction
+
+STRATEGIES = {
+    "serial": {"mode": "browser", "concurrency": 1},
+    "pooled": {"mode": "browser", "concurrency": 4},
+    "http": {"mode": "http", "concurrency": 4},
+    "network": {"mode": "network", "concurrency": 4},
+}
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    i = min(len(values) - 1, max(0, int(round(q * (len(values) - 1)))))
+    return values[i]
+
+def _post_latencies_ms(out: Dict) -> List[float]:
+    """
+    goto + extracción de campos por post visitado en el navegador.
+    """
+    return [
+        waits["post"]["ms"]
+        for waits in out.get("readiness", {}).values()
+        if "post" in waits
+    ]
+
+def record(profile: str, har: str, max_posts: int, profile_dir: str, concurrency: int = 4) -> Dict:
+    """
+    Run real en modo browser (visita todos los posts, sin cache) grabando el HAR.
+    """
+    Path(har).parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        out = run_extraction(
+            profile,
+            max_posts,
+            profile_dir,
+            concurrency=concurrency,
+            mode="browser",
+            use_cache=False,
+            retry_path=os.path.join(tmp, "retry.json"),
+            har_path=har,
+            har_mode="record",
+        )
+    return {"posts": len(out["posts"]), "seconds": round(time.perf_counter() - t0, 2), "har": har}
+
+def replay_once(profile: str, har: str, max_posts: int, strategy: str) -> Dict:
+    cfg = STRATEGIES[strategy]
+    with tempfile.TemporaryDirectory() as tmp, ReplayServer(har) as srv:
+        t0 = time.perf_counter()
+        out = run_extraction(
+            profile,
+            max_posts,
+            os.path.join(tmp, "profile"),
+            concurrency=cfg["concurrency"],
+            headless=True,
+            mode=cfg["mode"],
+            http_base_url=srv.base_url if cfg["mode"] == "http" else None,
+            use_cache=False,
+            retry_path=os.path.join(tmp, "retry.json"),
+            har_path=har,
+            har_mode="replay",
+        )
+        seconds = time.perf_counter() - t0
+        misses = len(srv.misses)
+
+    lat = _post_latencies_ms(out)
+    return {
+        "seconds": seconds,
+        "posts": len(out["posts"]),
+        "page_loads": out.get("page_loads", 0),
+        "latency_ms": lat,
+        "har_misses": misses,
+    }
+
+def replay(profile: str, har: str, max_posts: int, strategies: List[str], repeat: int = 3) -> Dict:
+    results = {}
+    for name in strategies:
+        runs = [replay_once(profile, har, max_posts, name) for _ in range(repeat)]
+        secs = [r["seconds"] for r in runs]
+        lat = [ms for r in runs for ms in r["latency_ms"]]
+        posts = runs[-1]["posts"]
+        med = statistics.median(secs)
+        results[name] = {
+            **STRATEGIES[name],
+            "runs": repeat,
+            "posts": posts,
+            "page_loads": runs[-1]["page_loads"],
+            "seconds_median": round(med, 3),
+            "seconds_min": round(min(secs), 3),
+            "posts_per_s": round(posts / med, 2) if med else 0.0,
+            "post_latency_p50_ms": _percentile(lat, 0.5),
+            "post_latency_p95_ms": _percentile(lat, 0.95),
+            "har_misses": runs[-1]["har_misses"],
+        }
+        print(f"{name:8s} {med:7.2f}s  {results[name]['posts_per_s']:6.2f} posts/s  "
+              f"p50 {results[name]['post_latency_p50_ms']:.0f}ms  p95 {results[name]['post_latency_p95_ms']:.0f}ms  "
+              f"({posts} posts, {results[name]['page_loads']} páginas)")
+    return results
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de extracción con record/replay (HAR)")
+    ap.add_argument("action", choices=["record", "replay"])
+    ap.add_argument("--profile", required=True, help="@handle o URL (el mismo en record y replay)")
+    ap.add_argument("--har", required=True)
+    ap.add_argument("--max-posts", type=int, default=12)
+    ap.add_argument("--profile-dir", default=str(Path.cwd() / ".pw_ig_profile"), help="sólo record")
+    ap.add_argument("--strategies", nargs="*", choices=list(STRATEGIES), default=list(STRATEGIES))
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", default="outputs/bench/extraction.json")
+    args = ap.parse_args()
+
+    if args.action == "record":
+        res = record(args.profile, args.har, args.max_posts, args.profile_dir)
+        print(f"✅ HAR grabado: {res['har']} ({res['posts']} posts en {res['seconds']}s)")
+        return
+
+    results = replay(args.profile, args.har, args.max_posts, args.strategies, args.repeat)
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "profile": args.profile,
+            "har": args.har,
+            "max_posts": args.max_posts,
+            "strategies": results,
+        }, f, ensure_ascii=False, indent=2)
+    print("✅ Listo:", args.out)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# benchmarks/bench_language.py
+"""
+Benchmark de detección de idioma sobre lotes grandes de captions:
+  - regex: el detector anterior (un re.search(\\bpalabra\\b) por pista, es/en)
+  - hints: language.LanguageDetector (tokeniza una vez + intersección de sets)
+  - ngram: LanguageDetector(mode="ngram") (pistas + trigramas de caracteres)
+Corpus: los posts de un raw.json replicados hasta --n. Además mide la precisión
+de cada uno sobre LABELED (captions cortos etiquetados a mano, fuera de las
+muestras del modelo n-gram).
+
+Uso:
+  python -m benchmarks.bench_language --raw outputs/raw.json --n 50000 --repeat 3
+
+Salida: tabla en consola + outputs/bench/language.json
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from analyzers.language import LANGUAGE_HINTS, LanguageDetector
+from benchmarks.bench_analyzers import load_corpus
+
+LABELED = [
+    ("Preparamos nuestras salsas cada mañanita, vengan temprano 🌶️", "es"),
+    ("Ya abrimos la nueva sucursal en el centro, los esperamos!!", "es"),
+    ("¿Quién se anima a una orden de birria? 🔥🔥 #birria", "es"),
+    ("Gracias por acompañarnos este fin de semana ❤️", "es"),
+    ("Domingo de carne asada con la familia", "es"),
+    ("Freshly grilled brisket waiting for you right now, swing through", "en"),
+    ("New location opening downtown this Friday! See you there 🎉", "en"),
+    ("Who's ready for birria tacos tonight? 🔥 #birria", "en"),
+    ("Thank you for an amazing weekend everyone ❤️", "en"),
+    ("Sunday funday with the whole family", "en"),
+    ("Preparamos nossos molhos toda manhã, venham cedo 🌶️", "pt"),
+    ("Estamos esperando vocês amanhã à noite, tragam os amigos", "pt"),
+    ("Obrigado a todos pelo fim de semana incrível ❤️", "pt"),
+    ("Domingo de churrasco com a família toda", "pt"),
+    ("Nouvelles saveurs ce week-end, réservez votre table maintenant", "fr"),
+    ("Merci à tous pour ce week-end incroyable ❤️", "fr"),
+    ("Dimanche en famille autour d'un bon repas", "fr"),
+    ("Nos sauces sont préparées chaque matin, venez tôt 🌶️", "fr"),
+    ("🌮🌮🔥 #tacos #tuesday", "unknown"),
+    ("🤤🤤🤤", "unknown"),
+]
+
+def _regex_detector() -> Callable[[str], str]:
+    # el detector de antes: un regex por palabra de las pistas es/en
+    es_rx = [re.compile(rf"\b{re.escape(w)}\b") for w in sorted(LANGUAGE_HINTS["es"])]
+    en_rx = [re.compile(rf"\b{re.escape(w)}\b") for w in sorted(LANGUAGE_HINTS["en"])]
+
+    def detect(t: str) -> str:
+        es = sum(1 for rx in es_rx if rx.search(t))
+        en = sum(1 for rx in en_rx if rx.search(t))
+        if es == 0 and en == 0:
+            return "unknown"
+        if es > 0 and en > 0 and abs(es - en) <= 1:
+            return "mixed"
+        return "es" if es > en else "en"
+
+    return lambda texts: [detect(t) for t in texts]
+
+def strategies() -> Dict[str, Callable[[List[str]], List[str]]]:
+    return {
+        "regex": _regex_detector(),
+        "hints": LanguageDetector().detect_many,
+        "ngram": LanguageDetector(mode="ngram").detect_many,
+    }
+
+def run(texts: List[str], names: List[str], repeat: int) -> Dict:
+    fns = strategies()
+    reference = fns["hints"](texts)
+    labeled = [t.lower() for t, _ in LABELED]
+    results = {}
+    for name in names:
+        fn = fns[name]
+        out = fn(texts)
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn(texts)
+            times.append(time.perf_counter() - t0)
+        predicted = fn(labeled)
+        r = {
+            "median_s": round(statistics.median(times), 4),
+            "captions_per_s": round(len(texts) / statistics.median(times)),
+            "agreement_with_hints": round(sum(a == b for a, b in zip(out, reference)) / (len(texts) or 1), 4),
+            "labeled_accuracy": round(sum(p == lang for p, (_, lang) in zip(predicted, LABELED)) / len(LABELED), 4),
+        }
+        results[name] = r
+        print(f"{name:>6}: {r['median_s']:.4f}s  {r['captions_per_s']:>9} captions/s  "
+              f"acuerdo={r['agreement_with_hints']:.2%}  precisión={r['labeled_accuracy']:.2%}")
+    return results
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de detección de idioma (regex vs pistas vs n-gram)")
+    ap.add_argument("--raw", default="outputs/raw.json")
+    ap.add_argument("--n", type=int, default=50000, help="captions (se replican los del raw)")
+    ap.add_argument("--strategies", nargs="*", choices=["regex", "hints", "ngram"], default=["regex", "hints", "ngram"])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", default="outputs/bench/language.json")
+    args = ap.parse_args()
+
+    posts = load_corpus(args.raw, args.n)
+    texts = [(p["caption"] + "\n" + p["og_description"]).strip().lower() for p in posts]
+    results = run(texts, args.strategies, args.repeat)
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "raw": args.raw,
+            "captions": len(texts),
+            "strategies": results,
+        }, f, ensure_ascii=False, indent=2)
+    print("✅ Listo:", args.out)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# benchmarks/har_replay.py
+import base64
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Servidor local que contesta con las respuestas grabadas en un HAR
+# (instagram_async con har_mode="record"). Sirve al fast path HTTP vía
+# http_base_url; Playwright usa el mismo HAR directo con route_from_har.
+
+# el body del HAR ya viene decodificado: estos headers ya no aplican
+SKIP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+def _path_key(url: str) -> str:
+    u = urlsplit(url)
+    return u.path + (f"?{u.query}" if u.query else "")
+
+class HarArchive:
+    """
+    Entradas del HAR indexadas por (método, path?query), sin importar el host.
+    Si una URL se pidió varias veces, las respuestas se sirven en orden y la
+    última se repite.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "r", encoding="utf-8") as f:
+            har = json.load(f)
+        self.entries: Dict[Tuple[str, str], List[Dict]] = {}
+        self._served: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        for e in har.get("log", {}).get("entries", []):
+            req = e.get("request", {})
+            key = (req.get("method", "GET").upper(), _path_key(req.get("url", "")))
+            self.entries.setdefault(key, []).append(e.get("response", {}))
+
+    def lookup(self, method: str, path: str) -> Optional[Dict]:
+        key = (method.upper(), path)
+        responses = self.entries.get(key)
+        if not responses:
+            return None
+        with self._lock:
+            i = self._served.get(key, 0)
+            self._served[key] = i + 1
+        return responses[min(i, len(responses) - 1)]
+
+    def __len__(self):
+        return sum(len(v) for v in self.entries.values())
+
+def _body(response: Dict) -> bytes:
+    content = response.get("content", {})
+    text = content.get("text") or ""
+    if content.get("encoding") == "base64":
+        return base64.b64decode(text)
+    return text.encode("utf-8")
+
+class ReplayServer:
+    """
+    with ReplayServer("run.har") as srv:
+        run_extraction(..., mode="http", http_base_url=srv.base_url)
+    """
+
+    def __init__(self, har_path: str, host: str = "127.0.0.1", port: int = 0):
+        self.archive = HarArchive(har_path)
+        self.misses: List[str] = []
+        archive, misses = self.archive, self.misses
+
+        class Handler(BaseHTTPRequestHandler):
+            def _serve(self):
+                resp = archive.lookup(self.command, self.path)
+                if resp is None:
+                    misses.append(f"{self.command} {self.path}")
+                    self.send_error(404, "no está en el HAR")
+                    return
+                body = _body(resp)
+                self.send_response(int(resp.get("status") or 200))
+                for h in resp.get("headers", []):
+                    if h.get("name", "").lower() not in SKIP_HEADERS:
+                        self.send_header(h["name"], h.get("value", ""))
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            do_GET = do_POST = do_HEAD = _serve
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
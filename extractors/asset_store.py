@@ -0,0 +1,270 @@
+# extractors/asset_store.py
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from extractors.http_fast import make_session
+
+try:
+    from PIL import Image
+except ImportError:  # thumbnails opcionales
+    Image = None
+
+# Imágenes de los posts en disco, direccionadas por contenido:
+#   assets/originals/ab/abcdef....jpg   (sha256 del archivo)
+#   assets/thumbs/ab/abcdef....jpg
+#   assets/index.json                   {url_key: {sha256, ext, bytes}}
+# Las URLs del CDN vienen firmadas (oe=...) y caducan; url_key es host+path sin
+# query, así la misma imagen con otra firma no se vuelve a bajar. El mismo
+# archivo visto desde dos perfiles/runs queda una sola vez.
+
+DEFAULT_ASSETS_DIR = "assets"
+DEFAULT_THUMB_SIZE = 320
+DEFAULT_DOWNLOAD_WORKERS = 8
+INDEX_VERSION = 1
+CHUNK_BYTES = 64 * 1024
+
+EXT_BY_TYPE = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/heic": ".heic",
+    "video/mp4": ".mp4",
+}
+
+def url_key(url: str) -> str:
+    u = urlparse(url or "")
+    return f"{u.hostname or ''}{u.path}"
+
+def _make_thumb(src: str, dst: str, size: int) -> bool:
+    """
+    Corre en un proceso aparte (ProcessPoolExecutor): decodificar/redimensionar es CPU.
+    """
+    if Image is None:
+        return False
+    try:
+        with Image.open(src) as im:
+            im.thumbnail((size, size))
+            Path(dst).parent.mkdir(parents=True, exist_ok=True)
+            tmp = dst + ".tmp"
+            im.convert("RGB").save(tmp, "JPEG", quality=82)
+            os.replace(tmp, dst)
+        return True
+    except Exception:
+        return False
+
+class AssetStore:
+    """
+    Descarga concurrente (pool de conexiones acotado), reanudable (.part + Range)
+    y deduplicada por sha256.
+    """
+
+    def __init__(self, root: str = DEFAULT_ASSETS_DIR, thumb_size: int = DEFAULT_THUMB_SIZE):
+        self.root = Path(root)
+        self.thumb_size = thumb_size
+        self.index: Dict[str, Dict] = {}
+        self.downloaded = 0
+        self.resumed = 0
+        self.skipped = 0
+        self.deduped = 0
+        self.failed = 0
+        self.thumbs_made = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}  # url_key → descarga en curso
+        self.load()
+
+    def load(self):
+        try:
+            data = json.loads((self.root / "index.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") == INDEX_VERSION:
+            self.index = data.get("assets") or {}
+
+    def save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / "index.json"
+        tmp = path.with_suffix(".tmp")
+        with self._lock:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "assets": self.index}, f, ensure_ascii=False)
+            os.replace(tmp, path)
+
+    def original_path(self, sha: str, ext: str) -> Path:
+        return self.root / "originals" / sha[:2] / f"{sha}{ext}"
+
+    def thumb_path(self, sha: str) -> Path:
+        return self.root / "thumbs" / sha[:2] / f"{sha}.jpg"
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """
+        {sha256, ext, bytes, original, thumb} si la imagen ya está en disco.
+        """
+        entry = self.index.get(url_key(url))
+        if not entry:
+            return None
+        original = self.original_path(entry["sha256"], entry["ext"])
+        if not original.exists():
+            return None
+        thumb = self.thumb_path(entry["sha256"])
+        return {**entry, "original": str(original), "thumb": str(thumb) if thumb.exists() else ""}
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _download(self, session, url: str, timeout: float) -> Optional[Dict]:
+        """
+        Una descarga por url_key a la vez en todo el store: en el batch varios
+        perfiles comparten el AssetStore y un post collab sale en dos grids; el
+        segundo espera el resultado del primero. Cualquier error cuenta como
+        `failed` y regresa None (no tumba el resto de las imágenes del perfil).
+        """
+        entry = self.lookup(url)
+        if entry:
+            self._count("skipped")
+            return entry
+
+        key = url_key(url)
+        with self._lock:
+            pending = self._inflight.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._inflight[key] = Future()
+        if not owner:
+            entry = pending.result()
+            self._count("skipped" if entry else "failed")
+            return entry
+
+        entry = None
+        try:
+            entry = self._fetch(session, url, key, timeout)
+        except Exception:
+            # el .part se queda: el siguiente run sigue desde ahí
+            self._count("failed")
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            pending.set_result(entry)
+        return entry
+
+    def _fetch(self, session, url: str, key: str, timeout: float) -> Optional[Dict]:
+        part = self.root / "partial" / (hashlib.sha1(key.encode("utf-8")).hexdigest() + ".part")
+        part.parent.mkdir(parents=True, exist_ok=True)
+        offset = part.stat().st_size if part.exists() else 0
+
+        headers = {"Accept": "image/*,*/*;q=0.8"}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+        with session.get(url, headers=headers, timeout=timeout, stream=True) as r:
+            if r.status_code == 416:  # el .part ya estaba completo
+                pass
+            elif r.status_code == 206 and offset:
+                self._count("resumed")
+                with open(part, "ab") as f:
+                    for chunk in r.iter_content(CHUNK_BYTES):
+                        f.write(chunk)
+            elif r.status_code == 200:
+                with open(part, "wb") as f:
+                    for chunk in r.iter_content(CHUNK_BYTES):
+                        f.write(chunk)
+            else:
+                self._count("failed")
+                return None
+            ctype = (r.headers.get("Content-Type") or "").split(";")[0].strip()
+
+        # completo: a un archivo propio de esta descarga antes del move por contenido
+        # (el .part es por url_key y otro proceso sobre el mismo assets/ podría reusarlo)
+        tmp = part.with_name(f"{part.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+        os.replace(part, tmp)
+        try:
+            sha = hashlib.sha256()
+            with open(tmp, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_BYTES), b""):
+                    sha.update(chunk)
+            sha = sha.hexdigest()
+            ext = EXT_BY_TYPE.get(ctype) or Path(urlparse(url).path).suffix.lower() or ".bin"
+
+            dst = self.original_path(sha, ext)
+            size = tmp.stat().st_size
+            with self._lock:
+                if dst.exists():
+                    self.deduped += 1
+                else:
+                    dst.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(tmp, dst)
+                    self.downloaded += 1
+                self.index[key] = {"sha256": sha, "ext": ext, "bytes": size}
+        finally:
+            tmp.unlink(missing_ok=True)
+        return self.lookup(url)
+
+    def fetch_all(self, urls: List[str], workers: int = DEFAULT_DOWNLOAD_WORKERS, timeout: float = 30.0,
+                  thumbnails: bool = True) -> Dict[str, Dict]:
+        """
+        Baja todas las `urls` que falten y genera thumbnails en un ProcessPool.
+        Regresa {url: lookup(url)} para las que quedaron en disco.
+        """
+        urls = [u for u in dict.fromkeys(urls) if u and u.startswith("http")]
+        if not urls:
+            return {}
+        # una descarga por url_key (misma imagen con otra firma comparte .part)
+        unique = list({url_key(u): u for u in urls}.values())
+
+        session = make_session(pool_size=workers)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+            list(ex.map(lambda u: self._download(session, u, timeout), unique))
+        session.close()
+
+        if thumbnails and Image is not None:
+            todo = {}
+            for u in urls:
+                entry = self.lookup(u)
+                if entry and not entry["thumb"] and entry["ext"] != ".mp4":
+                    todo[entry["sha256"]] = entry["original"]
+            if todo:
+                with ProcessPoolExecutor() as ex:
+                    jobs = [(sha, ex.submit(_make_thumb, src, str(self.thumb_path(sha)), self.thumb_size))
+                            for sha, src in todo.items()]
+                    self.thumbs_made += sum(1 for _, j in jobs if j.result())
+
+        self.save()
+        return {u: self.lookup(u) for u in urls if self.lookup(u)}
+
+    def stats(self) -> Dict:
+        return {
+            "downloaded": self.downloaded,
+            "resumed": self.resumed,
+            "skipped": self.skipped,
+            "deduped": self.deduped,
+            "failed": self.failed,
+            "thumbs_made": self.thumbs_made,
+            "thumbnails": Image is not None,
+            "size": len(self.index),
+        }
+
+def localize_report(report: Dict, out_dir: str, store: AssetStore = None, workers: int = DEFAULT_DOWNLOAD_WORKERS) -> Dict:
+    """
+    Baja las imágenes de content.top_posts y cambia image_url por la ruta local
+    (relativa a `out_dir`, donde queda report.md). La URL original queda en image_remote.
+    """
+    store = store or AssetStore()
+    posts = report.get("content", {}).get("top_posts", [])
+    local = store.fetch_all([p.get("image_url", "") for p in posts], workers=workers)
+
+    for p in posts:
+        entry = local.get(p.get("image_url", ""))
+        if not entry:
+            continue
+        p["image_remote"] = p["image_url"]
+        p["image_url"] = os.path.relpath(entry["original"], out_dir)
+        if entry["thumb"]:
+            p["thumb_url"] = os.path.relpath(entry["thumb"], out_dir)
+
+    report.setdefault("meta", {})["assets"] = store.stats()
+    return report
@@ -0,0 +1,149 @@
+# extractors/block_detector.py
+import asyncio
+import random
+import re
+import time
+from typing import Dict, Optional
+
+# Clasifica cada respuesta (perfil o post) y decide si seguir navegando.
+#   ok | blocked | login_required | private | not_found | error
+# blocked / login_required / error (timeouts) cuentan como fallas del run:
+# varias seguidas abren el circuit breaker y el run entero se pausa.
+
+STATUS_OK = "ok"
+STATUS_BLOCKED = "blocked"
+STATUS_LOGIN = "login_required"
+STATUS_PRIVATE = "private"
+STATUS_NOT_FOUND = "not_found"
+STATUS_ERROR = "error"
+STATUS_SKIPPED = "skipped"
+
+# fallas que dicen algo del run (no del post) → cuentan para el breaker
+RUN_FAILURES = {STATUS_BLOCKED, STATUS_LOGIN, STATUS_ERROR}
+# vale la pena reintentar (con backoff) el mismo post
+RETRYABLE = {STATUS_BLOCKED, STATUS_ERROR}
+
+RE_BLOCKED = re.compile(
+    r"please wait a few minutes|try again later|suspicious activity|challenge_required"
+    r"|we restrict certain activity|espera unos minutos|int[ée]ntalo (de nuevo )?más tarde"
+    r"|vuelve a intentarlo más tarde|actividad sospechosa",
+    re.IGNORECASE,
+)
+RE_NOT_FOUND = re.compile(
+    r"sorry, this page isn.t available|this page isn.t available"
+    r"|esta página no está disponible",
+    re.IGNORECASE,
+)
+RE_PRIVATE = re.compile(r"this account is private|esta cuenta es privada", re.IGNORECASE)
+RE_LOGIN = re.compile(
+    r"log in to (see|continue)|inicia sesión para (ver|continuar)",
+    re.IGNORECASE,
+)
+
+# texto visible de la página para clasificar (1 evaluate)
+PROBE_JS = """
+() => (document.title || '') + '\\n' + ((document.body && document.body.innerText) || '').slice(0, 1500)
+"""
+
+def classify(status: Optional[int], url: str = "", text: str = "") -> str:
+    url = url or ""
+    text = text or ""
+    if status == 429 or status == 403 or "/challenge/" in url or RE_BLOCKED.search(text):
+        return STATUS_BLOCKED
+    if status == 401 or "/accounts/login" in url:
+        return STATUS_LOGIN
+    if status == 404 or RE_NOT_FOUND.search(text):
+        return STATUS_NOT_FOUND
+    if RE_PRIVATE.search(text):
+        return STATUS_PRIVATE
+    if RE_LOGIN.search(text):
+        return STATUS_LOGIN
+    if status is not None and status >= 500:
+        return STATUS_ERROR
+    return STATUS_OK
+
+def backoff_delay(attempt: int, base_s: float = 2.0, cap_s: float = 60.0) -> float:
+    """
+    Exponential backoff con full jitter: uniform(0, min(cap, base * 2^attempt)).
+    """
+    return random.uniform(0, min(cap_s, base_s * (2 ** attempt)))
+
+class CircuitOpenError(Exception):
+    """
+    El breaker se abrió demasiadas veces: no tiene caso seguir navegando.
+    """
+
+class CircuitBreaker:
+    """
+    closed → (failure_threshold fallas seguidas) → open: todos los workers esperan
+    `cooldown_s` → half_open: pasa una sola navegación de prueba → responde: closed,
+    falla: open otra vez. Si ya se abrió más de `max_trips` veces lanza
+    CircuitOpenError y el run deja de navegar.
+    Con el pool de páginas llegan fallas de requests que ya estaban en vuelo
+    cuando se abrió: con el breaker abierto sólo se cuentan (no son otro trip).
+    paused_s es tiempo real perdido: una vez por apertura, de _open() a la
+    navegación de prueba (no la espera de cada worker).
+    """
+
+    def __init__(self, failure_threshold: int = 3, cooldown_s: float = 90.0, max_trips: int = 2):
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self.max_trips = max_trips
+
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.opened_at = None
+        self.paused_s = 0.0
+        self.last_failure = None
+        self.counts: Dict[str, int] = {}
+
+    def record(self, status: str):
+        self.counts[status] = self.counts.get(status, 0) + 1
+        if status in RUN_FAILURES:
+            self.consecutive_failures += 1
+            self.last_failure = status
+            if self.state == "open":
+                return
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                self._open()
+        else:
+            # private / not_found también son respuestas normales del sitio
+            self.consecutive_failures = 0
+            self.state = "closed"
+
+    def _open(self):
+        self.trips += 1
+        self.state = "open"
+        self.opened_at = time.monotonic()
+
+    async def before_request(self):
+        """
+        Llamar antes de cada navegación. Si el breaker está abierto espera el
+        cooldown; el primer worker que sale hace la navegación de prueba y el
+        resto espera su resultado.
+        """
+        while self.state != "closed":
+            if self.state == "open":
+                if self.trips > self.max_trips:
+                    raise CircuitOpenError(
+                        f"circuit breaker abierto {self.trips} veces (última falla: {self.last_failure})"
+                    )
+                remaining = self.cooldown_s - (time.monotonic() - self.opened_at)
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+                    continue
+                # fin de esta apertura: se cuenta una vez, la ve el worker que hace la prueba
+                self.paused_s += time.monotonic() - self.opened_at
+                self.state = "half_open"
+                return
+            await asyncio.sleep(0.5)
+
+    def stats(self) -> Dict:
+        return {
+            "state": self.state,
+            "trips": self.trips,
+            "paused_s": round(self.paused_s, 1),
+            "last_failure": self.last_failure,
+            "counts": dict(self.counts),
+        }
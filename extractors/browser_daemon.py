@@ -0,0 +1,276 @@
+# extractors/browser_daemon.py
+"""
+Servicio local que mantiene caliente un contexto persistente de Chromium
+(.pw_ig_profile) para que runner.py / ui_app.py no paguen el arranque en cada run.
+
+Protocolo (JSON por línea sobre TCP local):
+  {"op": "lease"}                       -> {"ok": true, "lease_id", "cdp_endpoint", "generation"}
+  {"op": "release", "lease_id", "pages"} -> {"ok": true}
+  {"op": "stats"}                       -> {"ok": true, ...}
+  {"op": "shutdown"}                    -> {"ok": true}
+
+El cliente se conecta al navegador con `chromium.connect_over_cdp(cdp_endpoint)` y
+usa `browser.contexts[0]` (el contexto persistente). El contexto se recicla cuando
+no hay leases activos y ya sirvió `max_pages` páginas o el árbol de procesos pasa
+de `max_rss_mb`.
+
+Uso:
+  python -m extractors.browser_daemon --profile-dir .pw_ig_profile
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+from playwright.async_api import async_playwright
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CDP_PORT = 9333
+DEFAULT_MAX_PAGES = 200
+DEFAULT_MAX_RSS_MB = 1500
+
+def _process_tree_rss_mb(root_pid: int) -> float:
+    """
+    RSS total (MB) de root_pid y sus descendientes (driver de Playwright + Chromium).
+    Usa `ps`, así funciona igual en macOS y Linux.
+    """
+    try:
+        out = subprocess.run(
+            ["ps", "-A", "-o", "pid=,ppid=,rss="],
+            capture_output=True, text=True, timeout=5,
+        ).stdout
+    except Exception:
+        return 0.0
+
+    children: Dict[int, list] = {}
+    rss: Dict[int, int] = {}
+    for line in out.splitlines():
+        parts = line.split()
+        if len(parts) != 3:
+            continue
+        try:
+            pid, ppid, kb = int(parts[0]), int(parts[1]), int(parts[2])
+        except ValueError:
+            continue
+        children.setdefault(ppid, []).append(pid)
+        rss[pid] = kb
+
+    total_kb = 0
+    stack = [root_pid]
+    seen = set()
+    while stack:
+        pid = stack.pop()
+        if pid in seen:
+            continue
+        seen.add(pid)
+        total_kb += rss.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return round(total_kb / 1024, 1)
+
+class BrowserDaemon:
+    def __init__(
+        self,
+        profile_dir: str,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        cdp_port: int = DEFAULT_CDP_PORT,
+        max_pages: int = DEFAULT_MAX_PAGES,
+        max_rss_mb: float = DEFAULT_MAX_RSS_MB,
+        headless: bool = False,
+    ):
+        self.profile_dir = profile_dir
+        self.host = host
+        self.port = port
+        self.cdp_port = cdp_port
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.headless = headless
+
+        self._pw = None
+        self._context = None
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+        self.generation = 0
+        self.pages_served = 0
+        self.pages_total = 0
+        self.active_leases = {}
+        self._next_lease = 0
+
+    @property
+    def cdp_endpoint(self) -> str:
+        return f"http://{self.host}:{self.cdp_port}"
+
+    async def _launch(self):
+        Path(self.profile_dir).mkdir(parents=True, exist_ok=True)
+        self._context = await self._pw.chromium.launch_persistent_context(
+            user_data_dir=self.profile_dir,
+            headless=self.headless,
+            locale="en-US",
+            viewport={"width": 1280, "height": 900},
+            args=[
+                "--disable-blink-features=AutomationControlled",
+                "--start-maximized",
+                f"--remote-debugging-port={self.cdp_port}",
+            ],
+            service_workers="block",
+        )
+        # una página en blanco mantiene viva la ventana entre runs
+        if not self._context.pages:
+            await self._context.new_page()
+        self.generation += 1
+        self.pages_served = 0
+        self._ready.set()
+
+    async def _recycle_if_needed(self):
+        if self.active_leases:
+            return
+        rss_mb = _process_tree_rss_mb(os.getpid())
+        if self.pages_served < self.max_pages and rss_mb < self.max_rss_mb:
+            return
+        self._ready.clear()
+        try:
+            await self._context.close()
+        except Exception:
+            pass
+        await self._launch()
+
+    async def _handle_op(self, msg: Dict) -> Dict:
+        op = msg.get("op")
+
+        if op == "lease":
+            await self._ready.wait()
+            async with self._lock:
+                self._next_lease += 1
+                lease_id = self._next_lease
+                self.active_leases[lease_id] = self.generation
+            return {
+                "ok": True,
+                "lease_id": lease_id,
+                "cdp_endpoint": self.cdp_endpoint,
+                "generation": self.generation,
+            }
+
+        if op == "release":
+            async with self._lock:
+                self.active_leases.pop(msg.get("lease_id"), None)
+                pages = int(msg.get("pages") or 0)
+                self.pages_served += pages
+                self.pages_total += pages
+                await self._recycle_if_needed()
+            return {"ok": True}
+
+        if op == "stats":
+            return {
+                "ok": True,
+                "generation": self.generation,
+                "pages_served": self.pages_served,
+                "pages_total": self.pages_total,
+                "active_leases": len(self.active_leases),
+                "rss_mb": _process_tree_rss_mb(os.getpid()),
+                "max_pages": self.max_pages,
+                "max_rss_mb": self.max_rss_mb,
+            }
+
+        if op == "shutdown":
+            self._stop.set()
+            return {"ok": True}
+
+        return {"ok": False, "error": f"op desconocida: {op}"}
+
+    async def _serve_client(self, reader, writer):
+        try:
+            while not reader.at_eof():
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    reply = await self._handle_op(json.loads(line))
+                except Exception as e:
+                    reply = {"ok": False, "error": str(e)}
+                writer.write((json.dumps(reply) + "\n").encode("utf-8"))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self):
+        async with async_playwright() as p:
+            self._pw = p
+            await self._launch()
+            server = await asyncio.start_server(self._serve_client, self.host, self.port)
+            print(f"browser daemon listo en {self.host}:{self.port} (CDP {self.cdp_endpoint})")
+            async with server:
+                await self._stop.wait()
+            try:
+                await self._context.close()
+            except Exception:
+                pass
+
+# ----------------------------
+# Cliente
+# ----------------------------
+async def _request(host: str, port: int, msg: Dict, timeout: float = 60.0) -> Dict:
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=timeout)
+    try:
+        writer.write((json.dumps(msg) + "\n").encode("utf-8"))
+        await writer.drain()
+        line = await asyncio.wait_for(reader.readline(), timeout=timeout)
+        return json.loads(line or b"{}")
+    finally:
+        writer.close()
+
+@asynccontextmanager
+async def daemon_lease(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+    """
+    Pide un lease al daemon. Produce un dict con cdp_endpoint y un contador
+    `pages` que el caller incrementa; al salir se reporta con release.
+    Lanza OSError si no hay daemon escuchando.
+    """
+    reply = await _request(host, port, {"op": "lease"})
+    if not reply.get("ok"):
+        raise OSError(reply.get("error") or "lease rechazado")
+    lease = {**reply, "pages": 0}
+    try:
+        yield lease
+    finally:
+        try:
+            await _request(host, port, {"op": "release", "lease_id": lease["lease_id"], "pages": lease["pages"]})
+        except Exception:
+            pass
+
+def daemon_stats(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> Optional[Dict]:
+    try:
+        return asyncio.run(_request(host, port, {"op": "stats"}, timeout=5.0))
+    except Exception:
+        return None
+
+def main():
+    ap = argparse.ArgumentParser(description="Browser daemon (contexto persistente compartido)")
+    ap.add_argument("--profile-dir", default=str(Path.cwd() / ".pw_ig_profile"))
+    ap.add_argument("--host", default=DEFAULT_HOST)
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--cdp-port", type=int, default=DEFAULT_CDP_PORT)
+    ap.add_argument("--max-pages", type=int, default=DEFAULT_MAX_PAGES)
+    ap.add_argument("--max-rss-mb", type=float, default=DEFAULT_MAX_RSS_MB)
+    ap.add_argument("--headless", action="store_true")
+    args = ap.parse_args()
+
+    daemon = BrowserDaemon(
+        args.profile_dir,
+        host=args.host,
+        port=args.port,
+        cdp_port=args.cdp_port,
+        max_pages=args.max_pages,
+        max_rss_mb=args.max_rss_mb,
+        headless=args.headless,
+    )
+    asyncio.run(daemon.serve())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# extractors/field_script.py
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Extracción de campos de un post en UN solo round-trip.
+# Las estrategias son datos: por campo, una lista en orden de preferencia.
+# Cuando IG cambie markup se edita aquí (o se pasa un JSON con load_strategies).
+#   {"name": id de la estrategia, "selector": CSS, "attr": atributo | None (= innerText)}
+
+FIELD_STRATEGIES: Dict[str, List[Dict]] = {
+    "og_description": [
+        {"name": "og_meta", "selector": "meta[property='og:description']", "attr": "content"},
+    ],
+    "image_url": [
+        {"name": "og_meta", "selector": "meta[property='og:image']", "attr": "content"},
+        {"name": "article_img", "selector": "article img", "attr": "src"},
+    ],
+    "caption": [
+        {"name": "article_h1", "selector": "article h1", "attr": None},
+        {"name": "article_span", "selector": "article span", "attr": None},
+    ],
+    # fecha exacta del post (ISO); se guarda como epoch en taken_at (ver epoch_from_iso)
+    "taken_at": [
+        {"name": "article_time", "selector": "article time[datetime]", "attr": "datetime"},
+        {"name": "time", "selector": "time[datetime]", "attr": "datetime"},
+    ],
+}
+
+# La página está "lista" cuando todos los campos tienen valor o ya existe este selector
+READY_SELECTOR = "article"
+
+# raw: el JS lleva \s, \/ y '\n' tal cual (sin r"" Python los convierte antes de mandarlo)
+_EXTRACT_JS = r"""
+({strategies, readySelector, wait}) => {
+    const fields = {}, used = {};
+    for (const [field, list] of Object.entries(strategies)) {
+        fields[field] = '';
+        used[field] = null;
+        for (const s of list) {
+            const el = document.querySelector(s.selector);
+            if (!el) continue;
+            let v = s.attr ? el.getAttribute(s.attr) : (el.innerText || el.textContent);
+            v = (v || '').replace(/\s+/g, ' ').trim();
+            if (v) { fields[field] = v; used[field] = s.name; break; }
+        }
+    }
+    if (wait) {
+        const complete = Object.values(fields).every(Boolean);
+        // login / challenge no van a tener <article>: no esperar el timeout completo
+        const dead = /^\/(accounts|challenge)\//.test(location.pathname);
+        if (!complete && !dead && !(readySelector && document.querySelector(readySelector))) return null;
+    }
+    // texto visible para block_detector.classify
+    const probe = (document.title || '') + '\n' + ((document.body && document.body.innerText) || '').slice(0, 1500);
+    return {fields, strategies: used, probe};
+}
+"""
+
+def epoch_from_iso(s: str) -> Optional[int]:
+    """
+    "2024-03-01T18:22:11.000Z" (atributo datetime de <time>) → epoch en segundos.
+    """
+    try:
+        dt = datetime.fromisoformat((s or "").strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+def load_strategies(path: str) -> Dict[str, List[Dict]]:
+    """
+    Lee un JSON {campo: [estrategias]}; los campos que trae reemplazan a los default.
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    merged = dict(FIELD_STRATEGIES)
+    merged.update(data)
+    return merged
+
+async def extract_fields(
+    page,
+    strategies: Optional[Dict[str, List[Dict]]] = None,
+    ready_selector: str = READY_SELECTOR,
+    timeout_ms: int = 8000,
+) -> Dict:
+    """
+    Espera (polling dentro de la página) a que el post esté listo y regresa
+    todos los campos de una vez:
+      {fields: {campo: valor}, strategies: {campo: nombre | None}, probe: str, ready: bool, wait_ms: int}
+    Si vence el timeout regresa lo que haya en ese momento (ready=False).
+    """
+    arg = {"strategies": strategies or FIELD_STRATEGIES, "readySelector": ready_selector, "wait": True}
+    t0 = time.perf_counter()
+    try:
+        handle = await page.wait_for_function(_EXTRACT_JS, arg=arg, timeout=timeout_ms, polling=100)
+        result = await handle.json_value()
+        ready = True
+    except Exception:
+        result = await page.evaluate(_EXTRACT_JS, {**arg, "wait": False})
+        ready = False
+    result["ready"] = ready
+    result["wait_ms"] = int(round((time.perf_counter() - t0) * 1000))
+    return result
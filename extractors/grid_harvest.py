@@ -0,0 +1,200 @@
+# extractors/grid_harvest.py
+import asyncio
+import re
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from extractors.post_cache import shortcode_from_url
+
+# Mientras el grid scrollea, IG recibe JSON (graphql / api/v1) con shortcode,
+# caption, timestamp y likes/comments de cada post. Los decodificamos al mismo
+# formato que el extractor {post_url, image_url, caption, og_description} para
+# no tener que abrir cada post (N+1).
+
+RE_PAYLOAD_URL = re.compile(r"/graphql|/api/v1/", re.IGNORECASE)
+
+MONTH_NAMES = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+
+# campos que tiene que traer un record para no visitar el post
+REQUIRED_FIELDS = ("image_url", "og_description")
+
+def _clean(s: str) -> str:
+    return re.sub(r"\s+", " ", (s or "").strip())
+
+def _first(*vals):
+    for v in vals:
+        if v not in (None, "", [], {}):
+            return v
+    return None
+
+def _caption_text(node: Dict) -> str:
+    cap = node.get("caption")
+    if isinstance(cap, dict):
+        return cap.get("text") or ""
+    if isinstance(cap, str):
+        return cap
+    edges = (node.get("edge_media_to_caption") or {}).get("edges") or []
+    if edges:
+        return ((edges[0] or {}).get("node") or {}).get("text") or ""
+    return ""
+
+def _image_url(node: Dict) -> str:
+    cands = (node.get("image_versions2") or {}).get("candidates") or []
+    if cands:
+        best = max(cands, key=lambda c: (c.get("width") or 0) * (c.get("height") or 0))
+        return best.get("url") or ""
+    carousel = node.get("carousel_media") or []
+    if carousel:
+        return _image_url(carousel[0])
+    return _first(node.get("display_url"), node.get("thumbnail_src")) or ""
+
+def _count(node: Dict, *keys) -> Optional[int]:
+    for k in keys:
+        v = node.get(k)
+        if isinstance(v, dict):
+            v = v.get("count")
+        if isinstance(v, int):
+            return v
+    return None
+
+def build_og_description(likes: Optional[int], comments: Optional[int], username: str, taken_at: Optional[int], caption: str) -> str:
+    """
+    Mismo formato que el og:description de IG, así caption_analyzer y
+    temporal_analyzer lo parsean igual:
+      '155 likes, 0 comments - user on January 9, 2026: "caption".'
+    """
+    parts = []
+    if likes is not None:
+        parts.append(f"{likes:,} likes")
+    if comments is not None:
+        parts.append(f"{comments:,} comments")
+    head = ", ".join(parts)
+
+    who = username or ""
+    if taken_at:
+        dt = datetime.fromtimestamp(int(taken_at), tz=timezone.utc)
+        who = f"{who} on {MONTH_NAMES[dt.month - 1]} {dt.day}, {dt.year}".strip()
+
+    if not head and not who:
+        return ""
+    s = f"{head} - {who}" if head else who
+    if caption:
+        s += f': "{caption}".'
+    return _clean(s)
+
+def node_to_record(node: Dict) -> Optional[Dict]:
+    code = _first(node.get("shortcode"), node.get("code"))
+    if not isinstance(code, str):
+        return None
+
+    is_reel = node.get("product_type") == "clips"
+    caption = _clean(_caption_text(node))
+    taken_at = _first(node.get("taken_at"), node.get("taken_at_timestamp"))
+    user = _first(node.get("user"), node.get("owner")) or {}
+    username = user.get("username") or ""
+    likes = _count(node, "like_count", "edge_liked_by", "edge_media_preview_like")
+    comments = _count(node, "comment_count", "edge_media_to_comment")
+
+    return {
+        "post_url": f"https://www.instagram.com/{'reel' if is_reel else 'p'}/{code}/",
+        "image_url": _image_url(node),
+        "caption": caption,
+        "og_description": build_og_description(likes, comments, username, taken_at, caption),
+        "taken_at": int(taken_at) if taken_at else None,
+    }
+
+def _looks_like_media(node: Dict) -> bool:
+    if not ("shortcode" in node or "code" in node):
+        return False
+    return any(k in node for k in (
+        "taken_at", "taken_at_timestamp", "caption", "edge_media_to_caption",
+        "image_versions2", "display_url",
+    ))
+
+def decode_payload(data) -> List[Dict]:
+    """
+    Recorre un JSON arbitrario y regresa los records de todos los nodos de media.
+    """
+    found = []
+    stack = [data]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, dict):
+            if _looks_like_media(obj):
+                rec = node_to_record(obj)
+                if rec:
+                    found.append(rec)
+                continue
+            stack.extend(reversed(list(obj.values())))
+        elif isinstance(obj, list):
+            stack.extend(reversed(obj))
+    return found
+
+def missing_fields(rec: Optional[Dict]) -> List[str]:
+    if not rec:
+        return list(REQUIRED_FIELDS)
+    return [k for k in REQUIRED_FIELDS if not rec.get(k)]
+
+class GridHarvester:
+    """
+    Escucha page.on("response") en la página del grid y junta records por shortcode
+    (en el orden en que llegan = orden del grid).
+    """
+
+    def __init__(self):
+        self.records: Dict[str, Dict] = {}
+        self.responses_seen = 0
+        self.payloads_decoded = 0
+        self._tasks = set()
+
+    def attach(self, page):
+        page.on("response", self._on_response)
+
+    def _on_response(self, response):
+        if response.request.resource_type not in ("xhr", "fetch"):
+            return
+        if not RE_PAYLOAD_URL.search(response.url):
+            return
+        self.responses_seen += 1
+        task = asyncio.ensure_future(self._read(response))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _read(self, response):
+        try:
+            if "json" not in (response.headers.get("content-type") or ""):
+                return
+            data = await response.json()
+        except Exception:
+            return
+        recs = decode_payload(data)
+        if recs:
+            self.payloads_decoded += 1
+        for rec in recs:
+            code = shortcode_from_url(rec["post_url"])
+            prev = self.records.get(code) or {}
+            # nunca pisar un campo lleno con uno vacío
+            self.records[code] = {k: (v if v not in (None, "") else prev.get(k)) for k, v in rec.items()}
+
+    async def drain(self):
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def get(self, url: str) -> Optional[Dict]:
+        rec = self.records.get(shortcode_from_url(url) or "")
+        if not rec:
+            return None
+        return {**rec, "post_url": url}
+
+    def urls(self) -> List[str]:
+        return [rec["post_url"] for rec in self.records.values()]
+
+    def stats(self) -> Dict:
+        return {
+            "responses_seen": self.responses_seen,
+            "payloads_decoded": self.payloads_decoded,
+            "posts_found": len(self.records),
+        }
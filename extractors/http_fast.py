@@ -0,0 +1,206 @@
+# extractors/http_fast.py
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from extractors.post_cache import shortcode_from_url
+
+# Fast path sin navegador: og:description y og:image vienen en el HTML inicial,
+# así que basta un GET con las cookies del perfil persistente.
+
+IG_ORIGIN = "https://www.instagram.com"
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# og:description → '... on January 9, 2026: "caption".'
+RE_OG_CAPTION = re.compile(r':\s*"(.*)"\.?\s*$', re.DOTALL)
+# epoch del post en el JSON embebido de la página (cuando IG lo manda): sólo
+# el del objeto media con "code" (o "shortcode") igual al del post; la página
+# también trae posts relacionados y el primer taken_at puede ser de otro
+TAKEN_AT_KEYS = ("taken_at", "taken_at_timestamp")
+_JSON = json.JSONDecoder()
+
+def _clean(s: str) -> str:
+    return re.sub(r"\s+", " ", (s or "").strip())
+
+class _HeadDone(Exception):
+    pass
+
+class _MetaParser(HTMLParser):
+    """
+    Junta <meta property="og:*" content="..."> del HTML (sólo <head> importa).
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta: Dict[str, str] = {}
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "meta":
+            return
+        a = dict(attrs)
+        prop = a.get("property") or a.get("name") or ""
+        if prop.startswith("og:") and prop not in self.meta:
+            self.meta[prop] = a.get("content") or ""
+
+    def handle_endtag(self, tag):
+        # todo lo que necesitamos está en <head>
+        if tag == "head":
+            raise _HeadDone()
+
+def parse_og_meta(html: str) -> Dict[str, str]:
+    parser = _MetaParser()
+    try:
+        parser.feed(html or "")
+        parser.close()
+    except _HeadDone:
+        pass
+    return parser.meta
+
+def _escaped(text: str, i: int) -> bool:
+    n = 0
+    while i > 0 and text[i - 1] == "\\":
+        n += 1
+        i -= 1
+    return n % 2 == 1
+
+def _enclosing_object(text: str, pos: int) -> int:
+    """
+    Índice de la "{" del objeto JSON que contiene `pos` (que no cae dentro de un
+    string), recorriendo hacia atrás y saltando strings; -1 si no hay.
+    """
+    depth = 0
+    i = pos - 1
+    while i >= 0:
+        c = text[i]
+        if c == '"':
+            i -= 1
+            while i >= 0 and not (text[i] == '"' and not _escaped(text, i)):
+                i -= 1
+        elif c in "}]":
+            depth += 1
+        elif c in "{[":
+            if depth == 0:
+                return i if c == "{" else -1
+            depth -= 1
+        i -= 1
+    return -1
+
+def taken_at_for(html: str, shortcode: Optional[str]) -> Optional[int]:
+    """
+    taken_at del objeto media de `shortcode` en el JSON embebido del HTML.
+    None si no se puede atar a ese post (sin shortcode, sin objeto con ese
+    "code", JSON escapado dentro de un string de JS, o sin taken_at propio).
+    """
+    if not html or not shortcode:
+        return None
+    pattern = re.compile(r'"(?:code|shortcode)"\s*:\s*"' + re.escape(shortcode) + '"')
+    for m in pattern.finditer(html):
+        start = _enclosing_object(html, m.start())
+        if start < 0:
+            continue
+        try:
+            media, _ = _JSON.raw_decode(html, start)
+        except ValueError:
+            continue
+        for key in TAKEN_AT_KEYS:
+            v = media.get(key)
+            if isinstance(v, int) and not isinstance(v, bool) and 10**8 <= v < 10**11:
+                return v
+    return None
+
+def caption_from_og(og_desc: str) -> str:
+    m = RE_OG_CAPTION.search(og_desc or "")
+    return _clean(m.group(1)) if m else ""
+
+def make_session(cookies: Optional[List[Dict]] = None, pool_size: int = 8) -> requests.Session:
+    """
+    Session keep-alive con pool de conexiones.
+    `cookies` usa el formato de Playwright `context.cookies()`.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    for c in cookies or []:
+        session.cookies.set(
+            c.get("name", ""),
+            c.get("value", ""),
+            domain=c.get("domain", ""),
+            path=c.get("path", "/"),
+        )
+    return session
+
+def _rebase(url: str, base_url: Optional[str]) -> str:
+    if base_url and url.startswith(IG_ORIGIN):
+        return base_url.rstrip("/") + url[len(IG_ORIGIN):]
+    return url
+
+def fetch_post_meta(
+    session: requests.Session,
+    url: str,
+    base_url: Optional[str] = None,
+    timeout: float = 15.0,
+    limiter=None,
+) -> Optional[Dict]:
+    """
+    GET del post + parseo de og meta.
+    Regresa el record {post_url, image_url, caption, og_description[, taken_at]} o None si no sirve
+    (status != 200, redirect a login, o sin og:description ni og:image).
+    `limiter` (rate_limit.DomainRateLimiter) se respeta antes de cada GET.
+    """
+    if limiter:
+        limiter.acquire_sync(url)
+    try:
+        r = session.get(_rebase(url, base_url), timeout=timeout)
+    except requests.RequestException:
+        return None
+    if r.status_code != 200 or "/accounts/login" in r.url:
+        return None
+
+    meta = parse_og_meta(r.text)
+    og_desc = _clean(meta.get("og:description", ""))
+    image_url = meta.get("og:image", "")
+    if not og_desc and not image_url:
+        return None
+
+    taken_at = taken_at_for(r.text, shortcode_from_url(url))
+    return {
+        "post_url": url,
+        "image_url": image_url,
+        "caption": caption_from_og(og_desc),
+        "og_description": og_desc,
+        **({"taken_at": taken_at} if taken_at else {}),
+    }
+
+def fetch_posts_http(
+    urls: List[str],
+    cookies: Optional[List[Dict]] = None,
+    concurrency: int = 8,
+    base_url: Optional[str] = None,
+    timeout: float = 15.0,
+    limiter=None,
+) -> List[Optional[Dict]]:
+    """
+    Fast path para una lista de posts. Resultado alineado con `urls`
+    (None donde hay que caer al path de Playwright).
+    """
+    if not urls:
+        return []
+    workers = max(1, min(int(concurrency or 1), len(urls)))
+    with make_session(cookies, pool_size=workers) as session:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda u: fetch_post_meta(session, u, base_url=base_url, timeout=timeout, limiter=limiter), urls))
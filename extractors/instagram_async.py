@@ -0,0 +1,595 @@
+# extractors/instagram_async.py
+import asyncio
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from pathlib import Path
+from typing import Dict, List
+
+from playwright.async_api import async_playwright
+
+from extractors.block_detector import (
+    PROBE_JS,
+    RETRYABLE,
+    STATUS_ERROR,
+    STATUS_OK,
+    STATUS_SKIPPED,
+    CircuitBreaker,
+    CircuitOpenError,
+    backoff_delay,
+    classify,
+)
+from extractors.browser_daemon import daemon_lease
+from extractors.field_script import epoch_from_iso, extract_fields
+from extractors.grid_harvest import GridHarvester, missing_fields
+from extractors.http_fast import fetch_posts_http
+from extractors.link_harvester import harvest_links
+from extractors.post_cache import DEFAULT_CACHE_PATH, DEFAULT_ENGAGEMENT_TTL_HOURS, PostCache, shortcode_from_url
+from extractors.rate_limit import DomainRateLimiter
+from extractors.readiness import (
+    GRID_ANCHORS,
+    WaitLog,
+    dismiss_popups,
+    wait_for_selector,
+)
+from extractors.resource_policy import ResourcePolicy
+from extractors.retry_queue import DEFAULT_RETRY_PATH, RetryQueue
+
+# Páginas abiertas en paralelo dentro del mismo contexto persistente
+DEFAULT_CONCURRENCY = 4
+
+# Reintentos por post cuando la respuesta es blocked/error (con backoff + jitter)
+DEFAULT_MAX_RETRIES = 1
+
+# "browser": cada post en Chromium. "http": GET + og meta, Playwright sólo si falla.
+# "network": records desde el JSON que recibe el grid; sólo se visitan posts incompletos.
+EXTRACTION_MODES = ("browser", "http", "network")
+
+POPUP_SELECTORS = [
+    'button:has-text("Only allow essential cookies")',
+    'button:has-text("Allow all cookies")',
+    'button:has-text("Accept")',
+    'button:has-text("Not Now")',
+    'button:has-text("Not now")',
+    'div[role="dialog"] button:has-text("Not Now")',
+    'div[role="dialog"] button:has-text("Not now")',
+]
+
+def normalize_profile_url(profile_url_or_handle: str) -> str:
+    s = (profile_url_or_handle or "").strip()
+    if s.startswith("http"):
+        return s if s.endswith("/") else s + "/"
+    handle = s.lstrip("@").strip().strip("/")
+    return f"https://www.instagram.com/{handle}/"
+
+async def _extract_post(page, url: str, waits: WaitLog, strategies: Dict = None, limiter: DomainRateLimiter = None):
+    """
+    Abre un post en `page` y saca caption/imagen/og_description (y taken_at del
+    <time datetime>) con un solo script en la página (ver field_script.FIELD_STRATEGIES).
+    Devuelve (record, status) con status de block_detector.classify.
+    """
+    if limiter:
+        await limiter.acquire(url)
+    t0 = time.perf_counter()
+    resp = await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+    res = await extract_fields(page, strategies)
+    waits.record(url, "fields", res["wait_ms"], res["ready"])
+    waits.record(url, "post", int(round((time.perf_counter() - t0) * 1000)), res["ready"])
+
+    fields = res["fields"]
+    # con og meta el post cargó; el texto sólo importa si la página vino vacía
+    probe = "" if fields.get("og_description") else res.get("probe", "")
+    status = classify(resp.status if resp else None, page.url, probe)
+    taken_at = epoch_from_iso(fields.get("taken_at", ""))
+    return {
+        "post_url": url,
+        "image_url": fields.get("image_url", ""),
+        "caption": fields.get("caption", ""),
+        "og_description": fields.get("og_description", ""),
+        **({"taken_at": taken_at} if taken_at else {}),
+        "strategies": res["strategies"],
+    }, status
+
+async def extract_posts_pooled(
+    context,
+    links: List[str],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    waits: WaitLog = None,
+    policy: ResourcePolicy = None,
+    strategies: Dict = None,
+    limiter: DomainRateLimiter = None,
+    breaker: CircuitBreaker = None,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+) -> Dict:
+    """
+    Reparte `links` entre un pool acotado de páginas del mismo contexto.
+    Cada página toma el siguiente link libre; los resultados salen en el orden del grid.
+    Cada navegación pasa por `breaker`: si IG empieza a bloquear, el pool se pausa
+    y, si no se recupera, el resto de links queda como "skipped".
+    Devuelve {posts, warnings, statuses: {url: status},
+              failures: {url: {status, error_class, error}}} (para RetryQueue).
+    """
+    if not links:
+        return {"posts": [], "warnings": [], "statuses": {}, "failures": {}}
+
+    waits = waits or WaitLog()
+    breaker = breaker or CircuitBreaker()
+    queue = asyncio.Queue()
+    for i, url in enumerate(links):
+        queue.put_nowait((i, url))
+
+    results = [None] * len(links)
+    errors = [None] * len(links)
+    statuses = [STATUS_SKIPPED] * len(links)
+    error_classes = ["CircuitOpenError"] * len(links)
+
+    async def visit(page, i, url):
+        for attempt in range(max_retries + 1):
+            await breaker.before_request()
+            try:
+                rec, status = await _extract_post(page, url, waits, strategies, limiter)
+                errors[i] = None if status == STATUS_OK else f"Post {url}: {status}"
+                error_classes[i] = status
+            except Exception as e:
+                rec, status = None, STATUS_ERROR
+                errors[i] = f"Fallo extrayendo post {url}: {e}"
+                error_classes[i] = type(e).__name__
+            breaker.record(status)
+            statuses[i] = status
+            if status == STATUS_OK:
+                results[i] = rec
+                return
+            if status not in RETRYABLE or attempt >= max_retries:
+                return
+            await asyncio.sleep(backoff_delay(attempt))
+
+    async def worker():
+        page = await context.new_page()
+        if policy:
+            policy.set_stage(page, "post")
+        try:
+            while True:
+                try:
+                    i, url = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    await visit(page, i, url)
+                except CircuitOpenError as e:
+                    errors[i] = f"Run pausado por bloqueo, se omiten posts restantes: {e}"
+                    while not queue.empty():
+                        queue.get_nowait()
+                    return
+        finally:
+            await page.close()
+
+    n_workers = max(1, min(int(concurrency or 1), len(links)))
+    await asyncio.gather(*(worker() for _ in range(n_workers)))
+
+    failures = {
+        url: {"status": statuses[i], "error_class": error_classes[i], "error": errors[i] or ""}
+        for i, url in enumerate(links)
+        if statuses[i] != STATUS_OK
+    }
+    return {
+        "posts": [r for r in results if r],
+        "warnings": [e for e in errors if e],
+        "statuses": dict(zip(links, statuses)),
+        "failures": failures,
+    }
+
+async def _launch_context(p, profile_dir: str, headless: bool, block_service_workers: bool):
+    Path(profile_dir).mkdir(parents=True, exist_ok=True)
+    return await p.chromium.launch_persistent_context(
+        user_data_dir=profile_dir,
+        headless=headless,
+        locale="en-US",
+        viewport={"width": 1280, "height": 900},
+        args=[
+            "--disable-blink-features=AutomationControlled",
+            "--start-maximized",
+        ],
+        # el service worker de IG se salta el routing
+        service_workers="block" if block_service_workers else "allow",
+    )
+
+@asynccontextmanager
+async def browser_context(p, profile_dir: str, headless: bool = False, block_service_workers: bool = True, daemon=None):
+    """
+    Produce (context, lease).
+    Si `daemon` = (host, port) y hay un browser_daemon escuchando, usa su contexto
+    persistente caliente vía CDP (no se cierra al final). Si no, lanza uno propio.
+    """
+    async with AsyncExitStack() as stack:
+        lease = None
+        if daemon:
+            try:
+                lease = await stack.enter_async_context(daemon_lease(*daemon))
+            except OSError:
+                lease = None  # sin daemon: arranque normal
+
+        if lease:
+            browser = await p.chromium.connect_over_cdp(lease["cdp_endpoint"])
+            context = browser.contexts[0] if browser.contexts else await browser.new_context()
+        else:
+            context = await _launch_context(p, profile_dir, headless, block_service_workers)
+            stack.push_async_callback(context.close)
+
+        yield context, lease
+
+async def extract_profile(
+    context,
+    profile_url_or_handle: str,
+    max_posts: int,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    mode: str = "browser",
+    http_base_url: str = None,
+    policy: ResourcePolicy = None,
+    waits: WaitLog = None,
+    cache: PostCache = None,
+    strategies: Dict = None,
+    limiter: DomainRateLimiter = None,
+    breaker: CircuitBreaker = None,
+    retry_queue: RetryQueue = None,
+) -> Dict:
+    """
+    Flujo completo de un perfil sobre un contexto ya abierto:
+    grid → links → (cache) → (payloads del grid / fast path HTTP) → pool de páginas.
+    `limiter` y `breaker` se comparten entre perfiles (batch_runner) para no pasar
+    la tasa por dominio y para pausar todo el batch si IG empieza a bloquear.
+    out["status"] = {profile, posts: {url: status}, breaker} (ver block_detector).
+    Los posts que fallan quedan en `retry_queue` (ver retry_posts).
+    """
+    if mode not in EXTRACTION_MODES:
+        raise ValueError(f"mode inválido: {mode} (usa {', '.join(EXTRACTION_MODES)})")
+
+    profile_url = normalize_profile_url(profile_url_or_handle)
+    out = {"profile_url": profile_url, "posts": [], "warnings": [], "page_loads": 0}
+    waits = waits or WaitLog()
+    breaker = breaker or CircuitBreaker()
+    out["status"] = {"profile": STATUS_SKIPPED, "posts": {}, "breaker": breaker.stats()}
+
+    page = await context.new_page()
+    if policy:
+        policy.set_stage(page, "grid")
+    harvester = None
+    if mode == "network":
+        harvester = GridHarvester()
+        harvester.attach(page)
+    links = []
+    try:
+        # 1) Ir al perfil
+        try:
+            await breaker.before_request()
+        except CircuitOpenError as e:
+            out["warnings"].append(f"Perfil omitido, run pausado por bloqueo: {e}")
+            return out
+        if limiter:
+            await limiter.acquire(profile_url)
+        try:
+            resp = await page.goto(profile_url, wait_until="domcontentloaded", timeout=60000)
+        except Exception:
+            breaker.record(STATUS_ERROR)
+            out["status"].update(profile=STATUS_ERROR, breaker=breaker.stats())
+            raise
+        out["page_loads"] += 1
+
+        # 2) Cerrar popups comunes (sólo si de verdad hay uno visible)
+        await waits.timed(profile_url, "popups", dismiss_popups(page, POPUP_SELECTORS))
+
+        # 3) Esperar main + primer anchor del grid
+        if not await waits.timed(profile_url, "main", wait_for_selector(page, "main", timeout_ms=15000)):
+            out["warnings"].append("No apareció <main>. Puede ser bloqueo/captcha o carga incompleta.")
+
+        grid_ok = await waits.timed(profile_url, "grid", wait_for_selector(page, GRID_ANCHORS, timeout_ms=8000))
+
+        # 3b) Sin grid el texto de la página dice por qué (login, privado, bloqueo...)
+        probe = "" if grid_ok else await page.evaluate(PROBE_JS)
+        status = classify(resp.status if resp else None, page.url, probe)
+        breaker.record(status)
+        out["status"].update(profile=status, breaker=breaker.stats())
+        if status != STATUS_OK:
+            out["warnings"].append(f"Perfil {profile_url}: {status}")
+            return out
+
+        # 4) Links del grid: scroll adaptativo hasta max_posts únicos o grid sin crecer
+        harvest = await harvest_links(page, max_posts)
+        links = harvest.pop("links")
+        out["link_harvest"] = harvest
+        # (+ los que sólo llegaron en payloads del grid)
+        if harvester:
+            await harvester.drain()
+            seen = {shortcode_from_url(u) for u in links}
+            for url in harvester.urls():
+                if len(links) >= max_posts:
+                    break
+                if shortcode_from_url(url) not in seen:
+                    links.append(url)
+    finally:
+        await page.close()
+
+    if not links:
+        out["warnings"].append("Veo el grid pero no pude leer links de posts (IG cambió markup/render).")
+        out["warnings"].append("Tip: aumenta scroll o abre un post manualmente en la ventana del bot y re-run.")
+        return out
+
+    links = links[:max_posts]
+
+    # 5) Cache por shortcode: sólo se visitan posts nuevos o con engagement expirado
+    cached = {}
+    stale = {}  # expirados: se usan sólo si el refresh falla
+    if cache:
+        for url in links:
+            rec = cache.lookup(url)
+            if rec:
+                cached[url] = rec
+            elif cache.status(url) == "expired":
+                stale[url] = cache.get(url)
+    to_fetch = [url for url in links if url not in cached]
+
+    # 6) Records sin navegar: payloads del grid (mode="network") o fast path HTTP
+    resolved = {}
+    partial = {}  # del grid pero con campos faltantes: se completan visitando el post
+    if harvester:
+        for url in to_fetch:
+            rec = harvester.get(url)
+            if rec and not missing_fields(rec):
+                resolved[url] = rec
+            elif rec:
+                partial[url] = rec
+
+    http_ok = 0
+    if mode == "http" and to_fetch:
+        cookies = await context.cookies()
+        recs = await asyncio.to_thread(
+            fetch_posts_http, to_fetch, cookies, max(concurrency, DEFAULT_CONCURRENCY), http_base_url, 15.0, limiter
+        )
+        for url, rec in zip(to_fetch, recs):
+            if rec:
+                resolved[url] = rec
+                http_ok += 1
+
+    # 7) Visitar en paralelo lo que falte
+    pending = [url for url in to_fetch if url not in resolved]
+    pooled = await extract_posts_pooled(
+        context, pending, concurrency=concurrency, waits=waits, policy=policy, strategies=strategies,
+        limiter=limiter, breaker=breaker,
+    )
+    out["page_loads"] += len(pending)
+
+    fetched = dict(resolved)
+    for rec in pooled["posts"]:
+        base = partial.get(rec["post_url"]) or {}
+        fetched[rec["post_url"]] = {**rec, **base, **{k: v for k, v in rec.items() if v}}
+    if cache:
+        fetched = {url: cache.put(rec) for url, rec in fetched.items()}
+    if retry_queue:
+        for url in fetched:
+            retry_queue.resolve(url)
+        for url, failure in pooled["failures"].items():
+            retry_queue.add_failure(url, profile_url, **failure)
+
+    by_url = {**stale, **cached, **fetched}
+    out["posts"] = [by_url[url] for url in links if url in by_url]
+    out["warnings"].extend(pooled["warnings"])
+    out["status"]["posts"] = {url: pooled["statuses"].get(url, STATUS_OK) for url in links}
+    out["status"]["breaker"] = breaker.stats()
+    if mode == "http":
+        out["fast_path"] = {
+            "http_ok": http_ok,
+            "browser_fallback": len(pending),
+        }
+    if harvester:
+        out["grid_harvest"] = {
+            **harvester.stats(),
+            "resolved_from_grid": len(resolved),
+            "visited_for_missing": len(pending),
+        }
+    return out
+
+async def retry_posts(
+    context,
+    retry_queue: RetryQueue,
+    profile_url_or_handle: str = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    policy: ResourcePolicy = None,
+    waits: WaitLog = None,
+    cache: PostCache = None,
+    strategies: Dict = None,
+    limiter: DomainRateLimiter = None,
+    breaker: CircuitBreaker = None,
+) -> Dict:
+    """
+    Vuelve a visitar sólo los posts de `retry_queue` (de un perfil, o todos si
+    profile_url_or_handle es None). No toca el grid.
+    Los recuperados salen de la cola; los que fallan otra vez suman un intento.
+    Devuelve {profile_url, posts, warnings, page_loads, status, retry}.
+    """
+    profile_url = normalize_profile_url(profile_url_or_handle) if profile_url_or_handle else None
+    links = retry_queue.pending(profile_url)
+    breaker = breaker or CircuitBreaker()
+
+    pooled = await extract_posts_pooled(
+        context, links, concurrency=concurrency, waits=waits, policy=policy, strategies=strategies,
+        limiter=limiter, breaker=breaker,
+    )
+    posts = pooled["posts"]
+    if cache:
+        posts = [cache.put(rec) for rec in posts]
+    for rec in posts:
+        retry_queue.resolve(rec["post_url"])
+    for url, failure in pooled["failures"].items():
+        entry = retry_queue.posts.get(shortcode_from_url(url) or "") or {}
+        retry_queue.add_failure(url, entry.get("profile_url", profile_url or ""), **failure)
+
+    return {
+        "profile_url": profile_url or "",
+        "posts": posts,
+        "warnings": pooled["warnings"],
+        "page_loads": len(links),
+        "status": {"posts": pooled["statuses"], "breaker": breaker.stats()},
+        "retry": {"attempted": len(links), "recovered": len(posts), **retry_queue.stats()},
+    }
+
+async def extract_instagram_async(
+    profile_url_or_handle: str,
+    max_posts: int,
+    profile_dir: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    headless: bool = False,
+    mode: str = "browser",
+    http_base_url: str = None,
+    block_resources: bool = True,
+    resource_stages: Dict = None,
+    daemon=None,
+    use_cache: bool = True,
+    cache_path: str = DEFAULT_CACHE_PATH,
+    engagement_ttl_hours: float = DEFAULT_ENGAGEMENT_TTL_HOURS,
+    field_strategies: Dict = None,
+    retry_path: str = DEFAULT_RETRY_PATH,
+    retry_only: bool = False,
+    har_path: str = None,
+    har_mode: str = "replay",
+) -> Dict:
+    """
+    Extrae posts del perfil IG con async_playwright sobre un perfil persistente.
+    El grid se carga en una página; los posts se visitan con un pool de `concurrency` páginas.
+    Con mode="http" los posts se piden primero por HTTP (cookies del perfil) y sólo
+    los que no traen og meta usable pasan por Playwright.
+    Con mode="network" los records salen de los payloads JSON que recibe el grid
+    mientras scrollea; sólo se abren posts con campos faltantes.
+    Con block_resources=True se aplica ResourcePolicy (etapas grid/post, o `resource_stages`).
+    Con daemon=(host, port) reutiliza el contexto caliente de browser_daemon si está arriba.
+    Con use_cache=True sólo se visitan posts que no están en PostCache o cuyo
+    engagement pasó de `engagement_ttl_hours`.
+    `field_strategies` reemplaza los selectores por campo (field_script.FIELD_STRATEGIES).
+    Los posts que fallan se guardan en RetryQueue (`retry_path`); con retry_only=True
+    no se abre el grid: sólo se reintentan los posts en cola de este perfil
+    (ver retry_posts; `max_posts` se ignora).
+    Con har_path + har_mode="record" el tráfico del run se graba en un HAR; con
+    har_mode="replay" se sirve desde ese HAR y nada sale a la red (benchmarks/).
+    Devuelve:
+      - profile_url
+      - posts: [{post_url, image_url, caption, og_description, strategies}] (orden del grid)
+      - warnings: []
+      - readiness: {page_url: {espera: {ms, ok}}}
+      - fast_path: {http_ok, browser_fallback} (sólo mode="http")
+      - grid_harvest: {responses_seen, payloads_decoded, posts_found, ...} (sólo mode="network")
+      - network: stats de ResourcePolicy (requests/bytes bloqueados)
+      - link_harvest: {scrolls, elapsed_ms, stopped}
+      - browser: "daemon" | "local"
+      - cache: {hits, expired, misses, size}
+      - status: {profile, posts: {url: ok|blocked|login_required|private|not_found|error|skipped},
+                 breaker: {state, trips, paused_s, last_failure, counts}}
+      - retry_queue: {added, recovered, size, exhausted}
+      - retry: {attempted, recovered, added, size, exhausted} (sólo retry_only=True)
+    """
+    waits = WaitLog()
+    policy = ResourcePolicy(resource_stages) if block_resources else None
+    cache = PostCache(cache_path, engagement_ttl_hours) if use_cache else None
+    retry_queue = RetryQueue(retry_path)
+    if har_path and har_mode not in ("record", "replay"):
+        raise ValueError(f"har_mode inválido: {har_mode} (usa record, replay)")
+    if har_path:
+        daemon = None  # el HAR se escribe al cerrar el contexto; el del daemon no se cierra
+
+    async with async_playwright() as p:
+        async with browser_context(p, profile_dir, headless=headless, block_service_workers=bool(policy), daemon=daemon) as (context, lease):
+            # el HAR va antes que la política: la última ruta registrada corre primero
+            if har_path:
+                await context.route_from_har(
+                    har_path,
+                    update=har_mode == "record",
+                    not_found="abort" if har_mode == "replay" else "fallback",
+                    update_content="embed",
+                )
+            if policy:
+                await policy.attach(context)
+            try:
+                if retry_only:
+                    out = await retry_posts(
+                        context,
+                        retry_queue,
+                        profile_url_or_handle,
+                        concurrency=concurrency,
+                        policy=policy,
+                        waits=waits,
+                        cache=cache,
+                        strategies=field_strategies,
+                    )
+                else:
+                    out = await extract_profile(
+                        context,
+                        profile_url_or_handle,
+                        max_posts,
+                        concurrency=concurrency,
+                        mode=mode,
+                        http_base_url=http_base_url,
+                        policy=policy,
+                        waits=waits,
+                        cache=cache,
+                        strategies=field_strategies,
+                        retry_queue=retry_queue,
+                    )
+            finally:
+                if policy:
+                    await policy.detach(context)
+                if cache:
+                    cache.save()
+                retry_queue.save()
+
+            if lease:
+                lease["pages"] += out["page_loads"]
+            out["browser"] = "daemon" if lease else "local"
+
+    out["readiness"] = waits.to_dict()
+    if policy:
+        out["network"] = policy.stats()
+    if cache:
+        out["cache"] = cache.stats()
+    if not retry_only:
+        out["retry_queue"] = retry_queue.stats()
+    return out
+
+def run_extraction(
+    profile_url_or_handle: str,
+    max_posts: int,
+    profile_dir: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    headless: bool = False,
+    mode: str = "browser",
+    http_base_url: str = None,
+    block_resources: bool = True,
+    resource_stages: Dict = None,
+    daemon=None,
+    use_cache: bool = True,
+    cache_path: str = DEFAULT_CACHE_PATH,
+    engagement_ttl_hours: float = DEFAULT_ENGAGEMENT_TTL_HOURS,
+    field_strategies: Dict = None,
+    retry_path: str = DEFAULT_RETRY_PATH,
+    retry_only: bool = False,
+    har_path: str = None,
+    har_mode: str = "replay",
+) -> Dict:
+    """
+    Wrapper síncrono para runner.py / ui_app.py.
+    """
+    return asyncio.run(extract_instagram_async(
+        profile_url_or_handle,
+        max_posts,
+        profile_dir,
+        concurrency=concurrency,
+        headless=headless,
+        mode=mode,
+        http_base_url=http_base_url,
+        block_resources=block_resources,
+        resource_stages=resource_stages,
+        daemon=daemon,
+        use_cache=use_cache,
+        cache_path=cache_path,
+        engagement_ttl_hours=engagement_ttl_hours,
+        field_strategies=field_strategies,
+        retry_path=retry_path,
+        retry_only=retry_only,
+        har_path=har_path,
+        har_mode=har_mode,
+    ))
@@ -0,0 +1,112 @@
+# extractors/link_harvester.py
+import time
+from typing import Dict, List
+
+from extractors.post_cache import shortcode_from_url
+
+# Junta links de posts del grid con un MutationObserver dentro de la página:
+# cada scroll sólo lee los links nuevos, el dedupe es por Set (no lista) y se
+# para en cuanto hay `max_posts` únicos o el grid deja de crecer.
+
+_INSTALL_JS = """
+() => {
+    if (window.__rsssLinks) return window.__rsssLinks.list.length;
+    const st = {seen: new Set(), list: []};
+    const add = (a) => {
+        let h = a.getAttribute('href') || a.href;
+        if (!h) return;
+        h = h.split('?')[0];
+        if (!(h.includes('/p/') || h.includes('/reel/'))) return;
+        if (st.seen.has(h)) return;
+        st.seen.add(h);
+        st.list.push(h);
+    };
+    const scan = (n) => {
+        if (n.nodeType !== 1) return;
+        if (n.tagName === 'A') add(n);
+        if (n.querySelectorAll) n.querySelectorAll('a[href]').forEach(add);
+    };
+    document.querySelectorAll('a[href]').forEach(add);
+    new MutationObserver((muts) => {
+        for (const m of muts) {
+            if (m.type === 'attributes') scan(m.target);
+            else m.addedNodes.forEach(scan);
+        }
+    }).observe(document.body, {childList: true, subtree: true, attributes: true, attributeFilter: ['href']});
+    window.__rsssLinks = st;
+    return st.list.length;
+}
+"""
+
+_READ_JS = "(start) => window.__rsssLinks ? window.__rsssLinks.list.slice(start) : []"
+
+_GROWTH_JS = "(prev) => !!window.__rsssLinks && window.__rsssLinks.list.length > prev"
+
+def _absolute(href: str) -> str:
+    if href.startswith("/"):
+        return "https://www.instagram.com" + href
+    return href
+
+async def harvest_links(
+    page,
+    max_posts: int,
+    max_scrolls: int = 30,
+    step_px: int = 1400,
+    growth_timeout_ms: int = 1500,
+    idle_rounds: int = 2,
+) -> Dict:
+    """
+    Scroll adaptativo del grid. Devuelve:
+      - links: URLs únicas (orden del grid), máximo `max_posts`
+      - scrolls: pasos de scroll hechos
+      - elapsed_ms
+      - stopped: "max_posts" | "grid_idle" | "max_scrolls"
+    """
+    t0 = time.perf_counter()
+    links: List[str] = []
+    seen = set()
+    read = 0
+
+    async def pull():
+        nonlocal read
+        hrefs = await page.evaluate(_READ_JS, read) or []
+        read += len(hrefs)
+        for h in hrefs:
+            url = _absolute(h)
+            key = shortcode_from_url(url) or url
+            if key not in seen:
+                seen.add(key)
+                links.append(url)
+
+    await page.evaluate(_INSTALL_JS)
+    await pull()
+
+    scrolls = 0
+    idle = 0
+    stopped = "max_posts"
+    while len(links) < max_posts:
+        if scrolls >= max_scrolls:
+            stopped = "max_scrolls"
+            break
+        try:
+            await page.mouse.wheel(0, step_px)
+        except Exception:
+            stopped = "grid_idle"
+            break
+        scrolls += 1
+        try:
+            await page.wait_for_function(_GROWTH_JS, arg=read, timeout=growth_timeout_ms, polling=100)
+            idle = 0
+        except Exception:
+            idle += 1
+        await pull()
+        if idle >= idle_rounds:
+            stopped = "grid_idle"
+            break
+
+    return {
+        "links": links[:max_posts],
+        "scrolls": scrolls,
+        "elapsed_ms": int(round((time.perf_counter() - t0) * 1000)),
+        "stopped": stopped,
+    }
@@ -0,0 +1,137 @@
+# extractors/post_cache.py
+import json
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+# Cache persistente de posts por shortcode.
+#   - caption / image_url: inmutables (una vez vistos no se vuelven a pedir)
+#   - og_description (likes/comments): expira tras `engagement_ttl_hours`
+
+DEFAULT_CACHE_PATH = "cache/posts.json"
+DEFAULT_ENGAGEMENT_TTL_HOURS = 24.0
+CACHE_VERSION = 1
+
+RE_SHORTCODE = re.compile(r"/(?:p|reel)/([A-Za-z0-9_-]+)")
+
+def shortcode_from_url(url: str) -> Optional[str]:
+    m = RE_SHORTCODE.search(url or "")
+    return m.group(1) if m else None
+
+def _parse_iso(s: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(s)
+    except (TypeError, ValueError):
+        return None
+
+class PostCache:
+    """
+    {shortcode: {post_url, image_url, caption, og_description, fetched_at, engagement_at}}
+    guardado como JSON en `path`.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, engagement_ttl_hours: float = DEFAULT_ENGAGEMENT_TTL_HOURS):
+        self.path = Path(path)
+        self.engagement_ttl_s = float(engagement_ttl_hours) * 3600
+        self.posts: Dict[str, Dict] = {}
+        self.hits = 0
+        self.expired = 0
+        self.misses = 0
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") == CACHE_VERSION:
+            self.posts = data.get("posts") or {}
+
+    def save(self):
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "posts": self.posts}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+    def status(self, url: str, now: Optional[datetime] = None) -> str:
+        """
+        "fresh" | "expired" | "missing"
+        """
+        entry = self.posts.get(shortcode_from_url(url) or "")
+        if not entry:
+            return "missing"
+        now = now or datetime.now(timezone.utc)
+        eng_at = _parse_iso(entry.get("engagement_at"))
+        if not eng_at or (now - eng_at).total_seconds() > self.engagement_ttl_s:
+            return "expired"
+        return "fresh"
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Record en formato del extractor (post_url = la URL pedida).
+        """
+        entry = self.posts.get(shortcode_from_url(url) or "")
+        if not entry:
+            return None
+        return {
+            "post_url": url,
+            "image_url": entry.get("image_url", ""),
+            "caption": entry.get("caption", ""),
+            "og_description": entry.get("og_description", ""),
+            **({"taken_at": entry["taken_at"]} if entry.get("taken_at") else {}),
+        }
+
+    def lookup(self, url: str, now: Optional[datetime] = None) -> Optional[Dict]:
+        """
+        Record si está fresco; None si falta o expiró (y cuenta hit/miss/expired).
+        """
+        st = self.status(url, now)
+        if st == "fresh":
+            self.hits += 1
+            return self.get(url)
+        if st == "expired":
+            self.expired += 1
+        else:
+            self.misses += 1
+        return None
+
+    def put(self, record: Dict, now: Optional[datetime] = None) -> Dict:
+        """
+        Guarda un record recién extraído. Caption/imagen ya cacheados no se pisan;
+        og_description se actualiza (y renueva el TTL) sólo si el record lo trae:
+        un og vacío no deja como frescos los likes viejos. Regresa el record combinado.
+        """
+        code = shortcode_from_url(record.get("post_url", ""))
+        if not code:
+            return record
+        now_iso = (now or datetime.now(timezone.utc)).isoformat()
+        entry = self.posts.get(code) or {"fetched_at": now_iso}
+
+        for k in ("caption", "image_url"):
+            if not entry.get(k):
+                entry[k] = record.get(k, "")
+        entry["post_url"] = entry.get("post_url") or record.get("post_url", "")
+        if record.get("og_description"):
+            entry["og_description"] = record["og_description"]
+            entry["engagement_at"] = now_iso
+        if record.get("taken_at") and not entry.get("taken_at"):
+            entry["taken_at"] = record["taken_at"]
+
+        self.posts[code] = entry
+        self._dirty = True
+        return {**record, "caption": entry.get("caption", ""), "image_url": entry.get("image_url", "")}
+
+    def stats(self) -> Dict:
+        return {
+            "hits": self.hits,
+            "expired": self.expired,
+            "misses": self.misses,
+            "size": len(self.posts),
+        }
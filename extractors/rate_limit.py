@@ -0,0 +1,97 @@
+# extractors/rate_limit.py
+import asyncio
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+# Token bucket global por dominio: todas las navegaciones (goto y GET del fast path)
+# de todos los workers pasan por aquí, así la concurrencia nunca sube la tasa.
+
+DEFAULT_RATE_PER_S = 0.5
+DEFAULT_BURST = 3
+
+class TokenBucket:
+    """
+    `rate` tokens por segundo, hasta `burst` acumulados.
+    Thread-safe: sirve desde asyncio (acquire) y desde threads (acquire_sync).
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """
+        Toma un token (puede quedar en negativo) y regresa cuántos segundos esperar.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1.0
+            if self._tokens >= 0 or self.rate <= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    async def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self):
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+class DomainRateLimiter:
+    """
+    Un TokenBucket por dominio (www.instagram.com, etc.). Lleva cuenta de
+    requests y segundos esperados por dominio.
+    """
+
+    def __init__(self, rate_per_s: float = DEFAULT_RATE_PER_S, burst: int = DEFAULT_BURST, overrides: Dict[str, float] = None):
+        self.rate_per_s = rate_per_s
+        self.burst = burst
+        self.overrides = overrides or {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self.requests: Dict[str, int] = {}
+        self.waited_s: Dict[str, float] = {}
+
+    def _bucket(self, url: str):
+        domain = urlparse(url).hostname or ""
+        with self._lock:
+            b = self._buckets.get(domain)
+            if b is None:
+                b = TokenBucket(self.overrides.get(domain, self.rate_per_s), self.burst)
+                self._buckets[domain] = b
+            self.requests[domain] = self.requests.get(domain, 0) + 1
+        return domain, b
+
+    async def acquire(self, url: str):
+        domain, b = self._bucket(url)
+        t0 = time.monotonic()
+        await b.acquire()
+        self._add_wait(domain, time.monotonic() - t0)
+
+    def acquire_sync(self, url: str):
+        domain, b = self._bucket(url)
+        t0 = time.monotonic()
+        b.acquire_sync()
+        self._add_wait(domain, time.monotonic() - t0)
+
+    def _add_wait(self, domain: str, secs: float):
+        with self._lock:
+            self.waited_s[domain] = round(self.waited_s.get(domain, 0.0) + secs, 3)
+
+    def stats(self) -> Dict:
+        return {
+            "rate_per_s": self.rate_per_s,
+            "burst": self.burst,
+            "requests": dict(self.requests),
+            "waited_s": dict(self.waited_s),
+        }
@@ -0,0 +1,69 @@
+# extractors/readiness.py
+import time
+from typing import Dict, List
+
+# Esperas basadas en señales reales del DOM (no sleeps fijos).
+# Cada helper regresa True si la señal apareció y False si venció el timeout.
+
+GRID_ANCHORS = 'a[href*="/p/"], a[href*="/reel/"]'
+
+class WaitLog:
+    """
+    Registra por página cuánto tardó cada espera:
+      {page_key: {wait_name: {"ms": int, "ok": bool}}}
+    """
+
+    def __init__(self):
+        self.pages: Dict[str, Dict[str, Dict]] = {}
+
+    async def timed(self, page_key: str, name: str, coro) -> bool:
+        t0 = time.perf_counter()
+        ok = bool(await coro)
+        self.record(page_key, name, int(round((time.perf_counter() - t0) * 1000)), ok)
+        return ok
+
+    def record(self, page_key: str, name: str, ms: int, ok: bool):
+        self.pages.setdefault(page_key, {})[name] = {"ms": ms, "ok": ok}
+
+    def to_dict(self) -> Dict[str, Dict[str, Dict]]:
+        return self.pages
+
+async def wait_for_selector(page, selector: str, timeout_ms: int = 8000) -> bool:
+    try:
+        await page.wait_for_selector(selector, timeout=timeout_ms)
+        return True
+    except Exception:
+        return False
+
+async def dismiss_popups(page, selectors: List[str], appear_timeout_ms: int = 1500, max_clicks: int = 3) -> bool:
+    """
+    Une todos los selectores en un solo locator y sólo hace click si un popup
+    realmente está visible; después espera a que desaparezca.
+    Regresa True si cerró al menos uno.
+    """
+    if not selectors:
+        return False
+
+    combined = page.locator(selectors[0])
+    for sel in selectors[1:]:
+        combined = combined.or_(page.locator(sel))
+
+    closed = False
+    for _ in range(max_clicks):
+        target = combined.first
+        try:
+            await target.wait_for(state="visible", timeout=appear_timeout_ms)
+        except Exception:
+            break
+        try:
+            await target.click(timeout=appear_timeout_ms)
+            closed = True
+        except Exception:
+            break
+        try:
+            await target.wait_for(state="hidden", timeout=appear_timeout_ms)
+        except Exception:
+            pass
+        # el siguiente popup (si hay) suele aparecer enseguida
+        appear_timeout_ms = min(appear_timeout_ms, 500)
+    return closed
@@ -0,0 +1,138 @@
+# extractors/resource_policy.py
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+# Política de recursos por etapa: sólo leemos URLs y texto, así que
+# imágenes/video/fuentes/trackers no tienen que bajarse.
+#   - grid: necesita scripts + CSS (el scroll infinito depende del layout)
+#   - post: og meta + texto del article; sin CSS ni media
+# allow_url_patterns gana sobre todo lo demás.
+
+TRACKING_PATTERNS = [
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"doubleclick\.net",
+    r"connect\.facebook\.net",
+    r"facebook\.com/tr",
+    r"graph\.instagram\.com/logging",
+    r"/logging_client_events",
+    r"/ajax/bz",
+    r"/falco",
+]
+
+DEFAULT_STAGES = {
+    "grid": {
+        "block_types": ["image", "media", "font"],
+        "block_url_patterns": TRACKING_PATTERNS,
+        "allow_url_patterns": [],
+    },
+    "post": {
+        "block_types": ["image", "media", "font", "stylesheet", "manifest", "other"],
+        "block_url_patterns": TRACKING_PATTERNS,
+        "allow_url_patterns": [],
+    },
+}
+
+# Tamaño típico por tipo (bytes) para estimar lo que NO se descargó
+EST_BYTES_BY_TYPE = {
+    "image": 60_000,
+    "media": 500_000,
+    "font": 40_000,
+    "stylesheet": 30_000,
+    "script": 80_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+    "manifest": 2_000,
+    "other": 5_000,
+}
+
+class ResourcePolicy:
+    """
+    Bloquea/permite requests del contexto por tipo de recurso y patrón de URL.
+    La etapa se asigna por página (set_stage); las páginas sin etapa usan default_stage.
+    """
+
+    def __init__(self, stages: Optional[Dict[str, Dict]] = None, default_stage: str = "grid"):
+        self.stages = {}
+        for name, spec in (stages or DEFAULT_STAGES).items():
+            self.stages[name] = {
+                "block_types": set(spec.get("block_types") or []),
+                "block_re": _compile(spec.get("block_url_patterns")),
+                "allow_re": _compile(spec.get("allow_url_patterns")),
+            }
+        self.default_stage = default_stage
+        self._page_stage = {}
+
+        self.requests_total = 0
+        self.requests_blocked = 0
+        self.blocked_by_type = Counter()
+        self.blocked_by_stage = Counter()
+        self.bytes_loaded = 0
+
+    async def attach(self, context):
+        await context.route("**/*", self._handle)
+        context.on("response", self._on_response)
+
+    async def detach(self, context):
+        # el contexto puede ser compartido (browser_daemon): quitar lo nuestro
+        try:
+            await context.unroute("**/*", self._handle)
+            context.remove_listener("response", self._on_response)
+        except Exception:
+            pass
+
+    def set_stage(self, page, stage: str):
+        self._page_stage[page] = stage
+
+    def should_block(self, stage: str, resource_type: str, url: str) -> bool:
+        spec = self.stages.get(stage)
+        if not spec:
+            return False
+        if spec["allow_re"] and spec["allow_re"].search(url):
+            return False
+        if resource_type in spec["block_types"]:
+            return True
+        return bool(spec["block_re"] and spec["block_re"].search(url))
+
+    def _stage_of(self, request) -> str:
+        try:
+            return self._page_stage.get(request.frame.page, self.default_stage)
+        except Exception:
+            # requests sin frame (service worker, etc.)
+            return self.default_stage
+
+    async def _handle(self, route):
+        request = route.request
+        stage = self._stage_of(request)
+        self.requests_total += 1
+        if self.should_block(stage, request.resource_type, request.url):
+            self.requests_blocked += 1
+            self.blocked_by_type[request.resource_type] += 1
+            self.blocked_by_stage[stage] += 1
+            await route.abort("blockedbyclient")
+            return
+        # fallback (no continue_): si hay otra ruta abajo (route_from_har) la atiende ella
+        await route.fallback()
+
+    def _on_response(self, response):
+        try:
+            self.bytes_loaded += int(response.headers.get("content-length") or 0)
+        except Exception:
+            pass
+
+    def stats(self) -> Dict:
+        bytes_saved_est = sum(EST_BYTES_BY_TYPE.get(t, 5_000) * n for t, n in self.blocked_by_type.items())
+        return {
+            "requests_total": self.requests_total,
+            "requests_blocked": self.requests_blocked,
+            "blocked_by_type": dict(self.blocked_by_type.most_common()),
+            "blocked_by_stage": dict(self.blocked_by_stage),
+            "bytes_loaded": self.bytes_loaded,
+            "bytes_saved_est": bytes_saved_est,
+        }
+
+def _compile(patterns: Optional[List[str]]):
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
@@ -0,0 +1,116 @@
+# extractors/retry_queue.py
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from extractors.block_detector import STATUS_BLOCKED, STATUS_ERROR, STATUS_LOGIN, STATUS_SKIPPED
+from extractors.post_cache import shortcode_from_url
+
+# Cola persistente de posts que fallaron: se reintentan solos (runner.py --retry)
+# sin volver a correr el perfil completo.
+#   - private / not_found no entran: reintentar no cambia nada
+
+DEFAULT_RETRY_PATH = "cache/retry_queue.json"
+DEFAULT_MAX_ATTEMPTS = 5
+QUEUE_VERSION = 1
+
+RETRY_STATUSES = {STATUS_BLOCKED, STATUS_LOGIN, STATUS_ERROR, STATUS_SKIPPED}
+
+class RetryQueue:
+    """
+    {shortcode: {post_url, profile_url, status, error_class, error, attempts,
+                 first_failed_at, last_failed_at}}
+    guardado como JSON en `path`.
+    """
+
+    def __init__(self, path: str = DEFAULT_RETRY_PATH, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.posts: Dict[str, Dict] = {}
+        self.added = 0
+        self.recovered = 0
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") == QUEUE_VERSION:
+            self.posts = data.get("posts") or {}
+
+    def save(self):
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": QUEUE_VERSION, "posts": self.posts}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+    def add_failure(self, url: str, profile_url: str, status: str, error_class: str = "", error: str = "",
+                    now: Optional[datetime] = None) -> Optional[Dict]:
+        """
+        Registra (o vuelve a registrar) una falla. Regresa la entrada, o None si
+        el status no amerita reintento (y en ese caso la saca de la cola).
+        """
+        code = shortcode_from_url(url)
+        if not code:
+            return None
+        if status not in RETRY_STATUSES:
+            # private / not_found: ya no tiene caso seguir reintentando
+            if self.posts.pop(code, None) is not None:
+                self._dirty = True
+            return None
+        now_iso = (now or datetime.now(timezone.utc)).isoformat()
+        entry = self.posts.get(code)
+        if entry is None:
+            entry = {"post_url": url, "profile_url": profile_url, "attempts": 0, "first_failed_at": now_iso}
+            self.added += 1
+        entry.update({
+            "status": status,
+            "error_class": error_class or status,
+            "error": (error or "")[:500],
+            "attempts": entry.get("attempts", 0) + 1,
+            "last_failed_at": now_iso,
+        })
+        if profile_url:
+            entry["profile_url"] = profile_url
+        self.posts[code] = entry
+        self._dirty = True
+        return entry
+
+    def resolve(self, url: str) -> bool:
+        """
+        Quita el post de la cola (ya se extrajo bien).
+        """
+        if self.posts.pop(shortcode_from_url(url) or "", None) is None:
+            return False
+        self.recovered += 1
+        self._dirty = True
+        return True
+
+    def pending(self, profile_url: Optional[str] = None) -> List[str]:
+        """
+        URLs por reintentar (opcionalmente de un solo perfil), sin las que ya
+        agotaron `max_attempts`.
+        """
+        return [
+            e["post_url"]
+            for e in self.posts.values()
+            if e.get("attempts", 0) < self.max_attempts
+            and (profile_url is None or e.get("profile_url") == profile_url)
+        ]
+
+    def stats(self) -> Dict:
+        exhausted = sum(1 for e in self.posts.values() if e.get("attempts", 0) >= self.max_attempts)
+        return {
+            "added": self.added,
+            "recovered": self.recovered,
+            "size": len(self.posts),
+            "exhausted": exhausted,
+        }
@@ -0,0 +1,136 @@
+# models/post.py
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+# Un post = UN objeto con __slots__ durante todo el análisis: el extractor da los
+# campos base, analyze_posts llena las anotaciones y analyze_temporal la fecha,
+# todos sobre el mismo record (posts_annotated y posts_with_dates apuntan a los
+# mismos objetos). Sin dict por post ni llaves repetidas en cada copia.
+# Los dicts para JSON se arman sólo al escribir la salida (Post.to_dict /
+# to_dicts en report_builder y en los sinks).
+
+POST_FIELDS = ("post_url", "image_url", "caption", "og_description", "taken_at")
+CAPTION_FIELDS = ("hashtags", "language_est", "ctas", "topics", "likes_est", "comments_est")
+DATE_FIELDS = ("published_at", "year", "month", "age_days")
+
+class _Missing:
+    """
+    Campo que el post no trae (≠ None: None sí se reporta en el JSON).
+    Es falso, así `post.caption or ""` sigue funcionando.
+    """
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return "MISSING"
+
+    def __reduce__(self):
+        # al volver de otro proceso (parallel) sigue siendo el mismo objeto
+        return "MISSING"
+
+MISSING = _Missing()
+
+_FIELDS = POST_FIELDS + CAPTION_FIELDS + DATE_FIELDS
+_FIELD_SET = frozenset(_FIELDS)
+
+class Post:
+    """
+    p = Post.from_dict({"post_url": ..., "caption": ..., "strategies": [...]})
+    p.caption, p.get("likes_est"), p["topics"]   (campos que no trae → MISSING / default)
+    p.to_dict(dates=False)   → el dict que antes iba en posts_annotated
+    Llaves que no son campos conocidos quedan en `extra`.
+    """
+
+    __slots__ = _FIELDS + ("extra",)
+
+    def __init__(self, post_url: str = MISSING, image_url: str = MISSING, caption: str = MISSING,
+                 og_description: str = MISSING, taken_at: Any = MISSING, extra: Dict[str, Any] = None):
+        self.post_url = post_url
+        self.image_url = image_url
+        self.caption = caption
+        self.og_description = og_description
+        self.taken_at = taken_at
+        self.extra = extra
+        for name in CAPTION_FIELDS + DATE_FIELDS:
+            setattr(self, name, MISSING)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Post":
+        post = cls()
+        extra = None
+        for key, value in d.items():
+            if key in _FIELD_SET:
+                setattr(post, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        post.extra = extra
+        return post
+
+    @classmethod
+    def coerce(cls, p: Any) -> "Post":
+        """
+        Post → el mismo objeto (se anota en su lugar); dict → Post nuevo.
+        """
+        return p if isinstance(p, Post) else cls.from_dict(p)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            return default if value is MISSING else value
+        return self.extra.get(key, default) if self.extra else default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, MISSING) is not MISSING
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Post):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Post({self.post_url!r})"
+
+    def to_dict(self, annotations: bool = True, dates: bool = True) -> Dict[str, Any]:
+        """
+        Dict para JSON: campos base + extra, luego anotaciones de caption y de
+        fecha (el mismo orden de llaves que los dicts de antes). published_at
+        sale en ISO.
+        """
+        out = {}
+        for name in POST_FIELDS:
+            value = getattr(self, name)
+            if value is not MISSING:
+                out[name] = value
+        if self.extra:
+            out.update(self.extra)
+        if annotations:
+            for name in CAPTION_FIELDS:
+                value = getattr(self, name)
+                if value is not MISSING:
+                    out[name] = value
+        if dates:
+            for name in DATE_FIELDS:
+                value = getattr(self, name)
+                if value is not MISSING:
+                    out[name] = value.isoformat() if isinstance(value, datetime) else value
+        return out
+
+def to_dicts(posts: Iterable[Any], annotations: bool = True, dates: bool = True) -> List[Dict[str, Any]]:
+    """
+    Lista de posts (Post o dicts ya armados) → lista de dicts para JSON.
+    """
+    return [p.to_dict(annotations, dates) if isinstance(p, Post) else p for p in posts or []]
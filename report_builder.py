@@ -0,0 +1,190 @@
+# report_builder.py
+import json
+import os
+from datetime import datetime, timezone
+
+from analyzers.memo import AnalysisMemo
+from analyzers.pipeline import analyze_fused
+from models.post import MISSING, Post, to_dicts
+
+def build_report_json(platform: str, handle_or_url: str, max_posts: int, runtime_s: float, ig_data: dict, matcher=None,
+                      memo: AnalysisMemo = None):
+    """
+    `matcher`: caption_analyzer.build_matcher(vertical) para diccionarios de una vertical.
+    `memo`: memo.AnalysisMemo compartido entre reportes (batch) para no re-analizar
+    textos ya vistos; su hit rate de este reporte va en meta.analysis_cache.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+
+    raw = {
+        "platform": platform,
+        "handle_or_url": handle_or_url,
+        "max_posts": max_posts,
+        "instagram_public": ig_data
+    }
+
+    # Top posts base: un Post por post, el mismo record pasa por todo el análisis
+    top_posts = []
+    for p in ig_data.get("posts", [])[:max_posts]:
+        top_posts.append(Post(
+            post_url=p.get("post_url", ""),
+            image_url=p.get("image_url", ""),
+            caption=p.get("caption", ""),
+            og_description=p.get("og_description", ""),
+            taken_at=p.get("taken_at") or MISSING,
+        ))
+
+    # ✅ Analytics A: caption (engagement/hashtags/idioma/CTA/temas) + temporal
+    # (fechas/eras/posts por año) en una sola pasada por post
+    memo = memo or AnalysisMemo(matcher)
+    memo_before = memo.stats()
+    analytics, temporal = analyze_fused(top_posts, matcher=matcher, memo=memo)
+
+    # a dicts recién aquí (salida): cada lista con los campos que siempre tuvo
+    analytics["posts_annotated"] = to_dicts(analytics["posts_annotated"], dates=False)
+    temporal["posts_with_dates"] = to_dicts(temporal["posts_with_dates"])
+    analytics["temporal"] = temporal
+
+    report = {
+        "meta": {
+            "platform": platform,
+            "handle": handle_or_url,
+            "generated_at": now,
+            "run_time_seconds": runtime_s,
+            "network": ig_data.get("network", {}),
+            "analysis_cache": memo.stats(since=memo_before),
+            "status": ig_data.get("status", {}).get("profile", "")
+        },
+        "profiles": [
+            {
+                "platform": platform,
+                "handle": handle_or_url,
+                "profile_url": ig_data.get("profile_url", ""),
+                "bio": "",
+                "website": "",
+                "avatar_url": ""
+            }
+        ],
+        "content": {
+            "top_posts": to_dicts(top_posts, annotations=False, dates=False),
+            "analytics": analytics
+        },
+        "warnings": ig_data.get("warnings", [])
+    }
+
+    return raw, report
+
+def report_to_markdown(report: dict) -> str:
+    meta = report.get("meta", {})
+    content = report.get("content", {})
+    top_posts = content.get("top_posts", [])
+    analytics = content.get("analytics", {})
+    warnings = report.get("warnings", [])
+
+    temporal = analytics.get("temporal", {})
+
+    lines = []
+    lines.append(f"# Social Report — {meta.get('platform','')} | {meta.get('handle','')}")
+    lines.append(f"Generated: {meta.get('generated_at','')}")
+    lines.append(f"Runtime: {meta.get('run_time_seconds','')}s")
+    if meta.get("status") and meta["status"] != "ok":
+        lines.append(f"Status: {meta['status']}")
+    net = meta.get("network") or {}
+    if net:
+        lines.append(f"Network: {net.get('requests_blocked', 0)}/{net.get('requests_total', 0)} requests bloqueados "
+                     f"(~{round(net.get('bytes_saved_est', 0) / 1024)} KB ahorrados)")
+    memo = meta.get("analysis_cache") or {}
+    if memo.get("hit_rate") is not None:
+        lines.append(f"Analysis cache: {memo['hits']}/{memo['hits'] + memo['misses']} textos ya analizados")
+    lines.append("")
+
+    if warnings:
+        lines.append("## Warnings")
+        for w in warnings:
+            lines.append(f"- {w}")
+        lines.append("")
+
+    lines.append("## Analytics (Auto)")
+    lines.append(f"- Avg likes est: {analytics.get('avg_likes_est')}")
+    lines.append(f"- Avg comments est: {analytics.get('avg_comments_est')}")
+    lines.append("")
+
+    # Temporal summary
+    lines.append("### Temporal")
+    lines.append(f"- Min date: {temporal.get('min_date')}")
+    lines.append(f"- Max date: {temporal.get('max_date')}")
+    lines.append(f"- Span days: {temporal.get('span_days')}")
+    cadence = temporal.get("cadence") or {}
+    if cadence.get("posts"):
+        lines.append(f"- Posts per week: {cadence.get('posts_per_week')} "
+                     f"(últimas 4 semanas: {cadence.get('recent_posts_per_week')})")
+        longest = cadence.get("longest_gap") or {}
+        if longest.get("days"):
+            lines.append(f"- Longest gap: {longest['days']} días ({longest['from']} → {longest['to']})")
+    eras = temporal.get("era_guess", {})
+    if eras:
+        lines.append(f"- Era buckets: {eras}")
+    ppy = temporal.get("posts_per_year", {})
+    if ppy:
+        lines.append("- Posts per year:")
+        for y, c in ppy.items():
+            lines.append(f"  - {y}: {c}")
+    lines.append("")
+
+    # Language ratio
+    lang = analytics.get("language_ratio", {})
+    if lang:
+        lines.append("### Language ratio")
+        for k, v in lang.items():
+            lines.append(f"- {k}: {v}")
+        lines.append("")
+
+    # CTA frequency
+    ctas = analytics.get("cta_frequency", {})
+    if ctas:
+        lines.append("### CTA frequency")
+        for k, v in ctas.items():
+            lines.append(f"- {k}: {v}")
+        lines.append("")
+
+    # Topics
+    topics = analytics.get("dominant_topics", {})
+    if topics:
+        lines.append("### Dominant topics")
+        for k, v in topics.items():
+            lines.append(f"- {k}: {v}")
+        lines.append("")
+
+    # Hashtags
+    tags = analytics.get("hashtag_frequency", {})
+    if tags:
+        lines.append("### Top hashtags")
+        for k, v in tags.items():
+            lines.append(f"- {k}: {v}")
+        lines.append("")
+
+    lines.append("## Top posts")
+    if not top_posts:
+        lines.append("- (sin posts todavía)")
+    for post in top_posts:
+        img = post.get("image_url", "")
+        thumb = post.get("thumb_url", "")
+        if img and thumb:
+            lines.append(f"[![]({thumb})]({img})")
+        elif img:
+            lines.append(f"![]({img})")
+        lines.append(f"- URL: {post.get('post_url','')}")
+        cap = post.get("caption", "")
+        if cap:
+            lines.append(f"- Caption: {cap}")
+        lines.append("")
+    return "\n".join(lines)
+
+def save_outputs(raw: dict, report: dict, md: str, out_dir: str = "outputs"):
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "raw.json"), "w", encoding="utf-8") as f:
+        json.dump(raw, f, ensure_ascii=False, indent=2)
+    with open(os.path.join(out_dir, "report.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    with open(os.path.join(out_dir, "report.md"), "w", encoding="utf-8") as f:
+        f.write(md)
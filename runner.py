@@ -1,9 +1,14 @@
 # runner.py
 import json
 import os
+import sys
 from datetime import datetime, timezone
 
+from analyzers.memo import DEFAULT_MEMO_PATH, AnalysisMemo
+from extractors.asset_store import localize_report
+from extractors.browser_daemon import DEFAULT_HOST, DEFAULT_PORT
 from extractors.instagram_public import extract_instagram_profile_posts
+from report_builder import build_report_json, report_to_markdown
 
 def build_report_md(report: dict) -> str:
     meta = report.get("meta", {})
@@ -53,29 +58,8 @@ def build_report_md(report: dict) -> str:
 
     return "\n".join(lines)
 
-def main():
-    # -------- Inputs (MVP) --------
-    platform = "instagram"
-    handle_or_url = "instagram"  # pon aquí @handle o URL, ej: "lacarniceria" o "https://www.instagram.com/lacarniceria/"
-    max_posts = 12
-
-    started = datetime.now(timezone.utc)
-    t0 = datetime.now(timezone.utc)
-
-    raw = {
-        "platform": platform,
-        "handle_or_url": handle_or_url,
-        "max_posts": max_posts,
-    }
-
-    # -------- Extract (PUBLIC MODE) --------
-    ig = extract_instagram_profile_posts(handle_or_url, max_posts=max_posts)
-
-    raw["instagram_public"] = ig
-
-    # -------- Build report --------
+def build_report(platform: str, handle_or_url: str, max_posts: int, run_time_seconds: float, ig: dict) -> dict:
     now = datetime.now(timezone.utc).isoformat()
-    run_time_seconds = (datetime.now(timezone.utc) - t0).total_seconds()
 
     top_posts = []
     for p in ig.get("posts", [])[:max_posts]:
@@ -90,7 +74,9 @@ def main():
             "platform": platform,
             "handle": handle_or_url,
             "generated_at": now,
-            "run_time_seconds": round(run_time_seconds, 2)
+            "run_time_seconds": round(run_time_seconds, 2),
+            "network": ig.get("network", {}),
+            "status": ig.get("status", {}).get("profile", "")
         },
         "profiles": [
             {
@@ -124,7 +110,55 @@ def main():
         ]
     }
 
-    md = build_report_md(report)
+    return report
+
+def merge_retry(ig: dict, retried: dict) -> int:
+    """
+    Mete los posts recuperados de la cola de reintentos en un
+    raw["instagram_public"] existente, respetando el orden del grid.
+    Regresa cuántos posts se recuperaron.
+    """
+    recovered = {p["post_url"]: p for p in retried.get("posts", [])}
+    status = ig.setdefault("status", {})
+    order = list(status.get("posts") or [p.get("post_url", "") for p in ig.get("posts", [])])
+    order += [url for url in recovered if url not in order]
+
+    by_url = {p.get("post_url", ""): p for p in ig.get("posts", [])}
+    by_url.update(recovered)
+    ig["posts"] = [by_url[url] for url in order if url in by_url]
+
+    status.setdefault("posts", {}).update(retried.get("status", {}).get("posts", {}))
+    ig["warnings"] = [w for w in ig.get("warnings", []) if not any(url in w for url in recovered)]
+    ig["page_loads"] = ig.get("page_loads", 0) + retried.get("page_loads", 0)
+    ig["retry"] = retried.get("retry", {})
+    return len(recovered)
+
+def rebuild_report(prev: dict, raw: dict, platform: str, run_time_seconds: float):
+    """
+    Reporte de --retry con los posts recuperados, en el mismo formato que el
+    report.json que ya había: el de report_builder (ui_app: analytics, temporal,
+    cadencia, analysis_cache) se recalcula con build_report_json; el de este
+    runner con build_report. Las secciones del anterior que no se regeneran
+    se conservan. Regresa (report, md).
+    """
+    handle_or_url = raw.get("handle_or_url", "")
+    max_posts = raw.get("max_posts", 12)
+    ig = raw.get("instagram_public", {})
+    if "analytics" in (prev.get("content") or {}):
+        memo = AnalysisMemo(path=DEFAULT_MEMO_PATH)
+        _, report = build_report_json(raw.get("platform", platform), handle_or_url, max_posts,
+                                      round(run_time_seconds, 2), ig, memo=memo)
+        memo.save()
+        to_md = report_to_markdown
+    else:
+        report = build_report(raw.get("platform", platform), handle_or_url, max_posts, run_time_seconds, ig)
+        to_md = build_report_md
+    for k, v in prev.items():
+        report.setdefault(k, v)
+    return report, to_md
+
+def write_outputs(raw: dict, report: dict, to_md=build_report_md):
+    md = to_md(report)
 
     os.makedirs("outputs", exist_ok=True)
 
@@ -137,10 +171,85 @@ def main():
     with open("outputs/report.md", "w", encoding="utf-8") as f:
         f.write(md)
 
+def main():
+    # -------- Inputs (MVP) --------
+    platform = "instagram"
+    handle_or_url = "instagram"  # pon aquí @handle o URL, ej: "lacarniceria" o "https://www.instagram.com/lacarniceria/"
+    max_posts = 12
+    concurrency = 4  # páginas en paralelo para visitar posts
+    mode = "browser"  # "http" = fast path sin navegador; "network" = JSON del grid (sin abrir cada post)
+    daemon = (DEFAULT_HOST, DEFAULT_PORT)  # python -m extractors.browser_daemon; None = siempre lanzar Chromium
+    engagement_ttl_hours = 24  # posts en cache/posts.json más nuevos que esto no se vuelven a visitar
+    download_assets = True  # baja image_url a assets/ (las URLs del CDN caducan)
+    retry_failed = "--retry" in sys.argv  # python runner.py --retry: sólo cache/retry_queue.json → mezcla en outputs/
+
+    t0 = datetime.now(timezone.utc)
+
+    if retry_failed:
+        # -------- Retry (sólo posts fallidos del último run) --------
+        with open("outputs/raw.json", "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        handle_or_url = raw.get("handle_or_url", handle_or_url)
+        max_posts = raw.get("max_posts", max_posts)
+        prev = {}
+        if os.path.exists("outputs/report.json"):
+            with open("outputs/report.json", "r", encoding="utf-8") as f:
+                prev = json.load(f)
+        prev_run_time = prev.get("meta", {}).get("run_time_seconds", 0.0)
+
+        retried = extract_instagram_profile_posts(
+            handle_or_url,
+            concurrency=concurrency,
+            daemon=daemon,
+            engagement_ttl_hours=engagement_ttl_hours,
+            retry_only=True,
+        )
+        ig = raw.setdefault("instagram_public", {})
+        recovered = merge_retry(ig, retried)
+
+        run_time_seconds = prev_run_time + (datetime.now(timezone.utc) - t0).total_seconds()
+        report, to_md = rebuild_report(prev, raw, platform, run_time_seconds)
+        if download_assets:
+            localize_report(report, "outputs")
+        write_outputs(raw, report, to_md)
+
+        retry = ig.get("retry", {})
+        print(f"✅ Retry: {recovered}/{retry.get('attempted', 0)} posts recuperados "
+              f"({retry.get('size', 0)} siguen en cola)")
+        return
+
+    raw = {
+        "platform": platform,
+        "handle_or_url": handle_or_url,
+        "max_posts": max_posts,
+    }
+
+    # -------- Extract (PUBLIC MODE) --------
+    ig = extract_instagram_profile_posts(
+        handle_or_url,
+        max_posts=max_posts,
+        concurrency=concurrency,
+        mode=mode,
+        daemon=daemon,
+        engagement_ttl_hours=engagement_ttl_hours,
+    )
+
+    raw["instagram_public"] = ig
+
+    # -------- Build report --------
+    run_time_seconds = (datetime.now(timezone.utc) - t0).total_seconds()
+    report = build_report(platform, handle_or_url, max_posts, run_time_seconds, ig)
+    if download_assets:
+        localize_report(report, "outputs")
+    write_outputs(raw, report)
+
     print("✅ Listo. Archivos generados:")
     print("- outputs/raw.json")
     print("- outputs/report.json")
     print("- outputs/report.md")
+    failed = ig.get("retry_queue", {}).get("size", 0)
+    if failed:
+        print(f"- {failed} posts en cache/retry_queue.json (python runner.py --retry)")
 
 if __name__ == "__main__":
     main()
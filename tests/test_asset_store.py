@@ -0,0 +1,75 @@
+# tests/test_asset_store.py
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from extractors.asset_store import AssetStore
+
+IMAGE = b"\xff\xd8\xff\xe0" + bytes(range(256)) * 64
+
+@pytest.fixture
+def cdn():
+    # CDN lento: la imagen sale en pedazos para que las descargas se encimen
+    hits = {"n": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if not self.path.startswith("/img/"):
+                self.send_error(404)
+                return
+            hits["n"] += 1
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(IMAGE)))
+            self.end_headers()
+            for i in range(0, len(IMAGE), 2048):
+                self.wfile.write(IMAGE[i:i + 2048])
+                self.wfile.flush()
+                time.sleep(0.01)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", hits
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_same_image_from_several_profiles_downloads_once(cdn, tmp_path):
+    # batch_runner: varios perfiles comparten el store y un post collab sale en dos grids
+    base, hits = cdn
+    store = AssetStore(root=str(tmp_path / "assets"))
+    urls = [f"{base}/img/collab.jpg?oe={i}" for i in range(3)]  # misma imagen, otra firma
+    results, errors = [None] * 3, []
+
+    def worker(i):
+        try:
+            results[i] = store.fetch_all([urls[i]], workers=2, thumbnails=False)
+        except Exception as e:  # antes: FileNotFoundError sobre el .part compartido
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert hits["n"] == 1
+    assert store.downloaded == 1 and store.failed == 0
+    for i, res in enumerate(results):
+        entry = res[urls[i]]
+        assert open(entry["original"], "rb").read() == IMAGE
+    assert list((tmp_path / "assets" / "partial").iterdir()) == []
+
+def test_failures_are_counted_not_raised(cdn, tmp_path):
+    base, _ = cdn
+    store = AssetStore(root=str(tmp_path / "assets"))
+    out = store.fetch_all([f"{base}/missing.jpg", "http://127.0.0.1:9/refused.jpg", f"{base}/img/ok.jpg"],
+                          workers=3, timeout=2.0, thumbnails=False)
+    assert list(out) == [f"{base}/img/ok.jpg"]
+    assert store.failed == 2 and store.downloaded == 1
@@ -0,0 +1,80 @@
+# tests/test_block_detector.py
+import asyncio
+
+import pytest
+
+from extractors import instagram_async
+from extractors.block_detector import (
+    STATUS_BLOCKED,
+    STATUS_OK,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+COOLDOWN_S = 0.3
+
+class _FakePage:
+    async def close(self):
+        pass
+
+class _FakeContext:
+    async def new_page(self):
+        return _FakePage()
+
+def test_failures_while_open_are_not_new_trips():
+    breaker = CircuitBreaker(failure_threshold=3, cooldown_s=COOLDOWN_S, max_trips=2)
+    for _ in range(8):
+        breaker.record(STATUS_BLOCKED)
+    assert breaker.state == "open"
+    assert breaker.trips == 1
+    assert breaker.counts[STATUS_BLOCKED] == 8
+
+def test_half_open_failure_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_s=0.0, max_trips=5)
+    breaker.record(STATUS_BLOCKED)
+    asyncio.run(breaker.before_request())
+    assert breaker.state == "half_open"
+    breaker.record(STATUS_BLOCKED)
+    assert breaker.state == "open" and breaker.trips == 2
+    asyncio.run(breaker.before_request())
+    breaker.record(STATUS_OK)
+    assert breaker.state == "closed" and breaker.trips == 2
+
+def test_max_trips_still_stops_the_run():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_s=0.0, max_trips=1)
+    breaker.record(STATUS_BLOCKED)
+    asyncio.run(breaker.before_request())   # prueba (half_open)
+    breaker.record(STATUS_BLOCKED)          # la prueba falla: segundo trip
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(breaker.before_request())
+
+def test_concurrent_failures_in_pool_trip_once(monkeypatch):
+    # IG bloquea las primeras 5 navegaciones; con 5 páginas en vuelo todas
+    # llegan al breaker casi juntas. Tiene que ser UN trip, esperar el cooldown
+    # y recuperar el run con la navegación de prueba.
+    calls = {"n": 0}
+
+    async def fake_extract(page, url, waits, strategies=None, limiter=None):
+        calls["n"] += 1
+        n = calls["n"]
+        await asyncio.sleep(0.01)
+        if n <= 5:
+            return None, STATUS_BLOCKED
+        return {"post_url": url, "caption": "ok"}, STATUS_OK
+
+    monkeypatch.setattr(instagram_async, "_extract_post", fake_extract)
+    monkeypatch.setattr(instagram_async, "backoff_delay", lambda attempt: 0.0)
+
+    links = [f"https://www.instagram.com/p/post{i}/" for i in range(20)]
+    breaker = CircuitBreaker(failure_threshold=3, cooldown_s=COOLDOWN_S, max_trips=2)
+    out = asyncio.run(instagram_async.extract_posts_pooled(
+        _FakeContext(), links, concurrency=5, breaker=breaker, max_retries=1,
+    ))
+
+    assert breaker.trips == 1
+    assert breaker.state == "closed"
+    assert "skipped" not in out["statuses"].values()
+    assert len(out["posts"]) == len(links)
+    # pausa real: un cooldown, no uno por worker esperando
+    stats = breaker.stats()
+    assert COOLDOWN_S - 0.05 <= stats["paused_s"] <= COOLDOWN_S * 2
@@ -0,0 +1,33 @@
+# tests/test_dates.py
+from datetime import timedelta
+
+import pytest
+
+from analyzers.temporal_analyzer import find_post_date
+
+@pytest.mark.parametrize("text", [
+    "hace un día",
+    "Hace un día.",
+    "lo abrimos hace un día, y ya hay fila",
+    "hace un dia!",
+])
+def test_hace_un_dia_alone_or_before_punctuation(text):
+    assert find_post_date(text) == timedelta(days=1)
+
+@pytest.mark.parametrize("text", [
+    "hace un día precioso para unos tacos",
+    "Hace un día horrible 🌧️",
+    "hoy hace un día de playa",
+])
+def test_hace_un_dia_weather_is_not_a_date(text):
+    assert find_post_date(text) is None
+
+@pytest.mark.parametrize("text, expected", [
+    ("hace 3 días fuimos al centro", timedelta(days=3)),
+    ("hace una semana abrimos", timedelta(days=7)),
+    ("hace un mes", timedelta(days=30)),
+    ("2 hours ago", timedelta(seconds=7200)),
+    ("a day ago", timedelta(days=1)),
+])
+def test_other_relative_dates_still_parse(text, expected):
+    assert find_post_date(text) == expected
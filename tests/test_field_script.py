@@ -0,0 +1,37 @@
+# tests/test_field_script.py
+import shutil
+import subprocess
+import warnings
+
+import pytest
+
+from extractors import block_detector, field_script, link_harvester
+
+SCRIPTS = {
+    "field_script._EXTRACT_JS": field_script._EXTRACT_JS,
+    "block_detector.PROBE_JS": block_detector.PROBE_JS,
+    "link_harvester._INSTALL_JS": link_harvester._INSTALL_JS,
+}
+
+@pytest.mark.parametrize("name", sorted(SCRIPTS))
+def test_page_scripts_are_valid_js(name, tmp_path):
+    # el string que Python manda al browser (después de sus escapes) tiene que parsear
+    node = shutil.which("node")
+    if not node:
+        pytest.skip("node no está instalado")
+    path = tmp_path / "script.js"
+    path.write_text(f"({SCRIPTS[name]});\n", encoding="utf-8")
+    res = subprocess.run([node, "--check", str(path)], capture_output=True, text=True)
+    assert res.returncode == 0, res.stderr
+
+def test_field_script_compiles_without_escape_warnings():
+    source = open(field_script.__file__, encoding="utf-8").read()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        compile(source, field_script.__file__, "exec")
+
+def test_extract_js_keeps_js_escapes():
+    js = field_script._EXTRACT_JS
+    assert r"/\s+/g" in js
+    assert r"/^\/(accounts|challenge)\//" in js
+    assert "'\\n'" in js  # el salto de línea va escapado dentro del string de JS
@@ -0,0 +1,123 @@
+# tests/test_http_fast.py
+import asyncio
+import json
+from html import escape
+
+import pytest
+
+from benchmarks.har_replay import ReplayServer
+from extractors.field_script import epoch_from_iso, extract_fields
+from extractors.http_fast import fetch_posts_http, taken_at_for
+
+IG = "https://www.instagram.com"
+OG_DESC = '155 likes, 4 comments - lostacos1 on January 9, 2026: "Tacos de pastor ¡hoy! #tacos".'
+IMAGE = "https://scontent.cdninstagram.com/v/t51/abc.jpg"
+
+def _page(*medias, escaped=False):
+    blob = json.dumps({"items": list(medias)})
+    if escaped:
+        blob = json.dumps(blob)  # JSON dentro de un string de JS
+    return f'<html><head></head><body><script type="application/json">{blob}</script></body></html>'
+
+def test_taken_at_comes_from_the_fetched_post():
+    html = _page(
+        {"code": "OTHER1", "taken_at": 1600000000},  # relacionado, aparece primero
+        {"code": "ABC123", "caption": {"text": 'tacos "al pastor" {hoy}', "created_at": 1500000000},
+         "taken_at": 1700000000},
+    )
+    assert taken_at_for(html, "ABC123") == 1700000000
+
+def test_graphql_shortcode_and_timestamp_key():
+    html = _page({"shortcode": "XYZ", "taken_at_timestamp": 1650000000})
+    assert taken_at_for(html, "XYZ") == 1650000000
+
+def test_dropped_when_it_cannot_be_tied_to_the_post():
+    assert taken_at_for(_page({"code": "OTHER1", "taken_at": 1600000000}), "ABC123") is None
+    assert taken_at_for(_page({"code": "ABC123"}, {"code": "B", "taken_at": 1600000000}), "ABC123") is None
+    assert taken_at_for(_page({"code": "ABC123", "taken_at": 1700000000}, escaped=True), "ABC123") is None
+    assert taken_at_for(_page({"code": "ABC123", "taken_at": 1700000000}), None) is None
+    # taken_at de un hijo (carrusel) no es el del post
+    html = _page({"code": "ABC123", "carousel_media": [{"taken_at": 1600000000}]})
+    assert taken_at_for(html, "ABC123") is None
+
+def _post_html(shortcode, taken_at):
+    related = {"code": "REL999", "taken_at": 1600000000}
+    media = {"code": shortcode, "taken_at": taken_at}
+    return (
+        "<html><head>"
+        f'<meta property="og:description" content="{escape(OG_DESC)}">'
+        f'<meta property="og:image" content="{IMAGE}">'
+        "</head><body><article><h1>Tacos de pastor ¡hoy! #tacos</h1>"
+        '<time datetime="2023-11-14T22:13:20.000Z">Nov 14</time></article>'
+        f'<script type="application/json">{json.dumps({"items": [related, media]})}</script>'
+        "</body></html>"
+    )
+
+def _entry(path, status=200, text="", headers=()):
+    return {
+        "request": {"method": "GET", "url": IG + path},
+        "response": {
+            "status": status,
+            "headers": [{"name": "Content-Type", "value": "text/html; charset=utf-8"}, *headers],
+            "content": {"text": text},
+        },
+    }
+
+@pytest.fixture
+def ig_server(tmp_path):
+    # servidor local con páginas tipo IG (mismo ReplayServer del benchmark)
+    har = {"log": {"entries": [
+        _entry("/p/ABC123/", text=_post_html("ABC123", 1700000000)),
+        _entry("/p/NOMETA/", text="<html><head><title>Instagram</title></head><body></body></html>"),
+        _entry("/p/LOGIN1/", status=302, headers=[{"name": "Location", "value": "/accounts/login/?next=/p/LOGIN1/"}]),
+        _entry("/accounts/login/?next=/p/LOGIN1/", text=_post_html("LOGIN1", 1700000000)),
+    ]}}
+    path = tmp_path / "fixture.har"
+    path.write_text(json.dumps(har), encoding="utf-8")
+    with ReplayServer(str(path)) as srv:
+        yield srv
+
+def test_fast_path_end_to_end(ig_server):
+    urls = [f"{IG}/p/ABC123/", f"{IG}/p/NOMETA/", f"{IG}/p/GONE00/", f"{IG}/p/LOGIN1/"]
+    recs = fetch_posts_http(urls, concurrency=4, base_url=ig_server.base_url, timeout=5.0)
+
+    assert len(recs) == len(urls)
+    ok, no_meta, gone, login = recs
+    assert ok == {
+        "post_url": f"{IG}/p/ABC123/",  # la URL de IG, no la del servidor local
+        "image_url": IMAGE,
+        "caption": "Tacos de pastor ¡hoy! #tacos",
+        "og_description": OG_DESC,
+        "taken_at": 1700000000,
+    }
+    assert no_meta is None      # sin og meta → al path de Playwright
+    assert gone is None         # 404
+    assert login is None        # redirect a login
+    assert ig_server.misses == ["GET /p/GONE00/"]
+
+def test_extract_fields_end_to_end(ig_server):
+    # el script de campos en un Chromium real contra la misma página
+    async_api = pytest.importorskip("playwright.async_api")
+
+    async def run():
+        async with async_api.async_playwright() as p:
+            try:
+                browser = await p.chromium.launch(headless=True)
+            except Exception as e:
+                pytest.skip(f"Chromium no disponible: {e.__class__.__name__}")
+            try:
+                page = await browser.new_page()
+                await page.goto(ig_server.base_url + "/p/ABC123/")
+                return await extract_fields(page, timeout_ms=3000)
+            finally:
+                await browser.close()
+
+    res = asyncio.run(run())
+    assert res["ready"] is True
+    assert res["fields"]["og_description"] == OG_DESC
+    assert res["fields"]["image_url"] == IMAGE
+    assert res["fields"]["caption"] == "Tacos de pastor ¡hoy! #tacos"
+    assert epoch_from_iso(res["fields"]["taken_at"]) == 1700000000
+    assert res["strategies"] == {
+        "og_description": "og_meta", "image_url": "og_meta", "caption": "article_h1", "taken_at": "article_time",
+    }
@@ -0,0 +1,30 @@
+# tests/test_post_cache.py
+from datetime import datetime, timedelta, timezone
+
+from extractors.post_cache import PostCache
+
+URL = "https://www.instagram.com/p/ABC123/"
+T0 = datetime(2026, 1, 10, tzinfo=timezone.utc)
+
+def _record(og):
+    return {"post_url": URL, "caption": "tacos", "image_url": "https://cdn/x.jpg", "og_description": og}
+
+def test_empty_og_does_not_refresh_old_engagement(tmp_path):
+    cache = PostCache(path=str(tmp_path / "posts.json"), engagement_ttl_hours=24)
+    cache.put(_record("10 likes, 1 comments - x on January 9, 2026: \"tacos\"."), now=T0)
+    later = T0 + timedelta(hours=30)
+    assert cache.status(URL, now=later) == "expired"
+
+    cache.put(_record(""), now=later)  # STATUS_OK del pool pero sin og meta
+    assert cache.status(URL, now=later) == "expired"
+    assert cache.get(URL)["og_description"].startswith("10 likes")
+
+    cache.put(_record("12 likes, 1 comments - x on January 9, 2026: \"tacos\"."), now=later)
+    assert cache.status(URL, now=later) == "fresh"
+    assert cache.get(URL)["og_description"].startswith("12 likes")
+
+def test_new_entry_without_og_is_not_fresh(tmp_path):
+    cache = PostCache(path=str(tmp_path / "posts.json"))
+    cache.put(_record(""), now=T0)
+    assert cache.status(URL, now=T0) == "expired"
+    assert cache.get(URL)["caption"] == "tacos"
@@ -0,0 +1,59 @@
+# tests/test_runner.py
+import json
+import sys
+
+import runner
+from report_builder import build_report_json, report_to_markdown, save_outputs
+
+def _post(i, og=""):
+    return {"post_url": f"https://www.instagram.com/p/post{i}/", "image_url": f"https://cdn/{i}.jpg",
+            "caption": f"tacos de pastor hoy {i} #tacos", "og_description": og}
+
+def test_retry_keeps_the_ui_analytics_report(tmp_path, monkeypatch):
+    # ui_app dejó outputs/ con el reporte de report_builder; --retry no lo tiene que degradar
+    monkeypatch.chdir(tmp_path)
+    failed_url = _post(2)["post_url"]
+    ig = {
+        "posts": [_post(0), _post(1)],
+        "status": {"profile": "ok", "posts": {_post(0)["post_url"]: "ok", _post(1)["post_url"]: "ok",
+                                              failed_url: "blocked"}},
+        "warnings": [f"post bloqueado: {failed_url}"],
+    }
+    raw, report = build_report_json("instagram", "lostacos1", 12, 3.5, ig)
+    save_outputs(raw, report, report_to_markdown(report))
+
+    recovered = _post(2, og='20 likes, 2 comments - lostacos1 on January 9, 2026: "tacos".')
+    monkeypatch.setattr(runner, "extract_instagram_profile_posts", lambda *a, **k: {
+        "posts": [recovered], "status": {"posts": {failed_url: "ok"}}, "retry": {"attempted": 1, "size": 0},
+    })
+    monkeypatch.setattr(runner, "localize_report", lambda report, out_dir: report)
+    monkeypatch.setattr(sys, "argv", ["runner.py", "--retry"])
+    runner.main()
+
+    out = json.loads((tmp_path / "outputs" / "report.json").read_text(encoding="utf-8"))
+    assert [p["post_url"] for p in out["content"]["top_posts"]] == [_post(i)["post_url"] for i in range(3)]
+    analytics = out["content"]["analytics"]
+    assert "temporal" in analytics and "cadence" in analytics["temporal"]
+    assert len(analytics["posts_annotated"]) == 3
+    assert "analysis_cache" in out["meta"]
+    assert out["meta"]["run_time_seconds"] >= 3.5
+    assert out["warnings"] == []
+    md = (tmp_path / "outputs" / "report.md").read_text(encoding="utf-8")
+    assert "## Analytics (Auto)" in md
+
+def test_retry_keeps_runner_report_format(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ig = {"posts": [_post(0)], "status": {"profile": "ok", "posts": {_post(0)["post_url"]: "ok"}}}
+    raw = {"platform": "instagram", "handle_or_url": "lostacos1", "max_posts": 12, "instagram_public": ig}
+    runner.write_outputs(raw, runner.build_report("instagram", "lostacos1", 12, 1.0, ig))
+
+    monkeypatch.setattr(runner, "extract_instagram_profile_posts", lambda *a, **k: {
+        "posts": [_post(1)], "status": {"posts": {_post(1)["post_url"]: "ok"}}, "retry": {"attempted": 1, "size": 0},
+    })
+    monkeypatch.setattr(runner, "localize_report", lambda report, out_dir: report)
+    monkeypatch.setattr(sys, "argv", ["runner.py", "--retry"])
+    runner.main()
+
+    out = json.loads((tmp_path / "outputs" / "report.json").read_text(encoding="utf-8"))
+    assert len(out["content"]["top_posts"]) == 2
+    assert out["action_plan"]
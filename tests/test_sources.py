@@ -0,0 +1,18 @@
+# tests/test_sources.py
+import warnings
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+SOURCES = sorted(
+    p for p in ROOT.rglob("*.py")
+    if not any(part.startswith(".") or part in ("__pycache__", "tests") for part in p.relative_to(ROOT).parts)
+)
+
+@pytest.mark.parametrize("path", SOURCES, ids=lambda p: str(p.relative_to(ROOT)))
+def test_compiles_without_warnings(path):
+    # escapes inválidos ("\s", "\/") en strings no-raw: SyntaxWarning hoy, error con -W error
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        compile(path.read_text(encoding="utf-8"), str(path), "exec")
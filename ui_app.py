@@ -1,324 +1,51 @@
 # ui_app.py
 import json
-import os
-import re
 import time
-from datetime import datetime, timezone
 from pathlib import Path
 
 import streamlit as st
-from playwright.sync_api import sync_playwright
 
-from analyzers.caption_analyzer import analyze_posts
-from analyzers.temporal_analyzer import analyze_temporal
+from analyzers.memo import DEFAULT_MEMO_PATH, AnalysisMemo
+from extractors.asset_store import localize_report
+from extractors.browser_daemon import DEFAULT_HOST as DAEMON_HOST, DEFAULT_PORT as DAEMON_PORT, daemon_stats
+from extractors.instagram_async import DEFAULT_CONCURRENCY, EXTRACTION_MODES, run_extraction
+from extractors.post_cache import DEFAULT_ENGAGEMENT_TTL_HOURS
+from report_builder import build_report_json, report_to_markdown, save_outputs
 
 st.set_page_config(page_title="RSSS Analyzer UI", layout="wide")
 
 # ----------------------------
 # Helpers
 # ----------------------------
-def _clean(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip())
-
-def normalize_ig_profile(profile_url_or_handle: str) -> str:
-    s = (profile_url_or_handle or "").strip()
-    if s.startswith("http"):
-        return s if s.endswith("/") else s + "/"
-    handle = s.lstrip("@").strip().strip("/")
-    return f"https://www.instagram.com/{handle}/"
-
-def _try_click(page, selectors):
-    for sel in selectors:
-        try:
-            page.locator(sel).first.click(timeout=1500)
-            return True
-        except:
-            pass
-    return False
-
-def _auto_scroll(page, steps=8, pause_ms=900):
-    for _ in range(steps):
-        try:
-            page.mouse.wheel(0, 1400)
-        except:
-            pass
-        page.wait_for_timeout(pause_ms)
-
-def extract_instagram_public(profile_url_or_handle: str, max_posts: int, profile_dir: str) -> dict:
+def extract_instagram_public(
+    profile_url_or_handle: str,
+    max_posts: int,
+    profile_dir: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    mode: str = "browser",
+    block_resources: bool = True,
+    use_daemon: bool = True,
+    engagement_ttl_hours: float = DEFAULT_ENGAGEMENT_TTL_HOURS,
+) -> dict:
     """
     Extrae posts del perfil IG usando Playwright con un perfil persistente propio.
     Robusto: obtiene links via JS + og meta para imagen/engagement.
+    Los posts se abren en paralelo con un pool de `concurrency` páginas.
+    mode="http" lee og meta por HTTP y sólo abre en Chromium los posts que fallen.
+    block_resources=True no descarga imágenes/video/fuentes/trackers (ver resource_policy).
+    use_daemon=True reutiliza el Chromium caliente de browser_daemon si está corriendo.
+    Posts ya vistos salen de cache/posts.json; engagement se refresca tras engagement_ttl_hours.
     """
-    profile_url = normalize_ig_profile(profile_url_or_handle)
-
-    out = {"profile_url": profile_url, "posts": [], "warnings": []}
-    Path(profile_dir).mkdir(parents=True, exist_ok=True)
-
-    with sync_playwright() as p:
-        context = p.chromium.launch_persistent_context(
-            user_data_dir=profile_dir,
-            headless=False,
-            locale="en-US",
-            viewport={"width": 1280, "height": 900},
-            args=[
-                "--disable-blink-features=AutomationControlled",
-                "--start-maximized",
-            ],
-        )
-        page = context.new_page()
-
-        # 1) Ir al perfil
-        page.goto(profile_url, wait_until="domcontentloaded", timeout=60000)
-        page.wait_for_timeout(2500)
-
-        # 2) Cerrar popups comunes
-        _try_click(page, [
-            'button:has-text("Only allow essential cookies")',
-            'button:has-text("Allow all cookies")',
-            'button:has-text("Accept")',
-            'button:has-text("Not Now")',
-            'button:has-text("Not now")',
-            'div[role="dialog"] button:has-text("Not Now")',
-            'div[role="dialog"] button:has-text("Not now")',
-        ])
-        page.wait_for_timeout(1200)
-
-        # 3) Esperar main y scroll para cargar grid
-        try:
-            page.wait_for_selector("main", timeout=15000)
-        except:
-            out["warnings"].append("No apareció <main>. Puede ser bloqueo/captcha o carga incompleta.")
-
-        _auto_scroll(page, steps=8, pause_ms=900)
-
-        # 4) Obtener links via JS
-        hrefs = page.evaluate("""
-            () => Array.from(document.querySelectorAll('a'))
-                .map(a => a.getAttribute('href') || a.href)
-                .filter(Boolean)
-        """)
-
-        links = []
-        for h in hrefs or []:
-            if h.startswith("/"):
-                url = "https://www.instagram.com" + h
-            else:
-                url = h
-            url = url.split("?")[0]
-            if ("/p/" in url or "/reel/" in url) and url not in links:
-                links.append(url)
-            if len(links) >= max_posts:
-                break
-
-        if not links:
-            out["warnings"].append("Veo el grid pero no pude leer links de posts (IG cambió markup/render).")
-            out["warnings"].append("Tip: aumenta scroll o abre un post manualmente en la ventana del bot y re-run.")
-            context.close()
-            return out
-
-        # 5) Visitar posts y extraer caption/imagen/og_description
-        for url in links[:max_posts]:
-            try:
-                page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                page.wait_for_timeout(1800)
-
-                og_desc = ""
-                try:
-                    og_desc = page.locator("meta[property='og:description']").get_attribute("content") or ""
-                    og_desc = _clean(og_desc)
-                except:
-                    og_desc = ""
-
-                image_url = ""
-                try:
-                    image_url = page.locator("meta[property='og:image']").get_attribute("content") or ""
-                except:
-                    image_url = ""
-
-                if not image_url:
-                    try:
-                        img = page.locator("article img").first
-                        image_url = img.get_attribute("src") or ""
-                    except:
-                        image_url = ""
-
-                caption = ""
-                # caption visible (heurístico)
-                try:
-                    page.wait_for_selector("article", timeout=8000)
-                except:
-                    pass
-
-                for cap_sel in ["article h1", "article span"]:
-                    try:
-                        caption = page.locator(cap_sel).first.inner_text(timeout=2000)
-                        caption = _clean(caption)
-                        if caption:
-                            break
-                    except:
-                        continue
-
-                out["posts"].append({
-                    "post_url": url,
-                    "image_url": image_url,
-                    "caption": caption,
-                    "og_description": og_desc
-                })
-            except Exception as e:
-                out["warnings"].append(f"Fallo extrayendo post {url}: {e}")
-
-        context.close()
-
-    return out
-
-def build_report_json(platform: str, handle_or_url: str, max_posts: int, runtime_s: float, ig_data: dict):
-    now = datetime.now(timezone.utc).isoformat()
-
-    raw = {
-        "platform": platform,
-        "handle_or_url": handle_or_url,
-        "max_posts": max_posts,
-        "instagram_public": ig_data
-    }
-
-    # Top posts base
-    top_posts = []
-    for p in ig_data.get("posts", [])[:max_posts]:
-        top_posts.append({
-            "post_url": p.get("post_url", ""),
-            "image_url": p.get("image_url", ""),
-            "caption": p.get("caption", ""),
-            "og_description": p.get("og_description", "")
-        })
-
-    # ✅ Analytics A: caption analyzer (engagement/hashtags/idioma/CTA/temas)
-    analytics = analyze_posts(top_posts)
-
-    # ✅ Analytics A: temporal analyzer (fechas/eras/posts por año)
-    temporal = analyze_temporal(analytics.get("posts_annotated", []))
-    analytics["temporal"] = temporal
-
-    report = {
-        "meta": {
-            "platform": platform,
-            "handle": handle_or_url,
-            "generated_at": now,
-            "run_time_seconds": runtime_s
-        },
-        "profiles": [
-            {
-                "platform": platform,
-                "handle": handle_or_url,
-                "profile_url": ig_data.get("profile_url", ""),
-                "bio": "",
-                "website": "",
-                "avatar_url": ""
-            }
-        ],
-        "content": {
-            "top_posts": top_posts,
-            "analytics": analytics
-        },
-        "warnings": ig_data.get("warnings", [])
-    }
-
-    return raw, report
-
-def report_to_markdown(report: dict) -> str:
-    meta = report.get("meta", {})
-    content = report.get("content", {})
-    top_posts = content.get("top_posts", [])
-    analytics = content.get("analytics", {})
-    warnings = report.get("warnings", [])
-
-    temporal = analytics.get("temporal", {})
-
-    lines = []
-    lines.append(f"# Social Report — {meta.get('platform','')} | {meta.get('handle','')}")
-    lines.append(f"Generated: {meta.get('generated_at','')}")
-    lines.append(f"Runtime: {meta.get('run_time_seconds','')}s")
-    lines.append("")
-
-    if warnings:
-        lines.append("## Warnings")
-        for w in warnings:
-            lines.append(f"- {w}")
-        lines.append("")
-
-    lines.append("## Analytics (Auto)")
-    lines.append(f"- Avg likes est: {analytics.get('avg_likes_est')}")
-    lines.append(f"- Avg comments est: {analytics.get('avg_comments_est')}")
-    lines.append("")
-
-    # Temporal summary
-    lines.append("### Temporal")
-    lines.append(f"- Min date: {temporal.get('min_date')}")
-    lines.append(f"- Max date: {temporal.get('max_date')}")
-    lines.append(f"- Span days: {temporal.get('span_days')}")
-    eras = temporal.get("era_guess", {})
-    if eras:
-        lines.append(f"- Era buckets: {eras}")
-    ppy = temporal.get("posts_per_year", {})
-    if ppy:
-        lines.append("- Posts per year:")
-        for y, c in ppy.items():
-            lines.append(f"  - {y}: {c}")
-    lines.append("")
-
-    # Language ratio
-    lang = analytics.get("language_ratio", {})
-    if lang:
-        lines.append("### Language ratio")
-        for k, v in lang.items():
-            lines.append(f"- {k}: {v}")
-        lines.append("")
-
-    # CTA frequency
-    ctas = analytics.get("cta_frequency", {})
-    if ctas:
-        lines.append("### CTA frequency")
-        for k, v in ctas.items():
-            lines.append(f"- {k}: {v}")
-        lines.append("")
-
-    # Topics
-    topics = analytics.get("dominant_topics", {})
-    if topics:
-        lines.append("### Dominant topics")
-        for k, v in topics.items():
-            lines.append(f"- {k}: {v}")
-        lines.append("")
-
-    # Hashtags
-    tags = analytics.get("hashtag_frequency", {})
-    if tags:
-        lines.append("### Top hashtags")
-        for k, v in tags.items():
-            lines.append(f"- {k}: {v}")
-        lines.append("")
-
-    lines.append("## Top posts")
-    if not top_posts:
-        lines.append("- (sin posts todavía)")
-    for post in top_posts:
-        img = post.get("image_url", "")
-        if img:
-            lines.append(f"![]({img})")
-        lines.append(f"- URL: {post.get('post_url','')}")
-        cap = post.get("caption", "")
-        if cap:
-            lines.append(f"- Caption: {cap}")
-        lines.append("")
-    return "\n".join(lines)
-
-def save_outputs(raw: dict, report: dict, md: str):
-    os.makedirs("outputs", exist_ok=True)
-    with open("outputs/raw.json", "w", encoding="utf-8") as f:
-        json.dump(raw, f, ensure_ascii=False, indent=2)
-    with open("outputs/report.json", "w", encoding="utf-8") as f:
-        json.dump(report, f, ensure_ascii=False, indent=2)
-    with open("outputs/report.md", "w", encoding="utf-8") as f:
-        f.write(md)
+    return run_extraction(
+        profile_url_or_handle,
+        max_posts,
+        profile_dir,
+        concurrency=concurrency,
+        mode=mode,
+        block_resources=block_resources,
+        daemon=(DAEMON_HOST, DAEMON_PORT) if use_daemon else None,
+        engagement_ttl_hours=engagement_ttl_hours,
+    )
 
 # ----------------------------
 # UI
@@ -330,6 +57,14 @@ with st.sidebar:
     st.header("Inputs")
     handle_or_url = st.text_input("Instagram @handle o URL", value="lostacos1")
     max_posts = st.number_input("Posts a extraer", min_value=1, max_value=50, value=12, step=1)
+    concurrency = st.number_input("Páginas en paralelo", min_value=1, max_value=8, value=DEFAULT_CONCURRENCY, step=1)
+    mode = st.selectbox("Modo de extracción de posts", EXTRACTION_MODES, index=0,
+                        help="http = lee og meta sin abrir Chromium (cae a Playwright si falla); "
+                             "network = usa el JSON que recibe el grid y sólo abre posts incompletos")
+    block_resources = st.checkbox("Bloquear imágenes/video/fuentes/trackers", value=True)
+    download_assets = st.checkbox("Guardar imágenes en assets/ (las URLs del CDN caducan)", value=True)
+    engagement_ttl_hours = st.number_input("Refrescar likes/comments tras (horas)", min_value=0.0,
+                                           value=DEFAULT_ENGAGEMENT_TTL_HOURS, step=1.0)
 
     st.divider()
     st.write("Perfil persistente (para guardar login)")
@@ -339,6 +74,14 @@ with st.sidebar:
     )
     st.caption("Tip: la 1ra vez te abre Chrome del bot. Te logueas y ya queda guardado.")
 
+    st.divider()
+    use_daemon = st.checkbox("Usar browser daemon (Chromium caliente)", value=True)
+    d_stats = daemon_stats(DAEMON_HOST, DAEMON_PORT) if use_daemon else None
+    if d_stats and d_stats.get("ok"):
+        st.caption(f"Daemon activo: gen {d_stats.get('generation')}, {d_stats.get('pages_served')} páginas, {d_stats.get('rss_mb')} MB")
+    elif use_daemon:
+        st.caption("Daemon apagado: `python -m extractors.browser_daemon` (si no, se lanza Chromium en cada run).")
+
 run = st.button("🚀 Extraer + Generar reporte", type="primary", use_container_width=True)
 
 if "raw" not in st.session_state:
@@ -355,11 +98,25 @@ if run:
     progress = st.progress(0, text="Iniciando...")
 
     progress.progress(20, text="Abriendo Instagram y cargando grid...")
-    ig_data = extract_instagram_public(handle_or_url, int(max_posts), profile_dir)
+    ig_data = extract_instagram_public(
+        handle_or_url,
+        int(max_posts),
+        profile_dir,
+        concurrency=int(concurrency),
+        mode=mode,
+        block_resources=block_resources,
+        use_daemon=use_daemon,
+        engagement_ttl_hours=float(engagement_ttl_hours),
+    )
 
     progress.progress(85, text="Analizando engagement/hashtags/idioma/CTA/temas + temporal...")
     elapsed = time.time() - t0
-    raw, report = build_report_json("instagram", handle_or_url, int(max_posts), round(elapsed, 2), ig_data)
+    memo = AnalysisMemo(path=DEFAULT_MEMO_PATH)
+    raw, report = build_report_json("instagram", handle_or_url, int(max_posts), round(elapsed, 2), ig_data, memo=memo)
+    memo.save()
+    if download_assets:
+        progress.progress(92, text="Descargando imágenes a assets/...")
+        localize_report(report, "outputs")
     md = report_to_markdown(report)
 
     save_outputs(raw, report, md)